@@ -167,6 +167,16 @@ TEMPLATES = [
 
 ERROR_DB_LOGGING = True
 ERROR_EMAIL_ALERTS = False
+
+# Error log ingestion (see app/error_pipeline.py)
+ERROR_LOGGING = {
+    'BACKEND': config('ERROR_LOGGING_BACKEND', default='thread'),  # thread | inline
+    'FLUSH_SECONDS': 2,
+    'MAX_BUFFERED_ROWS': 1000,
+    'SAMPLE_FIRST': 10,
+    'SAMPLE_RATE': 0.01,
+    'SAMPLE_WINDOW_SECONDS': 300,
+}
 VERSION = '1.0.0'
 
 
@@ -198,6 +208,9 @@ DATABASES = {
 
 # CACHE CONFIGURATION - Environment-based caching strategy
 
+REDIS_URL = config('REDIS_URL', default='')
+# Namespaces every cache key so environments can share one Redis instance
+CACHE_KEY_PREFIX = config('CACHE_KEY_PREFIX', default='acrp')
 
 if DEBUG:
     # Development: Local memory cache for quick testing
@@ -212,23 +225,67 @@ if DEBUG:
         }
     }
 else:
-    
-    CACHES = {
-        'default': {
-            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
-            'LOCATION': 'acrp_cache_table',
-            'TIMEOUT': 300,  # 5 minutes
-            'OPTIONS': {
-                'MAX_ENTRIES': 5000,
-                'CULL_FREQUENCY': 3,  # Remove 1/3 of entries when MAX_ENTRIES is reached
-            }
+    DATABASE_CACHE = {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'acrp_cache_table',
+        'TIMEOUT': 300,  # 5 minutes
+        'KEY_PREFIX': CACHE_KEY_PREFIX,
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+            'CULL_FREQUENCY': 3,  # Remove 1/3 of entries when MAX_ENTRIES is reached
         }
     }
+    
+    if REDIS_URL:
+        # Redis in front, failing over to the database cache when unreachable
+        # (see app/cache_backends.py)
+        CACHES = {
+            'default': {
+                'BACKEND': 'app.cache_backends.FallbackCache',
+                'OPTIONS': {
+                    'PRIMARY': 'redis',
+                    'FALLBACK': 'database',
+                    'RETRY_SECONDS': 30,
+                }
+            },
+            'redis': {
+                'BACKEND': 'django_redis.cache.RedisCache',
+                'LOCATION': REDIS_URL,
+                'TIMEOUT': 300,  # 5 minutes
+                'KEY_PREFIX': CACHE_KEY_PREFIX,
+                'OPTIONS': {
+                    'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+                    'SOCKET_CONNECT_TIMEOUT': 1,  # Fail over quickly instead of hanging requests
+                    'SOCKET_TIMEOUT': 1,
+                    'CONNECTION_POOL_KWARGS': {'max_connections': 50},
+                }
+            },
+            'database': DATABASE_CACHE,
+        }
+    else:
+        CACHES = {
+            'default': DATABASE_CACHE,
+        }
+
+# Hot reference data (councils, affiliation types, card system settings)
+# kept in a per-process LRU in front of the default cache (see app/tiered_cache.py)
+TIERED_CACHE = {
+    'ENABLED': True,
+    'LOCAL_TIMEOUT': 60,
+    'LOCAL_MAX_ENTRIES': 256,
+    'SHARED_TIMEOUT': 3600,
+}
 
 
 # SESSION CONFIGURATION - Optimized for performance and security
 
-SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+if REDIS_URL and not DEBUG:
+    # Sessions are read from Redis and written through to the database, so a
+    # Redis outage or flush does not log anyone out
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+    SESSION_CACHE_ALIAS = 'default'
+else:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.db'
 SESSION_COOKIE_AGE = 86400  # 24 hours
 SESSION_COOKIE_HTTPONLY = True  # Prevent JavaScript access
 SESSION_COOKIE_NAME = 'acrp_sessionid'
@@ -321,6 +378,9 @@ DEFAULT_REPLY_TO_EMAIL = 'ams@acrp.org.za'
 MAX_CARD_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 CARD_DEFAULT_FORMAT = 'pdf'
 CARD_IMAGE_DPI = 300
+# Parallel card rendering for bulk operations (0 = one process per CPU)
+CARD_RENDER_WORKERS = config('CARD_RENDER_WORKERS', default=0, cast=int)
+CARD_RENDER_CHUNK_SIZE = 25
 
 # EMAIL CONFIGURATION - Environment-based email backend
 
@@ -915,6 +975,67 @@ BACKGROUND_TASKS = {
     'MAINTENANCE_WINDOW_HOUR': 2,  # 2 AM
 }
 
+# Background export jobs (see app/export_jobs.py)
+EXPORT_JOBS = {
+    'BACKEND': config('EXPORT_JOBS_BACKEND', default='thread'),  # thread | celery | command
+    'MAX_WORKERS': 2,
+    'STALE_AFTER_MINUTES': 60,
+    'RETENTION_DAYS': 7,
+    # Export files hold personal data: keep them outside MEDIA_ROOT
+    'STORAGE_ROOT': config('EXPORT_STORAGE_ROOT', default=str(BASE_DIR / 'private' / 'exports')),
+}
+
+# Queued email delivery (see app/email_outbox.py)
+EMAIL_OUTBOX = {
+    'BACKEND': config('EMAIL_OUTBOX_BACKEND', default='thread'),  # thread | celery | command
+    'BATCH_SIZE': 50,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_BASE_SECONDS': 60,
+    'STALE_AFTER_MINUTES': 15,
+    'RETENTION_DAYS': 30,
+}
+
+# Write-behind card verification recording (see affiliationcard/verification_buffer.py)
+CARD_VERIFICATION_BUFFER = {
+    'ENABLED': True,
+    'BATCH_SIZE': 200,
+    'FLUSH_INTERVAL_SECONDS': 5,
+    'MAX_BUFFERED': 50000,
+}
+
+# Public card verification read cache (see affiliationcard/verification_cache.py)
+CARD_VERIFICATION_CACHE = {
+    'ENABLED': True,
+    'TIMEOUT': 300,
+    'NOT_FOUND_TIMEOUT': 60,
+}
+
+# Shared request rate limiting (see app/ratelimit.py)
+RATE_LIMIT = {
+    'ENABLED': True,
+    'CACHE': 'default',
+    'STORE': 'auto',  # auto | redis | database | cache
+    'LIMITS': {},     # per-name overrides, e.g. {'card_verification': (20, 3600)}
+    'STATS_FLUSH_SECONDS': 60,
+}
+
+# CPD analytics rollups (see cpd/analytics.py). Run rebuild_cpd_daily_stats
+# after enabling the daily table.
+CPD_ANALYTICS = {
+    'USE_DAILY_STATS': config('CPD_USE_DAILY_STATS', default=False, cast=bool),
+}
+
+# Bulk CPD approval decisions (see cpd/approvals.py)
+CPD_APPROVALS = {
+    'COMPLIANCE_BACKEND': config('CPD_COMPLIANCE_BACKEND', default='thread'),  # thread | celery | inline
+}
+
+# Batch CPD certificate generation (see cpd/certificates.py)
+CPD_CERTIFICATES = {
+    'WORKERS': config('CPD_CERTIFICATE_WORKERS', default=2, cast=int),  # 1 renders in-process
+    'CHUNK_SIZE': 200,
+}
+
 
 # ENVIRONMENT-SPECIFIC OVERRIDES
 
@@ -942,8 +1063,25 @@ if 'test' in sys.argv or 'pytest' in sys.modules:
     
     MIGRATION_MODULES = DisableMigrations()
     
-    # Use dummy cache for tests
-    CACHES['default']['BACKEND'] = 'django.core.cache.backends.dummy.DummyCache'
+    # Run the cache tier against an in-memory Redis stand-in when fakeredis is
+    # installed, otherwise use the dummy cache
+    try:
+        import fakeredis
+        CACHES = {
+            'default': {
+                'BACKEND': 'django_redis.cache.RedisCache',
+                'LOCATION': 'redis://localhost:6379/0',
+                'KEY_PREFIX': 'acrp-test',
+                'OPTIONS': {
+                    'CONNECTION_POOL_KWARGS': {'connection_class': fakeredis.FakeConnection},
+                }
+            }
+        }
+    except ImportError:
+        CACHES = {
+            'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+        }
+    SESSION_ENGINE = 'django.contrib.sessions.backends.db'
     
     
 
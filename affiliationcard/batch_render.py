@@ -0,0 +1,183 @@
+"""
+Batch card renderer.
+
+Renders card PDF/PNG/JPEG artifacts for many cards in parallel across a
+``ProcessPoolExecutor``. Rendering is CPU-bound (ReportLab, PIL, QR
+encoding), so processes rather than threads are used.
+
+Workers are spawned rather than forked (the web process runs background
+threads). They receive chunks of card ids, load the cards themselves and
+render through ``generate_card_file``, which stores each artifact in the
+rendered card cache (see ``card_cache``). Only small per-card status tuples
+travel back to the parent and at most two chunks per worker are in flight,
+so memory stays bounded no matter how many cards are rendered. Callers that
+need the bytes afterwards (e.g. to attach them to an email) read them back
+with ``generate_card_file``, which is then a cache hit.
+
+Worker processes open their own database connections, so they cannot see
+rows written by an uncommitted transaction. Inside an atomic block
+``render_cards`` therefore renders in the calling process; callers that
+only warm the cache can defer with ``render_cards_on_commit``.
+"""
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+
+logger = logging.getLogger(__name__)
+
+
+def get_render_workers():
+    """Number of render processes (CARD_RENDER_WORKERS, default: CPU count)."""
+    return getattr(settings, 'CARD_RENDER_WORKERS', 0) or os.cpu_count() or 1
+
+
+def _init_worker():
+    """Process initializer; makes sure Django is usable under spawn as well as fork."""
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+
+def _render_chunk(card_ids, formats):
+    """
+    Render every requested format for a chunk of cards (runs in a worker).
+
+    Returns:
+        list of (card_id, card_number, file_format, error) tuples; error is
+        None on success.
+    """
+    from .models import AffiliationCard
+    from .views import generate_card_file
+
+    close_old_connections()
+    results = []
+    try:
+        cards = AffiliationCard.objects.filter(pk__in=card_ids)
+        found = set()
+        for card in cards:
+            found.add(card.pk)
+            for file_format in formats:
+                try:
+                    generate_card_file(card, file_format)
+                    results.append((card.pk, card.card_number, file_format, None))
+                except Exception as e:
+                    results.append((card.pk, card.card_number, file_format, str(e)))
+        for card_id in set(card_ids) - found:
+            results.append((card_id, None, None, 'Card not found'))
+    finally:
+        close_old_connections()
+    return results
+
+
+def render_cards(cards, formats=('pdf',), max_workers=None, chunk_size=None):
+    """
+    Render card artifacts in parallel and warm the rendered card cache.
+
+    Args:
+        cards: QuerySet (or iterable) of AffiliationCard objects or ids
+        formats: Formats to render per card ('pdf', 'png', 'jpg')
+        max_workers: Process count; defaults to ``get_render_workers()``.
+            With a single worker, or inside an atomic block, cards are
+            rendered in this process.
+        chunk_size: Cards per worker task (CARD_RENDER_CHUNK_SIZE, default 25)
+
+    Returns:
+        dict: message, success_count, failed_count, failed_cards,
+        rendered_ids, elapsed_seconds and cards_per_second
+    """
+    if hasattr(cards, 'values_list'):
+        card_ids = list(cards.values_list('pk', flat=True))
+    else:
+        card_ids = [getattr(card, 'pk', card) for card in cards]
+
+    formats = tuple(formats)
+    max_workers = max_workers or get_render_workers()
+    chunk_size = chunk_size or getattr(settings, 'CARD_RENDER_CHUNK_SIZE', 25)
+    chunks = [card_ids[i:i + chunk_size] for i in range(0, len(card_ids), chunk_size)]
+
+    started = time.monotonic()
+    results = []
+
+    if connection.in_atomic_block:
+        # Workers could not see uncommitted cards
+        max_workers = 1
+
+    if max_workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            results.extend(_render_chunk(chunk, formats))
+    else:
+        # Spawn, not fork: the parent runs background threads (outbox, error
+        # log, verification flusher, Sentry) whose held locks a fork would copy
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+        ) as executor:
+            pending = {}
+            for chunk in chunks:
+                pending[executor.submit(_render_chunk, chunk, formats)] = chunk
+                if len(pending) >= max_workers * 2:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    results.extend(_collect(done, pending))
+            results.extend(_collect(list(pending), pending))
+
+    elapsed = time.monotonic() - started
+
+    failed_cards = []
+    failed_ids = set()
+    for card_id, card_number, file_format, error in results:
+        if error:
+            failed_ids.add(card_id)
+            failed_cards.append(f"{card_number or card_id} ({file_format or '-'}) - {error}")
+
+    rendered_ids = [card_id for card_id in card_ids if card_id not in failed_ids]
+    cards_per_second = len(card_ids) / elapsed if elapsed else float(len(card_ids))
+
+    message = f'{len(rendered_ids)} cards rendered in {elapsed:.1f}s ({cards_per_second:.1f} cards/sec)'
+    if failed_ids:
+        message += f', {len(failed_ids)} failed'
+    logger.info(f"Batch card render: {message} using {max_workers} workers, formats {formats}")
+
+    return {
+        'message': message,
+        'success_count': len(rendered_ids),
+        'failed_count': len(failed_ids),
+        'failed_cards': failed_cards,
+        'rendered_ids': rendered_ids,
+        'elapsed_seconds': round(elapsed, 3),
+        'cards_per_second': round(cards_per_second, 2),
+    }
+
+
+def render_cards_on_commit(card_ids, formats=('pdf',)):
+    """
+    Render card artifacts once the current transaction commits, or right
+    away outside one. Returns the ``render_cards`` result when rendering
+    ran immediately, otherwise None.
+    """
+    card_ids = list(card_ids)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: render_cards(card_ids, formats=formats))
+        return None
+    return render_cards(card_ids, formats=formats)
+
+
+def _collect(futures, pending):
+    """Gather finished chunk results, removing them from ``pending``."""
+    results = []
+    for future in futures:
+        chunk = pending.pop(future)
+        try:
+            results.extend(future.result())
+        except Exception as e:
+            # A crashed worker loses its whole chunk; report it rather than abort
+            logger.error(f"Card render worker failed: {e}")
+            results.extend((card_id, None, None, str(e)) for card_id in chunk)
+    return results
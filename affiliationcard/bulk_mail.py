@@ -0,0 +1,158 @@
+"""
+Bulk mail composer for cardholder campaigns.
+
+``bulk_send_emails`` used to look up and compile the campaign template,
+call ``build_absolute_uri`` twice and send one email per card inside the
+request.
+
+The composer compiles the campaign template (and everything it extends or
+includes) once and renders it per recipient with that recipient's own
+context. The absolute verification and download URLs are built once per
+campaign; only the card's token is filled in per recipient. Cards are
+streamed with ``.iterator()`` and messages are queued on the email outbox
+in chunks, so memory stays flat for any campaign size.
+"""
+import logging
+import time
+import uuid
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.template.loader import get_template
+from django.urls import reverse
+from django.utils.http import RFC3986_SUBDELIMS
+
+from app.email_outbox import queue_emails
+
+from .models import AffiliationCard
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+class BulkMailComposer:
+    """
+    Compose one campaign's emails from a single compiled template.
+
+    Args:
+        template_name: Email body template
+        subject: Email subject; ``{card_number}`` is filled in per card
+        context: Campaign-wide template context (user, email_type, ...)
+        request: Used once to build absolute verification/download URLs
+    """
+
+    def __init__(self, template_name, subject, context=None, request=None):
+        self.template = get_template(template_name)
+        self.subject = subject
+        self.context = dict(context or {})
+
+        # Build absolute URLs once and fill the (quoted) token in per card
+        self._token = f'token{uuid.uuid4().hex}'
+        self.url_formats = {
+            name: (request.build_absolute_uri(reverse(url_name, args=[self._token])) if request else '#')
+            for name, url_name in (
+                ('verification_url', 'affiliationcard:verify_token'),
+                ('card_detail_url', 'affiliationcard:download_card'),
+            )
+        }
+
+    def recipient_context(self, card):
+        """Template context for one card."""
+        token = quote(str(card.verification_token), safe=RFC3986_SUBDELIMS + "/~:@")
+        return {
+            **self.context,
+            'card': card,
+            **{name: url.replace(self._token, token) for name, url in self.url_formats.items()},
+        }
+
+    def compose(self, card):
+        """Return (subject, html) for one card."""
+        subject = self.subject.replace('{card_number}', card.card_number)
+        return subject, self.template.render(self.recipient_context(card))
+
+
+def send_bulk_campaign(cards, template_name, subject, context=None, request=None,
+                       category='card_campaign', chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Compose and queue a campaign email for every card.
+
+    Args:
+        cards: QuerySet of AffiliationCard (or iterable of cards / ids)
+        template_name, subject, context, request: See BulkMailComposer
+        category: EmailOutbox category
+        chunk_size: Cards streamed and messages queued per chunk
+
+    Returns:
+        dict: message, success_count, failed_count, failed_emails,
+        elapsed_seconds and emails_per_second
+    """
+    if not hasattr(cards, 'iterator'):
+        cards = AffiliationCard.objects.filter(pk__in=[getattr(card, 'pk', card) for card in cards])
+
+    started = time.monotonic()
+    composer = BulkMailComposer(template_name, subject, context=context, request=request)
+
+    success_count = 0
+    failed_count = 0
+    failed_emails = []
+    pending = []
+
+    def flush():
+        nonlocal success_count, failed_count
+        try:
+            queue_emails(pending, category=category)
+            success_count += len(pending)
+        except Exception as e:
+            failed_count += len(pending)
+            failed_emails.append(f"Could not queue {len(pending)} emails - {str(e)}")
+            logger.error(f"Failed to queue campaign chunk: {e}")
+        pending.clear()
+
+    for card in cards.order_by().iterator(chunk_size=chunk_size):
+        try:
+            if not card.affiliate_email:
+                failed_count += 1
+                failed_emails.append(f"{card.card_number} - No email address")
+                continue
+
+            email_subject, html = composer.compose(card)
+            email = EmailMessage(
+                subject=email_subject,
+                body=html,
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                to=[card.affiliate_email]
+            )
+            email.content_subtype = "html"
+            pending.append(email)
+        except Exception as e:
+            failed_count += 1
+            failed_emails.append(f"{card.card_number} - {str(e)}")
+            logger.error(f"Failed to compose campaign email for card {card.card_number}: {e}")
+
+        if len(pending) >= chunk_size:
+            flush()
+    if pending:
+        flush()
+
+    elapsed = time.monotonic() - started
+    emails_per_second = success_count / elapsed if elapsed else float(success_count)
+
+    message = f'{success_count} emails queued for delivery'
+    if failed_count > 0:
+        message += f', {failed_count} failed'
+    logger.info(
+        f"Bulk campaign {category} ({template_name}): {message} in {elapsed:.2f}s "
+        f"({emails_per_second:.0f} emails/sec)"
+    )
+
+    return {
+        'message': message,
+        'success_count': success_count,
+        'failed_count': failed_count,
+        'failed_emails': failed_emails,
+        'elapsed_seconds': round(elapsed, 3),
+        'emails_per_second': round(emails_per_second, 1),
+    }
@@ -0,0 +1,143 @@
+"""
+Rendered card artifact cache.
+
+Card PDFs and images are drawn from scratch (ReportLab canvas, PIL
+gradients, fonts and QR code) on every download and email delivery, even
+though a card's rendered content rarely changes. This module stores each
+rendered file in default storage under a key derived from the fields that
+appear on the card, so repeat requests for an unchanged card are served
+straight from storage.
+
+Keys are content hashes, so a stale artifact can never be served: any change
+to a rendered field produces a new key. The expiry date is coloured by how
+close it is to today, so that colour band is hashed as well. ``AffiliationCard.save`` calls
+``invalidate_card_artifacts`` when a rendered field changes so superseded
+files do not accumulate.
+"""
+import hashlib
+import json
+import logging
+from datetime import date
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+logger = logging.getLogger(__name__)
+
+
+# Bump when the card design changes so every cached artifact is re-rendered
+CARD_RENDER_VERSION = 1
+
+# AffiliationCard fields drawn on the PDF / image renderings
+RENDERED_CARD_FIELDS = (
+    'card_number',
+    'affiliate_title',
+    'affiliate_full_name',
+    'affiliate_surname',
+    'council_name',
+    'affiliation_type',
+    'status',
+    'date_issued',
+    'date_expires',
+    'verification_token',
+    'card_template_id',
+)
+
+# Days before expiry that the renderers draw the expiry date in gold
+EXPIRING_SOON_DAYS = 90
+
+ARTIFACT_ROOT = 'affiliationcard/rendered'
+
+ARTIFACT_TYPES = {
+    'pdf': ('pdf', 'application/pdf'),
+    'png': ('png', 'image/png'),
+    'jpg': ('jpg', 'image/jpeg'),
+    'jpeg': ('jpg', 'image/jpeg'),
+}
+
+
+def rendered_field_values(card):
+    """Return the card's rendered field values as a JSON-safe dict."""
+    values = {}
+    for field in RENDERED_CARD_FIELDS:
+        value = getattr(card, field, None)
+        values[field] = value.isoformat() if hasattr(value, 'isoformat') else value
+    values['expiry_band'] = expiry_band(card)
+    return values
+
+
+def expiry_band(card, today=None):
+    """The colour band the renderers draw the expiry date in."""
+    expires = getattr(card, 'date_expires', None)
+    if not expires:
+        return None
+    today = today or date.today()
+    if expires < today:
+        return 'expired'
+    if (expires - today).days < EXPIRING_SOON_DAYS:
+        return 'expiring'
+    return 'ok'
+
+
+def card_render_hash(card, file_format):
+    """Hash of everything that determines a rendered card file's bytes."""
+    payload = json.dumps(
+        [CARD_RENDER_VERSION, file_format, rendered_field_values(card)],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _artifact_dir(card):
+    return f"{ARTIFACT_ROOT}/{card.internal_id}"
+
+
+def get_card_artifact(card, file_format, renderer):
+    """
+    Return a rendered card file, rendering and storing it on a cache miss.
+
+    Args:
+        card: AffiliationCard instance
+        file_format: 'pdf', 'png', 'jpg' or 'jpeg'
+        renderer: Callable returning ``(content, filename, content_type)``
+
+    Returns:
+        tuple: (content, filename, content_type)
+    """
+    fmt = file_format.lower()
+    ext, content_type = ARTIFACT_TYPES[fmt]
+    filename = f"ACRP_Card_{card.card_number}.{ext}"
+    path = f"{_artifact_dir(card)}/{card_render_hash(card, fmt)}.{ext}"
+
+    try:
+        if default_storage.exists(path):
+            with default_storage.open(path, 'rb') as artifact:
+                return artifact.read(), filename, content_type
+    except Exception as e:
+        logger.warning(f"Card artifact cache read failed for {card.card_number}: {e}")
+
+    content, filename, content_type = renderer()
+
+    try:
+        default_storage.save(path, ContentFile(content))
+    except Exception as e:
+        logger.warning(f"Card artifact cache write failed for {card.card_number}: {e}")
+
+    return content, filename, content_type
+
+
+def invalidate_card_artifacts(card):
+    """Delete every cached rendering of a card."""
+    directory = _artifact_dir(card)
+    try:
+        _, files = default_storage.listdir(directory)
+    except FileNotFoundError:
+        return 0
+    try:
+        for name in files:
+            default_storage.delete(f"{directory}/{name}")
+        return len(files)
+    except Exception as e:
+        logger.warning(f"Could not invalidate card artifacts for {card.card_number}: {e}")
+        return 0
@@ -123,9 +123,9 @@ def process_email_pdf_delivery(delivery, kwargs):
         # Generate STYLED PDF file using the views function
         logger.info("Generating STYLED PDF using views.generate_card_pdf...")
         try:
-            # Import and use the styled PDF generator from views
-            from .views import generate_card_pdf
-            file_content, filename, content_type = generate_card_pdf(card)
+            # Import and use the styled (cached) PDF generator from views
+            from .views import generate_card_file as generate_styled_card_file
+            file_content, filename, content_type = generate_styled_card_file(card, 'pdf')
             logger.info(f"STYLED PDF generated: {filename} ({len(file_content)} bytes)")
         except Exception as pdf_error:
             logger.warning(f"Styled PDF generation failed: {pdf_error}, falling back to simple PDF")
@@ -26,6 +26,10 @@ import qrcode
 from io import BytesIO
 from django.core.files.base import ContentFile
 
+from app.sequences import allocate_numbers, last_issued_suffix
+
+from .card_cache import RENDERED_CARD_FIELDS, invalidate_card_artifacts
+
 User = get_user_model()
 
 
@@ -340,7 +344,41 @@ class AffiliationCard(models.Model):
             if self.status == 'active':
                 self.status = 'expired'
         
+        update_fields = kwargs.get('update_fields')
+        stored = None
+        if self.pk is not None and (update_fields is None or set(update_fields) & set(RENDERED_CARD_FIELDS)):
+            stored = self.get_stored_rendered_fields()
+        rendered_changed = stored is not None and any(
+            stored[field] != getattr(self, field) for field in RENDERED_CARD_FIELDS
+        )
+        
         super().save(*args, **kwargs)
+        
+        # Drop cached PDF/image renderings that no longer match the card
+        if rendered_changed:
+            invalidate_card_artifacts(self)
+        
+        # Drop cached verification snapshots, including those under a previous
+        # token or card number (counter-only saves leave the snapshot alone)
+        from .verification_cache import SNAPSHOT_FIELDS, invalidate_verification_cache
+        snapshot_fields = set(SNAPSHOT_FIELDS) - {'total_verifications', 'last_verified_at'}
+        if update_fields is None or set(update_fields) & snapshot_fields:
+            invalidate_verification_cache(
+                self,
+                tokens=[stored['verification_token']] if stored else [],
+                card_numbers=[stored['card_number']] if stored else [],
+            )
+    
+    def delete(self, *args, **kwargs):
+        """Delete the card and its cached verification snapshots."""
+        from .verification_cache import invalidate_verification_cache
+        result = super().delete(*args, **kwargs)
+        invalidate_verification_cache(self)
+        return result
+    
+    def get_stored_rendered_fields(self):
+        """Rendered field values of the stored row, or None if it does not exist."""
+        return AffiliationCard.objects.filter(pk=self.pk).values(*RENDERED_CARD_FIELDS).first()
     
     def clean(self):
         """Comprehensive validation."""
@@ -374,18 +412,50 @@ class AffiliationCard(models.Model):
         if not self.application:
             return f"TEMP{timezone.now().strftime('%Y%m%d%H%M%S')}"
         
-        council_code = self.get_council_code()
-        affiliation_code = self.get_affiliation_type_code()
+        return self.reserve_card_numbers(self.get_council_code(), self.get_affiliation_type_code())[0]
+    
+    @classmethod
+    def reserve_card_numbers(cls, council_code, affiliation_code, count=1):
+        """
+        Reserve ``count`` consecutive card numbers for a council/type.
+        
+        Numbers come from a per-prefix NumberSequence (see app.sequences),
+        so allocation is O(1) and concurrent callers never share a number.
+        Use with count > 1 when creating cards in bulk.
+        """
         year = timezone.now().year % 100  # Last 2 digits
+        prefix = f"{council_code}C{affiliation_code}{year:02d}"
         
-        # Get next sequence number for this council/type/year
-        sequence = AffiliationCard.objects.filter(
-            council_code=council_code,
-            affiliation_type=affiliation_code,
-            created_at__year=timezone.now().year
-        ).count() + 1
+        sequences = allocate_numbers(
+            f"card:{prefix}",
+            count,
+            seed=lambda: last_issued_suffix(cls.objects.all(), 'card_number', prefix),
+        )
+        return [f"{prefix}{sequence:05d}" for sequence in sequences]
+    
+    @classmethod
+    def allocate_card_numbers(cls, cards):
+        """
+        New card numbers for many cards, reserved with one sequence call per
+        council/type group.
         
-        return f"{council_code}C{affiliation_code}{year:02d}{sequence:05d}"
+        Returns:
+            dict: card pk -> new card number (cards without an application
+            get a TEMP number, as in ``generate_card_number``)
+        """
+        numbers = {}
+        groups = {}
+        for card in cards:
+            if not card.application:
+                numbers[card.pk] = card.generate_card_number()
+            else:
+                key = (card.get_council_code(), card.get_affiliation_type_code())
+                groups.setdefault(key, []).append(card.pk)
+        
+        for (council_code, affiliation_code), card_pks in groups.items():
+            reserved = cls.reserve_card_numbers(council_code, affiliation_code, count=len(card_pks))
+            numbers.update(zip(card_pks, reserved))
+        return numbers
     
     def generate_verification_token(self):
         """Generate cryptographically secure verification token."""
@@ -803,8 +873,17 @@ class CardVerification(models.Model):
     
     verification_type = models.CharField(max_length=20, choices=VERIFICATION_TYPES)
     
-    # Request details
-    verified_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Public reference, known before the row is written (verifications are
+    # recorded write-behind, see verification_buffer)
+    reference = models.UUIDField(
+        default=uuid.uuid4,
+        editable=False,
+        help_text="Verification ID shown to the verifier"
+    )
+    
+    # Request details (default rather than auto_now_add so a buffered
+    # verification keeps the time it happened, not the time it was flushed)
+    verified_at = models.DateTimeField(default=timezone.now, db_index=True)
     ip_address = models.GenericIPAddressField()
     user_agent = models.TextField(blank=True)
     referer = models.URLField(blank=True)
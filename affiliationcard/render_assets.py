@@ -0,0 +1,186 @@
+"""
+Process-level render asset cache for PIL card images.
+
+Everything on a card image that does not depend on the card itself -
+TrueType fonts, the drop shadows, the navy header with its accent stripe,
+the static header text, footer and borders - is built once per process and
+reused. ``generate_card_image`` copies the cached base layer and draws only
+the per-card text, status badge and QR code on top.
+
+Caches are keyed by canvas size, are per process (each
+batch render worker warms its own) and can be dropped with
+``clear_render_assets()``, e.g. after changing the design.
+"""
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+
+# Layout constants shared with generate_card_image
+CANVAS_SIZE = (1400, 880)
+CARD_SIZE = (1200, 760)
+RADIUS = 28
+MARGIN = 50
+HEADER_HEIGHT = 200
+FOOTER_OFFSET = 60
+
+# Professional color palette - matching PDF design
+PRIMARY_NAVY = (15, 23, 42)
+PRIMARY_BLUE = (30, 64, 175)
+ACCENT_BLUE = (59, 130, 246)
+ACCENT_EMERALD = (5, 150, 105)
+ACCENT_GOLD = (217, 119, 6)
+ALERT_RED = (239, 68, 68)
+TEXT_PRIMARY = (17, 24, 39)
+TEXT_SECONDARY = (75, 85, 99)
+TEXT_MUTED = (156, 163, 175)
+TEXT_WHITE = (255, 255, 255)
+BG_LIGHT = (248, 250, 252)
+CARD_BG = (255, 255, 255)
+
+FONT_PATHS = (
+    '/System/Library/Fonts/Helvetica.ttc',
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
+    '/Windows/Fonts/arial.ttf',
+    'arial.ttf',
+)
+
+# Named font sizes used on the card
+FONT_SIZES = {
+    'logo': 42,
+    'org': 16,
+    'badge': 12,
+    'name': 38,
+    'title': 24,
+    'meta': 18,
+    'small': 14,
+    'tiny': 12,
+}
+
+
+def card_origin(canvas_size=CANVAS_SIZE, card_size=CARD_SIZE):
+    """Top-left corner of the card on the canvas."""
+    return (canvas_size[0] - card_size[0]) // 2, (canvas_size[1] - card_size[1]) // 2
+
+
+@lru_cache(maxsize=None)
+def get_font(size):
+    """Load the first available TrueType font at ``size``, once per process."""
+    for path in FONT_PATHS:
+        try:
+            return ImageFont.truetype(path, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+def get_fonts():
+    """Return the card fonts keyed by role (see FONT_SIZES)."""
+    return {role: get_font(size) for role, size in FONT_SIZES.items()}
+
+
+def text_width(draw, text, font, fallback_char_width):
+    """Rendered width of ``text``, estimated on Pillow versions without textbbox."""
+    try:
+        bbox = draw.textbbox((0, 0), text, font=font)
+        return bbox[2] - bbox[0]
+    except AttributeError:
+        return len(text) * fallback_char_width
+
+
+@lru_cache(maxsize=16)
+def get_card_base_layer(canvas_size=CANVAS_SIZE, card_size=CARD_SIZE):
+    """
+    Static layers of the card image: background, shadows, header, footer
+    and borders. Cached per size; callers must ``copy()`` it.
+    """
+    W, H = canvas_size
+    CARD_W, CARD_H = card_size
+    CARD_X, CARD_Y = card_origin(canvas_size, card_size)
+    fonts = get_fonts()
+
+    canvas = Image.new('RGB', (W, H), BG_LIGHT)
+
+    # Enhanced shadow with multiple layers for depth
+    shadow_layers = [
+        (CARD_W + 16, CARD_H + 16, 8, (0, 0, 0, 60)),   # Close shadow
+        (CARD_W + 32, CARD_H + 32, 16, (0, 0, 0, 30)),  # Medium shadow
+        (CARD_W + 48, CARD_H + 48, 24, (0, 0, 0, 15)),  # Far shadow
+    ]
+
+    for shadow_w, shadow_h, blur, color in shadow_layers:
+        shadow = Image.new('RGBA', (shadow_w, shadow_h), color)
+        shadow_mask = Image.new('L', (shadow_w, shadow_h), 0)
+        sd = ImageDraw.Draw(shadow_mask)
+        sd.rounded_rectangle([0, 0, shadow_w, shadow_h], radius=RADIUS + 8, fill=255)
+        shadow.putalpha(shadow_mask)
+        shadow = shadow.filter(ImageFilter.GaussianBlur(blur))
+
+        offset_x = CARD_X - (shadow_w - CARD_W) // 2
+        offset_y = CARD_Y - (shadow_h - CARD_H) // 2 + 6
+        canvas.paste(shadow, (offset_x, offset_y), shadow)
+
+    # Card background with navy header and diagonal accent stripe
+    card_img = Image.new('RGBA', (CARD_W, CARD_H), CARD_BG)
+    header_bg = Image.new('RGB', (CARD_W, HEADER_HEIGHT), PRIMARY_NAVY)
+
+    stripe_img = Image.new('RGBA', (CARD_W, HEADER_HEIGHT), (0, 0, 0, 0))
+    stripe_draw = ImageDraw.Draw(stripe_img)
+    stripe_draw.polygon([
+        (0, HEADER_HEIGHT - 60),
+        (int(CARD_W * 0.4), HEADER_HEIGHT - 60),
+        (int(CARD_W * 0.45), HEADER_HEIGHT),
+        (0, HEADER_HEIGHT)
+    ], fill=ACCENT_BLUE)
+
+    header_bg.paste(stripe_img, (0, 0), stripe_img)
+    card_img.paste(header_bg, (0, 0))
+
+    # Card mask with rounded corners
+    mask = Image.new('L', (CARD_W, CARD_H), 0)
+    mdraw = ImageDraw.Draw(mask)
+    mdraw.rounded_rectangle([0, 0, CARD_W, CARD_H], radius=RADIUS, fill=255)
+    canvas.paste(card_img.convert('RGB'), (CARD_X, CARD_Y), mask)
+    draw = ImageDraw.Draw(canvas)
+
+    # Static header text and digital card badge
+    header_y_start = CARD_Y + 30
+    draw.text((CARD_X + MARGIN, header_y_start), "ACRP", font=fonts['logo'], fill=TEXT_WHITE)
+
+    org_y = header_y_start + 50
+    draw.text((CARD_X + MARGIN, org_y), "ASSOCIATION OF CHRISTIAN", font=fonts['org'], fill=TEXT_WHITE)
+    draw.text((CARD_X + MARGIN, org_y + 20), "RELIGIOUS PRACTITIONERS", font=fonts['org'], fill=TEXT_WHITE)
+
+    badge_x = CARD_X + MARGIN
+    badge_y = header_y_start + 100
+    draw.rounded_rectangle([badge_x, badge_y, badge_x + 240, badge_y + 28], radius=8, fill=ACCENT_EMERALD)
+    draw.text((badge_x + 8, badge_y + 6), "DIGITAL AFFILIATION CARD", font=fonts['badge'], fill=TEXT_WHITE)
+
+    # Footer
+    footer_y = CARD_Y + CARD_H - FOOTER_OFFSET
+    footer_bg = Image.new('RGBA', (CARD_W, 50), (247, 248, 249, 255))
+    canvas.paste(footer_bg, (CARD_X, footer_y), footer_bg)
+    draw.line([(CARD_X + 30, footer_y), (CARD_X + CARD_W - 30, footer_y)], fill=TEXT_MUTED, width=1)
+
+    draw.text((CARD_X + MARGIN, footer_y + 12), "ACRP South Africa", font=fonts['small'], fill=TEXT_SECONDARY)
+    draw.text((CARD_X + MARGIN, footer_y + 28), "Professional Religious Practitioners",
+              font=fonts['tiny'], fill=TEXT_MUTED)
+
+    verify_text = "verify: kreeck.com/card/verify"
+    verify_width = text_width(draw, verify_text, fonts['tiny'], 6)
+    draw.text((CARD_X + CARD_W - MARGIN - verify_width, footer_y + 28),
+              verify_text, font=fonts['tiny'], fill=TEXT_MUTED)
+
+    # Outer and inner accent borders
+    draw.rounded_rectangle([CARD_X + 1, CARD_Y + 1, CARD_X + CARD_W - 1, CARD_Y + CARD_H - 1],
+                           radius=RADIUS, outline=TEXT_MUTED, width=2)
+    draw.rounded_rectangle([CARD_X + 3, CARD_Y + 3, CARD_X + CARD_W - 3, CARD_Y + CARD_H - 3],
+                           radius=RADIUS - 2, outline=ACCENT_BLUE + (100,), width=1)
+
+    return canvas
+
+
+def clear_render_assets():
+    """Drop all cached fonts and layers in this process."""
+    get_font.cache_clear()
+    get_card_base_layer.cache_clear()
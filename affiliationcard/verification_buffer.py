@@ -0,0 +1,221 @@
+"""
+Write-behind card verification recording.
+
+Every public verification (QR scan, lookup, API call) used to insert a
+CardVerification row and UPDATE its AffiliationCard row in the request.
+A card scanned repeatedly - e.g. at an event entrance - serialised every
+request on that one row lock.
+
+Verifications are now appended to an in-process buffer and written by a
+background flusher thread:
+
+- CardVerification rows are inserted with one ``bulk_create`` per flush
+- Counter updates are aggregated per card, so each card gets a single
+  ``total_verifications = total_verifications + n`` UPDATE per flush no
+  matter how many times it was scanned
+
+The buffer is flushed when it reaches BATCH_SIZE, every
+FLUSH_INTERVAL_SECONDS, and at interpreter exit, so a worker that shuts
+down gracefully does not lose events. If a batch fails it is retried one
+event at a time: an event that still fails (e.g. its card was deleted) is
+logged and dropped so it cannot block later flushes. Only when the
+database itself is unreachable are the unwritten events put back at the
+front of the buffer.
+
+Set ``CARD_VERIFICATION_BUFFER['ENABLED'] = False`` to write synchronously.
+"""
+import atexit
+import logging
+import os
+import threading
+import uuid
+from collections import Counter, deque
+
+from django.conf import settings
+from django.db import OperationalError, close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import AffiliationCard, CardVerification
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_BUFFER_SETTINGS = {
+    'ENABLED': True,
+    'BATCH_SIZE': 200,
+    'FLUSH_INTERVAL_SECONDS': 5,
+    'MAX_BUFFERED': 50000,
+}
+
+_buffer = deque()
+_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_wakeup = threading.Event()
+_flusher = None
+_flusher_pid = None
+
+
+def get_buffer_setting(name):
+    return getattr(settings, 'CARD_VERIFICATION_BUFFER', {}).get(name, DEFAULT_BUFFER_SETTINGS[name])
+
+
+# ============================================================================
+# RECORDING
+# ============================================================================
+
+def record_verification(card, verification_type, ip_address, **fields):
+    """
+    Record a successful verification of ``card``.
+
+    The returned CardVerification is not saved yet; its ``reference`` and
+    ``verified_at`` are final and can be shown to the user immediately.
+    ``card.total_verifications`` and ``card.last_verified_at`` are updated
+    in memory to reflect this verification.
+
+    Args:
+        card: AffiliationCard being verified
+        verification_type: One of CardVerification.VERIFICATION_TYPES
+        ip_address: Client IP address
+        **fields: Any other CardVerification field (user_agent, referer,
+            verification_purpose, ...)
+    """
+    now = timezone.now()
+    verification = CardVerification(
+        card=card,
+        reference=uuid.uuid4(),
+        verification_type=verification_type,
+        verified_at=now,
+        ip_address=ip_address,
+        was_successful=True,
+        card_status_at_time=card.status,
+        **fields
+    )
+
+    card.total_verifications = (card.total_verifications or 0) + 1
+    card.last_verified_at = now
+
+    if not get_buffer_setting('ENABLED'):
+        _write_batch([verification])
+        return verification
+
+    with _lock:
+        if len(_buffer) >= get_buffer_setting('MAX_BUFFERED'):
+            # Database unreachable for a long time; drop the oldest event
+            # rather than grow without bound
+            _buffer.popleft()
+            logger.warning("Card verification buffer full; dropped oldest event")
+        _buffer.append(verification)
+        size = len(_buffer)
+
+    _ensure_flusher()
+    if size >= get_buffer_setting('BATCH_SIZE'):
+        _wakeup.set()
+    return verification
+
+
+# ============================================================================
+# FLUSHING
+# ============================================================================
+
+def flush_verifications():
+    """
+    Write all buffered verifications to the database.
+
+    Returns:
+        Number of verifications written
+    """
+    with _flush_lock:
+        with _lock:
+            batch = list(_buffer)
+            _buffer.clear()
+
+        if not batch:
+            return 0
+
+        try:
+            _write_batch(batch)
+        except Exception as e:
+            logger.warning(f"Card verification flush of {len(batch)} events failed, writing one by one: {e}")
+            return _write_each(batch)
+
+        return len(batch)
+
+
+def _write_each(batch):
+    """
+    Write a failed batch one event at a time. Events that still fail are
+    dropped; the rest of the batch is requeued only if the database is
+    unreachable.
+    """
+    written = 0
+    for index, verification in enumerate(batch):
+        try:
+            _write_batch([verification])
+        except OperationalError as e:
+            remaining = batch[index:]
+            logger.error(f"Card verification flush failed, will retry {len(remaining)} events: {e}")
+            with _lock:
+                _buffer.extendleft(reversed(remaining))
+            break
+        except Exception as e:
+            logger.error(
+                f"Dropped card verification {verification.reference} of card "
+                f"{verification.card_id} ({verification.verification_type} from "
+                f"{verification.ip_address} at {verification.verified_at.isoformat()}): {e}"
+            )
+        else:
+            written += 1
+    return written
+
+
+def _write_batch(batch):
+    """Insert verification rows and apply per-card counter deltas."""
+    counts = Counter(verification.card_id for verification in batch)
+    last_seen = {}
+    for verification in batch:
+        last_seen[verification.card_id] = max(
+            verification.verified_at, last_seen.get(verification.card_id, verification.verified_at)
+        )
+
+    with transaction.atomic():
+        CardVerification.objects.bulk_create(batch, batch_size=500)
+        # Lock card rows in a consistent order to avoid deadlocks between flushers
+        for card_id in sorted(counts):
+            AffiliationCard.objects.filter(pk=card_id).update(
+                total_verifications=F('total_verifications') + counts[card_id],
+                last_verified_at=last_seen[card_id],
+            )
+
+
+def _ensure_flusher():
+    """Start the background flusher thread for this process if needed."""
+    global _flusher, _flusher_pid
+    if _flusher is not None and _flusher.is_alive() and _flusher_pid == os.getpid():
+        return
+    with _lock:
+        if _flusher is not None and _flusher.is_alive() and _flusher_pid == os.getpid():
+            return
+        _flusher_pid = os.getpid()
+        _flusher = threading.Thread(target=_flush_loop, name='card-verification-flusher', daemon=True)
+        _flusher.start()
+
+
+def _flush_loop():
+    interval = get_buffer_setting('FLUSH_INTERVAL_SECONDS')
+    while True:
+        _wakeup.wait(interval)
+        _wakeup.clear()
+        close_old_connections()
+        try:
+            flush_verifications()
+        finally:
+            close_old_connections()
+
+
+@atexit.register
+def _flush_on_exit():
+    try:
+        flush_verifications()
+    except Exception as e:
+        logger.error(f"Could not flush card verifications at shutdown: {e}")
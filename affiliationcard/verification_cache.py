@@ -0,0 +1,177 @@
+"""
+Read cache for public card verification lookups.
+
+Every QR scan, lookup and API verification fetched the AffiliationCard row
+by ``verification_token`` or ``card_number``. Verification only needs a
+handful of display fields, so a compact snapshot of those fields is kept in
+the cache under both the token and the card number and a verification costs
+a single cache lookup.
+
+- Snapshots are turned back into (read-only) AffiliationCard instances, so
+  views and templates keep calling ``is_active()``, ``days_until_expiry()``
+  etc., which are evaluated against the current date on every request.
+  Fields not in the snapshot are deferred and load from the database only if
+  something accesses them.
+- Unknown tokens and numbers are cached as NOT_FOUND for a short time, so
+  enumeration attempts do not reach the database.
+- ``AffiliationCard.save`` (and therefore ``suspend_card``, ``revoke_card``
+  and ``renew_card``) and ``delete`` call ``invalidate_verification_cache``.
+  Updates made with ``QuerySet.update()`` bypass this and are picked up when
+  the snapshot expires. ``total_verifications`` is likewise updated in bulk
+  by the verification buffer and may lag by up to TIMEOUT seconds.
+
+Set ``CARD_VERIFICATION_CACHE['ENABLED'] = False`` to always read the database.
+"""
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import AffiliationCard
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CACHE_SETTINGS = {
+    'ENABLED': True,
+    'TIMEOUT': 5 * 60,
+    'NOT_FOUND_TIMEOUT': 60,
+}
+
+# AffiliationCard fields needed by the verification pages and API
+SNAPSHOT_FIELDS = (
+    'id',
+    'card_number',
+    'verification_token',
+    'status',
+    'affiliate_title',
+    'affiliate_full_name',
+    'affiliate_surname',
+    'affiliate_photo',
+    'council_code',
+    'council_name',
+    'affiliation_type',
+    'designation_category',
+    'designation_subcategory',
+    'date_issued',
+    'date_expires',
+    'grace_period_days',
+    'total_verifications',
+    'last_verified_at',
+)
+
+NOT_FOUND = 'not_found'
+
+KEY_PREFIX = 'card_verify'
+
+
+def get_cache_setting(name):
+    return getattr(settings, 'CARD_VERIFICATION_CACHE', {}).get(name, DEFAULT_CACHE_SETTINGS[name])
+
+
+def _cache_key(lookup, value):
+    # Values come from the public; hash them so any input is a valid cache key
+    digest = hashlib.sha256(str(value).encode()).hexdigest()
+    return f"{KEY_PREFIX}:{lookup}:{digest}"
+
+
+# ============================================================================
+# LOOKUP
+# ============================================================================
+
+def get_card_for_verification(verification_token=None, card_number=None):
+    """
+    Return the card with the given token (preferred) or card number.
+
+    Raises:
+        AffiliationCard.DoesNotExist: No such card (possibly a cached miss)
+    """
+    if verification_token:
+        lookup, value = 'verification_token', verification_token
+    else:
+        lookup, value = 'card_number', card_number
+
+    if not value:
+        raise AffiliationCard.DoesNotExist("No card token or number given")
+
+    if not get_cache_setting('ENABLED'):
+        return AffiliationCard.objects.get(**{lookup: value})
+
+    key = _cache_key(lookup, value)
+    try:
+        snapshot = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Card verification cache read failed: {e}")
+        return AffiliationCard.objects.get(**{lookup: value})
+
+    if snapshot == NOT_FOUND:
+        raise AffiliationCard.DoesNotExist(f"No card with {lookup} {value} (cached)")
+    if snapshot is not None:
+        return card_from_snapshot(snapshot)
+
+    snapshot = (
+        AffiliationCard.objects.filter(**{lookup: value})
+        .values(*_snapshot_attnames())
+        .first()
+    )
+    if snapshot is None:
+        _cache_set({key: NOT_FOUND}, get_cache_setting('NOT_FOUND_TIMEOUT'))
+        raise AffiliationCard.DoesNotExist(f"No card with {lookup} {value}")
+
+    # Store under both keys so a card scanned by QR is also warm for lookups
+    _cache_set({
+        _cache_key('verification_token', snapshot['verification_token']): snapshot,
+        _cache_key('card_number', snapshot['card_number']): snapshot,
+    }, get_cache_setting('TIMEOUT'))
+    return card_from_snapshot(snapshot)
+
+
+def card_from_snapshot(snapshot):
+    """Build an AffiliationCard from a snapshot; other fields are deferred."""
+    field_names = []
+    values = []
+    for field in AffiliationCard._meta.concrete_fields:
+        if field.attname in snapshot:
+            field_names.append(field.attname)
+            values.append(snapshot[field.attname])
+    return AffiliationCard.from_db('default', field_names, values)
+
+
+def _snapshot_attnames():
+    return [AffiliationCard._meta.get_field(name).attname for name in SNAPSHOT_FIELDS]
+
+
+def _cache_set(entries, timeout):
+    try:
+        cache.set_many(entries, timeout)
+    except Exception as e:
+        logger.warning(f"Card verification cache write failed: {e}")
+
+
+# ============================================================================
+# INVALIDATION
+# ============================================================================
+
+def invalidate_verification_cache(*cards, tokens=(), card_numbers=()):
+    """
+    Drop cached snapshots (and cached misses) for cards, tokens or numbers.
+
+    Called with the saved card and, when they changed, its previous token
+    and card number.
+    """
+    keys = set()
+    for card in cards:
+        if card.verification_token:
+            keys.add(_cache_key('verification_token', card.verification_token))
+        if card.card_number:
+            keys.add(_cache_key('card_number', card.card_number))
+    keys.update(_cache_key('verification_token', token) for token in tokens if token)
+    keys.update(_cache_key('card_number', number) for number in card_numbers if number)
+
+    if not keys:
+        return
+    try:
+        cache.delete_many(list(keys))
+    except Exception as e:
+        logger.warning(f"Card verification cache invalidation failed: {e}")
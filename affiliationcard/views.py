@@ -30,6 +30,7 @@ from django.db.models import Q, Count, Avg, Sum, F
 from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.conf import settings
+from django.template import TemplateDoesNotExist
 from django.template.loader import render_to_string
 
 # Image processing
@@ -43,6 +44,18 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image as RLImage
 from reportlab.lib.styles import getSampleStyleSheet
 
+from app.email_outbox import queue_email
+from app.export_jobs import enqueue_export
+from app.ratelimit import check_request_rate
+
+from . import render_assets
+from .batch_render import render_cards, render_cards_on_commit
+from .bulk_mail import send_bulk_campaign
+from .card_cache import get_card_artifact
+from .dashboard import get_card_dashboard_snapshot
+from .verification_buffer import record_verification
+from .verification_cache import get_card_for_verification
+
 from .models import (
     AffiliationCard, CardTemplate, CardVerification, CardDelivery,
     CardStatusChange, CardSystemSettings
@@ -71,95 +84,62 @@ def bulk_send_emails(cards, user, email_type='general', custom_subject=None, cus
         custom_subject: Custom email subject (for custom email type)
         custom_message: Custom email message (for custom email type)
     """
-    success_count = 0
-    failed_count = 0
-    failed_emails = []
+    # Subject and template per email type ({card_number} is filled in per card)
+    if email_type == 'renewal_reminder':
+        subject = "ACRP Card Renewal Reminder - {card_number}"
+        template = 'affiliationcard/emails/renewal_reminder.html'
+        
+    elif email_type == 'update':
+        subject = "ACRP Card System Update - {card_number}"
+        template = 'affiliationcard/emails/system_update.html'
+        
+    elif email_type == 'reactivation':
+        subject = "Reactivate Your ACRP Card - {card_number}"
+        template = 'affiliationcard/emails/reactivation.html'
+        
+    elif email_type == 'welcome':
+        subject = "Welcome to ACRP Digital Cards - {card_number}"
+        template = 'affiliationcard/emails/welcome.html'
+        
+    elif email_type == 'custom':
+        subject = custom_subject or "ACRP Card Communication - {card_number}"
+        template = 'affiliationcard/emails/custom.html'
+        
+    else:
+        subject = "ACRP Card Information - {card_number}"
+        template = 'affiliationcard/emails/general.html'
     
-    for card in cards:
-        try:
-            # Skip cards without email addresses
-            if not card.affiliate_email:
-                failed_count += 1
-                failed_emails.append(f"{card.card_number} - No email address")
-                continue
-            
-            # Determine email content based on type
-            if email_type == 'renewal_reminder':
-                subject = f"ACRP Card Renewal Reminder - {card.card_number}"
-                template = 'affiliationcard/emails/renewal_reminder.html'
-                
-            elif email_type == 'update':
-                subject = f"ACRP Card System Update - {card.card_number}"
-                template = 'affiliationcard/emails/system_update.html'
-                
-            elif email_type == 'reactivation':
-                subject = f"Reactivate Your ACRP Card - {card.card_number}"
-                template = 'affiliationcard/emails/reactivation.html'
-                
-            elif email_type == 'welcome':
-                subject = f"Welcome to ACRP Digital Cards - {card.card_number}"
-                template = 'affiliationcard/emails/welcome.html'
-                
-            elif email_type == 'custom':
-                subject = custom_subject or f"ACRP Card Communication - {card.card_number}"
-                template = 'affiliationcard/emails/custom.html'
-                
-            else:
-                subject = f"ACRP Card Information - {card.card_number}"
-                template = 'affiliationcard/emails/general.html'
-            
-            # Prepare email context
-            context = {
-                'card': card,
-                'user': user,
-                'email_type': email_type,
-                'custom_message': custom_message,
-                'current_year': timezone.now().year,
-                'verification_url': request.build_absolute_uri(
-                    reverse('affiliationcard:verify_token', args=[card.verification_token])
-                ) if request else '#',
-                'card_detail_url': request.build_absolute_uri(
-                    reverse('affiliationcard:download_card', args=[card.verification_token])
-                ) if request else '#',
-            }
-            
-            # Render email content
-            message = render_to_string(template, context)
-            
-            # Send email
-            email = EmailMessage(
-                subject=subject,
-                body=message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                to=[card.affiliate_email]
-            )
-            email.content_subtype = "html"
-            email.send()
-            
-            success_count += 1
-            
-            # Log the email sending
-            logger.info(f"Bulk email sent to {card.affiliate_email} for card {card.card_number} by {user.username}")
-            
-        except Exception as e:
-            failed_count += 1
-            failed_emails.append(f"{card.card_number} - {str(e)}")
-            logger.error(f"Failed to send bulk email for card {card.card_number}: {e}")
+    # Campaign-wide context; card, verification_url and card_detail_url are
+    # filled in per recipient by the composer
+    context = {
+        'user': user,
+        'email_type': email_type,
+        'custom_message': custom_message,
+        'current_year': timezone.now().year,
+    }
     
-    # Prepare result message
-    message = f'{success_count} emails sent successfully'
-    if failed_count > 0:
-        message += f', {failed_count} failed'
+    try:
+        result = send_bulk_campaign(
+            cards, template, subject, context=context, request=request,
+            category=f'card_{email_type}'
+        )
+    except Exception as e:
+        # e.g. TemplateDoesNotExist: fail the campaign once instead of per card
+        if isinstance(e, TemplateDoesNotExist):
+            e = f"Email template {template} not found"
+        logger.error(f"Bulk {email_type} email campaign failed: {e}")
+        return {
+            'message': f'Bulk email failed: {str(e)}',
+            'success_count': 0,
+            'failed_count': len(cards),
+            'failed_emails': [str(e)]
+        }
     
-    return {
-        'message': message,
-        'success_count': success_count,
-        'failed_count': failed_count,
-        'failed_emails': failed_emails
-    }
+    logger.info(f"Bulk {email_type} emails queued by {user.username}: {result['message']}")
+    return result
 
 
-def bulk_regenerate_cards(cards, user, reason='bulk_regeneration', regenerate_tokens=True, regenerate_numbers=False, update_template=None):
+def bulk_regenerate_cards(cards, user, reason='bulk_regeneration', regenerate_tokens=True, regenerate_numbers=False, update_template=None, render_formats=('pdf',)):
     """
     Bulk regenerate card data (tokens, numbers, templates).
     
@@ -170,12 +150,19 @@ def bulk_regenerate_cards(cards, user, reason='bulk_regeneration', regenerate_to
         regenerate_tokens: Whether to regenerate verification tokens
         regenerate_numbers: Whether to regenerate card numbers
         update_template: New template to apply (CardTemplate instance)
+        render_formats: Card files to re-render for the regenerated cards
+            (in parallel, see ``batch_render``); empty to skip rendering
     """
     success_count = 0
     failed_count = 0
     failed_cards = []
+    regenerated_ids = []
     
     with transaction.atomic():
+        cards = list(cards.prefetch_related('application') if hasattr(cards, 'prefetch_related') else cards)
+        # Reserve every group's new numbers in one sequence update
+        new_numbers = AffiliationCard.allocate_card_numbers(cards) if regenerate_numbers else {}
+        
         for card in cards:
             try:
                 old_data = {
@@ -190,14 +177,8 @@ def bulk_regenerate_cards(cards, user, reason='bulk_regeneration', regenerate_to
                 
                 # Regenerate card number (be careful with this!)
                 if regenerate_numbers:
-                    # Generate new card number using the same pattern as original
-                    new_card_number = card.generate_card_number()
-                    
-                    # Ensure uniqueness
-                    while AffiliationCard.objects.filter(card_number=new_card_number).exists():
-                        new_card_number = card.generate_card_number()
-                    
-                    card.card_number = new_card_number
+                    # Reserved from the card number sequence, so always unique
+                    card.card_number = new_numbers[card.pk]
                 
                 # Update template if provided
                 if update_template:
@@ -212,21 +193,21 @@ def bulk_regenerate_cards(cards, user, reason='bulk_regeneration', regenerate_to
                     card=card,
                     old_status=card.status,
                     new_status=card.status,  # Status doesn't change
-                    reason=f"Bulk regeneration: {reason}",
-                    changed_by=user,
-                    ip_address='127.0.0.1',  # System operation
-                    user_agent='System/BulkRegeneration',
-                    additional_data=json.dumps({
+                    reason=f"Bulk regeneration: {reason}\n" + json.dumps({
                         'operation': 'bulk_regeneration',
                         'regenerated_tokens': regenerate_tokens,
                         'regenerated_numbers': regenerate_numbers,
                         'old_card_number': old_data['card_number'],
                         'old_verification_token': old_data['verification_token'][:10] + '...',  # Partial for security
                         'new_template': update_template.name if update_template else None
-                    })
+                    }),
+                    changed_by=user,
+                    ip_address='127.0.0.1',  # System operation
+                    user_agent='System/BulkRegeneration',
                 )
                 
                 success_count += 1
+                regenerated_ids.append(card.pk)
                 
                 logger.info(f"Card {card.card_number} regenerated by {user.username}: {reason}")
                 
@@ -240,24 +221,43 @@ def bulk_regenerate_cards(cards, user, reason='bulk_regeneration', regenerate_to
     if failed_count > 0:
         message += f', {failed_count} failed'
     
-    return {
+    result = {
         'message': message,
         'success_count': success_count,
         'failed_count': failed_count,
         'failed_cards': failed_cards
     }
+    
+    # Re-render the new card files so deliveries are served from cache; inside
+    # a caller's transaction this waits for the commit so workers see the cards
+    if render_formats and regenerated_ids:
+        render_result = render_cards_on_commit(regenerated_ids, formats=render_formats)
+        if render_result is None:
+            result['message'] += '; card files will be rendered once the changes are saved'
+        else:
+            result['message'] += f"; {render_result['message']}"
+            result['failed_cards'] += render_result['failed_cards']
+            result['cards_per_second'] = render_result['cards_per_second']
+    
+    return result
 
 
 def bulk_send_emails_with_attachments(cards, user, email_type='card_delivery', attachment_format='pdf'):
     """
     Bulk send emails with card attachments.
     
-    This is a specialized version for sending actual card files.
+    This is a specialized version for sending actual card files. Card files
+    are rendered up front in parallel (see ``batch_render``); the send loop
+    then reads each attachment from the rendered card cache.
     """
     success_count = 0
     failed_count = 0
     failed_emails = []
     
+    render_result = render_cards(cards, formats=(attachment_format,))
+    rendered_ids = set(render_result['rendered_ids'])
+    failed_emails.extend(render_result['failed_cards'])
+    
     for card in cards:
         try:
             if not card.affiliate_email:
@@ -265,7 +265,11 @@ def bulk_send_emails_with_attachments(cards, user, email_type='card_delivery', a
                 failed_emails.append(f"{card.card_number} - No email address")
                 continue
             
-            # Generate card file
+            if card.pk not in rendered_ids:
+                failed_count += 1
+                continue
+            
+            # Card file (cache hit after the batch render above)
             file_content, filename, content_type = generate_card_file(card, attachment_format)
             
             # Prepare email
@@ -287,8 +291,8 @@ def bulk_send_emails_with_attachments(cards, user, email_type='card_delivery', a
             email.content_subtype = "html"
             email.attach(filename, file_content, content_type)
             
-            # Send email
-            email.send()
+            # Queue email for delivery
+            queue_email(email, category='card_delivery')
             
             success_count += 1
             
@@ -304,22 +308,24 @@ def bulk_send_emails_with_attachments(cards, user, email_type='card_delivery', a
                 completed_at=timezone.now()
             )
             
-            logger.info(f"Card attachment sent to {card.affiliate_email} for card {card.card_number}")
+            logger.info(f"Card attachment queued for {card.affiliate_email} for card {card.card_number}")
             
         except Exception as e:
             failed_count += 1
             failed_emails.append(f"{card.card_number} - {str(e)}")
             logger.error(f"Failed to send card attachment for {card.card_number}: {e}")
     
-    message = f'{success_count} card emails sent successfully'
+    message = f'{success_count} card emails queued for delivery'
     if failed_count > 0:
         message += f', {failed_count} failed'
+    message += f" ({render_result['cards_per_second']} cards/sec rendered)"
     
     return {
         'message': message,
         'success_count': success_count,
         'failed_count': failed_count,
-        'failed_emails': failed_emails
+        'failed_emails': failed_emails,
+        'cards_per_second': render_result['cards_per_second'],
     }
 
 
@@ -377,16 +383,8 @@ def get_client_ip(request):
 
 
 def rate_limit_verification(request, max_attempts=10, window_minutes=60):
-    """Simple rate limiting for verification attempts."""
-    ip = get_client_ip(request)
-    cache_key = f"card_verification_attempts:{ip}"
-    
-    attempts = cache.get(cache_key, 0)
-    if attempts >= max_attempts:
-        return False
-    
-    cache.set(cache_key, attempts + 1, window_minutes * 60)
-    return True
+    """Rate limit public verification attempts per client IP."""
+    return check_request_rate(request, 'card_verification', max_attempts, window_minutes * 60).allowed
 
 
 # ============================================================================
@@ -563,83 +561,15 @@ def card_dashboard(request):
     if hasattr(request.user, 'acrp_role') and request.user.acrp_role == 'LEARNER':
         return redirect('affiliationcard:learner_dashboard')
     
-    from enrollments.models import AssociatedApplication, DesignatedApplication, StudentApplication
-    
-    # Get summary statistics
-    stats = {
-        'total_cards': AffiliationCard.objects.count(),
-        'active_cards': AffiliationCard.objects.filter(status='active').count(),
-        'pending_cards': AffiliationCard.objects.filter(status='pending_assignment').count(),
-        'expired_cards': AffiliationCard.objects.filter(status='expired').count(),
-        'assigned_cards': AffiliationCard.objects.filter(status='assigned').count(),
-        'suspended_cards': AffiliationCard.objects.filter(status='suspended').count(),
-        'total_verifications': CardVerification.objects.count(),
-        'recent_verifications': CardVerification.objects.filter(
-            verified_at__gte=timezone.now() - timedelta(days=7)
-        ).count(),
-        'monthly_verifications': CardVerification.objects.filter(
-            verified_at__gte=timezone.now() - timedelta(days=30)
-        ).count(),
-    }
-    
-    # Enhanced statistics with percentages and trends
-    if stats['total_cards'] > 0:
-        stats['active_percentage'] = round((stats['active_cards'] / stats['total_cards']) * 100, 1)
-        stats['pending_percentage'] = round((stats['pending_cards'] / stats['total_cards']) * 100, 1)
-    else:
-        stats['active_percentage'] = 0
-        stats['pending_percentage'] = 0
-    
-    # Get applications that are approved but don't have cards assigned
-    approved_applications_without_cards = []
-    
-    # Check each application type more efficiently
-    for model in [AssociatedApplication, DesignatedApplication, StudentApplication]:
-        try:
-            content_type = ContentType.objects.get_for_model(model)
-            
-            # Get approved applications that don't have cards
-            approved_apps = model.objects.filter(
-                status='approved'
-            ).exclude(
-                id__in=AffiliationCard.objects.filter(
-                    content_type=content_type
-                ).values_list('object_id', flat=True)
-            ).order_by('-approved_at')[:10]  # Limit to most recent 10
-            
-            for app in approved_apps:
-                app_type = model.__name__.replace('Application', '').lower()
-                approved_applications_without_cards.append({
-                    'application': app,
-                    'app_type': app_type,
-                    'content_type_id': content_type.id,
-                    'object_id': app.id,
-                    'days_since_approval': (timezone.now().date() - app.approved_at.date()).days if app.approved_at else 0
-                })
-        except Exception as e:
-            logger.error(f"Error processing {model.__name__}: {e}")
-            continue
-    
-    # Sort by approval date (most urgent first)
-    approved_applications_without_cards.sort(key=lambda x: x['days_since_approval'], reverse=True)
-    
-    # Council breakdown with enhanced metrics
-    council_stats = AffiliationCard.objects.values('council_code', 'council_name').annotate(
-        total=Count('id'),
-        active=Count('id', filter=Q(status='active')),
-        pending=Count('id', filter=Q(status='pending_assignment')),
-        expired=Count('id', filter=Q(status='expired')),
-        recent_verifications=Count(
-            'verifications',
-            filter=Q(verifications__verified_at__gte=timezone.now() - timedelta(days=30))
-        )
-    ).order_by('-total')  # Order by total cards descending
+    # Aggregated statistics from the periodically refreshed snapshot
+    snapshot = get_card_dashboard_snapshot()
+    stats = snapshot['stats']
+    council_stats = snapshot['council_stats']
+    approved_applications_without_cards = snapshot['approved_applications_without_cards']
     
     # Recent cards with enhanced data
     recent_cards = AffiliationCard.objects.select_related(
         'card_template', 'assigned_by'
-    ).prefetch_related(
-        'verifications'
     ).order_by('-created_at')[:10]
     
     # Recent verifications with enhanced data
@@ -671,7 +601,7 @@ def card_dashboard(request):
         ),
         'cards_needing_attention': stats['pending_cards'] + stats['expired_cards'],
         'system_health_score': calculate_system_health_score(stats),
-        'approval_backlog_count': len(approved_applications_without_cards),
+        'approval_backlog_count': snapshot['total_approval_backlog'],
     }
     
     context = {
@@ -682,7 +612,7 @@ def card_dashboard(request):
         'recent_verifications': recent_verifications,
         'expiring_soon': expiring_soon,
         'approved_applications_without_cards': approved_applications_without_cards[:5],  # Show top 5
-        'total_approval_backlog': len(approved_applications_without_cards),
+        'total_approval_backlog': snapshot['total_approval_backlog'],
         'page_title': 'Card Administration Dashboard'
     }
     
@@ -964,10 +894,10 @@ def send_digital_card_email(card, request=None):
         # Attach the PDF card
         email.attach(filename, file_content, content_type_pdf)
         
-        # Send the email
-        email.send()
+        # Queue the email for delivery
+        queue_email(email, category='card_delivery')
         
-        logger.info(f"Digital card email sent to {card.affiliate_email} for card {card.card_number}")
+        logger.info(f"Digital card email queued for {card.affiliate_email} for card {card.card_number}")
         
     except Exception as e:
         logger.error(f"Failed to send digital card email for card {card.card_number}: {str(e)}")
@@ -1150,15 +1080,15 @@ def bulk_operations(request):
             try:
                 with transaction.atomic():
                     if operation == 'assign':
-                        result = bulk_assign_cards(cards, request.user, reason, request=request)
+                        result = bulk_assign_cards(cards, request.user, reason)
                     elif operation == 'issue':
-                        result = bulk_issue_cards(cards, request.user, reason, request=request)
+                        result = bulk_issue_cards(cards, request.user, reason)
                     elif operation == 'suspend':
-                        result = bulk_suspend_cards(cards, request.user, reason, request=request)
+                        result = bulk_suspend_cards(cards, request.user, reason)
                     elif operation == 'send_email':
                         result = bulk_send_emails(cards, request.user, request=request)
                     elif operation == 'regenerate':
-                        result = bulk_regenerate_cards(cards, request.user, request=request)
+                        result = bulk_regenerate_cards(cards, request.user)
                     else:
                         messages.error(request, "Invalid operation")
                         return redirect('affiliationcard:card_list')
@@ -1772,24 +1702,16 @@ def verify_lookup(request):
             purpose = form.cleaned_data.get('verification_purpose', '')
             
             try:
-                # Find the card
-                card = AffiliationCard.objects.get(card_number=card_number)
+                # Find the card (cached snapshot, see verification_cache)
+                card = get_card_for_verification(card_number=card_number)
                 
-                # Record verification
-                verification = CardVerification.objects.create(
-                    card=card,
-                    verification_type='manual_lookup',
-                    verified_at=timezone.now(),
-                    ip_address=get_client_ip(request),
+                # Record verification (written in batches with the card's counter)
+                verification = record_verification(
+                    card, 'manual_lookup', get_client_ip(request),
                     user_agent=request.META.get('HTTP_USER_AGENT', ''),
-                    was_successful=True,
-                    card_status_at_time=card.status,
                     verification_purpose=purpose
                 )
                 
-                # Update card verification count
-                card.increment_verification_count()
-                
                 verification_result = {
                     'success': True,
                     'card': card,
@@ -1832,24 +1754,16 @@ def verify_token(request, token):
         return render(request, 'affiliationcard/public/rate_limited.html', status=429)
     
     try:
-        # Find card by verification token
-        card = AffiliationCard.objects.get(verification_token=token)
+        # Find card by verification token (cached snapshot, see verification_cache)
+        card = get_card_for_verification(verification_token=token)
         
-        # Record verification
-        verification = CardVerification.objects.create(
-            card=card,
-            verification_type='qr_scan',
-            verified_at=timezone.now(),
-            ip_address=get_client_ip(request),
+        # Record verification (written in batches with the card's counter)
+        verification = record_verification(
+            card, 'qr_scan', get_client_ip(request),
             user_agent=request.META.get('HTTP_USER_AGENT', ''),
-            referer=request.META.get('HTTP_REFERER', ''),
-            was_successful=True,
-            card_status_at_time=card.status
+            referer=request.META.get('HTTP_REFERER', '')
         )
         
-        # Update card verification count
-        card.increment_verification_count()
-        
         verification_result = {
             'success': True,
             'card': card,
@@ -1906,27 +1820,16 @@ def api_verify(request):
                 'message': 'Either card_number or verification_token is required'
             }, status=400)
         
-        # Find card
-        if token:
-            card = AffiliationCard.objects.get(verification_token=token)
-        else:
-            card = AffiliationCard.objects.get(card_number=card_number)
+        # Find card (cached snapshot, see verification_cache)
+        card = get_card_for_verification(verification_token=token, card_number=card_number)
         
-        # Record verification
-        verification = CardVerification.objects.create(
-            card=card,
-            verification_type='api_verification',
-            verified_at=timezone.now(),
-            ip_address=get_client_ip(request),
+        # Record verification (written in batches with the card's counter)
+        verification = record_verification(
+            card, 'api_verification', get_client_ip(request),
             user_agent=request.META.get('HTTP_USER_AGENT', ''),
-            was_successful=True,
-            card_status_at_time=card.status,
             verification_purpose=data.get('purpose', '')
         )
         
-        # Update verification count
-        card.increment_verification_count()
-        
         # Return card information
         return JsonResponse({
             'success': True,
@@ -1942,7 +1845,7 @@ def api_verify(request):
                 'date_expires': card.date_expires.isoformat() if card.date_expires else None,
                 'days_until_expiry': card.days_until_expiry()
             },
-            'verification_id': verification.id
+            'verification_id': str(verification.reference)
         })
         
     except AffiliationCard.DoesNotExist:
@@ -2722,17 +2625,19 @@ def generate_report(request):
         form = CardReportForm(request.POST)
         
         if form.is_valid():
-            report_data = create_custom_report(form.cleaned_data)
-            
             output_format = form.cleaned_data['output_format']
             
-            if output_format == 'pdf':
-                return generate_pdf_report(report_data)
-            elif output_format == 'csv':
-                return generate_csv_report(report_data)
-            elif output_format == 'excel':
-                return generate_excel_report(report_data)
+            if output_format in CARD_REPORT_WRITERS:
+                # File reports are built by a background export job
+                parameters = {
+                    key: value.isoformat() if hasattr(value, 'isoformat') else value
+                    for key, value in form.cleaned_data.items()
+                }
+                job = enqueue_export('card_report', request.user, parameters)
+                messages.info(request, "Your report is being generated. You can download it from this page when it is ready.")
+                return redirect(job.get_absolute_url())
             else:
+                report_data = create_custom_report(form.cleaned_data)
                 context = {
                     'report_data': report_data,
                     'form': form,
@@ -2750,6 +2655,36 @@ def generate_report(request):
     return render(request, 'affiliationcard/admin/generate_report.html', context)
 
 
+CARD_REPORT_WRITERS = {
+    'pdf': generate_pdf_report,
+    'csv': generate_csv_report,
+    'excel': generate_excel_report,
+}
+
+
+def run_card_report_job(job):
+    """
+    ExportJob handler for ``card_report``.
+
+    Job parameters are the cleaned CardReportForm data with dates as ISO
+    strings. Empty values are dropped so the report defaults apply.
+    """
+    parameters = {}
+    for key, value in job.parameters.items():
+        if value in (None, ''):
+            continue
+        if key in ('date_from', 'date_to'):
+            value = datetime.fromisoformat(value).date()
+        parameters[key] = value
+
+    report_data = create_custom_report(parameters)
+    if 'error' in report_data:
+        raise RuntimeError(f"Card report failed: {report_data['error']}")
+    job.row_count = report_data.get('total_cards_analyzed', 0)
+    writer = CARD_REPORT_WRITERS.get(parameters.get('output_format'), generate_csv_report)
+    return writer(report_data)
+
+
 # ============================================================================
 # UTILITY FUNCTIONS
 # ============================================================================
@@ -3162,6 +3097,10 @@ def generate_card_image(card, fmt):
     """
     Generate premium affiliation card image matching the professional PDF design.
     Modern navy/blue color scheme with sophisticated layout and typography.
+    
+    Fonts and the static background, header, footer and border layers come
+    from the process-level cache in ``render_assets``; only the per-card
+    text, status badge and QR code are drawn here.
     """
     # Choose resampling constant compatible across Pillow versions
     try:
@@ -3169,190 +3108,39 @@ def generate_card_image(card, fmt):
     except AttributeError:
         RESAMPLE = getattr(Image, "LANCZOS", getattr(Image, "ANTIALIAS", Image.NEAREST))
 
-    # Enhanced layout constants - optimized for modern design
-    W, H = 1400, 880                        # High-resolution canvas
-    CARD_W, CARD_H = 1200, 760              # Card dimensions
-    CARD_X = (W - CARD_W) // 2
-    CARD_Y = (H - CARD_H) // 2
-    RADIUS = 28                             # Rounded corners
-    MARGIN = 50
-
-    # Professional color palette - matching PDF design
-    primary_navy = (15, 23, 42)      # Deep navy for sophistication
-    primary_blue = (30, 64, 175)     # Professional blue
-    accent_blue = (59, 130, 246)     # Bright blue for highlights
-    accent_emerald = (5, 150, 105)   # Emerald for active status
-    accent_gold = (217, 119, 6)      # Gold for premium feel
-    text_primary = (17, 24, 39)      # Almost black for readability
-    text_secondary = (75, 85, 99)    # Medium gray
-    text_muted = (156, 163, 175)     # Light gray
-    text_white = (255, 255, 255)     # Pure white
-    bg_light = (248, 250, 252)       # Premium light background
-    card_bg = (255, 255, 255)        # White card background
-
-    # Enhanced gradient helper
-    def create_gradient(size, colors_list, direction='vertical'):
-        """Create smooth multi-color gradient"""
-        w, h = size
-        if len(colors_list) < 2:
-            return Image.new('RGB', (w, h), colors_list[0])
-            
-        # Create smooth transition between colors
-        gradient = Image.new('RGB', (w, h))
-        pixels = []
-        
-        for y in range(h):
-            for x in range(w):
-                if direction == 'vertical':
-                    ratio = y / (h - 1) if h > 1 else 0
-                else:  # horizontal
-                    ratio = x / (w - 1) if w > 1 else 0
-                
-                # Interpolate between first and last color
-                c1, c2 = colors_list[0], colors_list[-1]
-                r = int(c1[0] + (c2[0] - c1[0]) * ratio)
-                g = int(c1[1] + (c2[1] - c1[1]) * ratio)
-                b = int(c1[2] + (c2[2] - c1[2]) * ratio)
-                pixels.append((r, g, b))
-        
-        gradient.putdata(pixels)
-        return gradient
-
-    # Canvas with premium background
-    canvas = Image.new('RGB', (W, H), bg_light)
-    
-    # Enhanced shadow with multiple layers for depth
-    shadow_layers = [
-        (CARD_W + 16, CARD_H + 16, 8, (0, 0, 0, 60)),   # Close shadow
-        (CARD_W + 32, CARD_H + 32, 16, (0, 0, 0, 30)),  # Medium shadow
-        (CARD_W + 48, CARD_H + 48, 24, (0, 0, 0, 15)),  # Far shadow
-    ]
-    
-    for shadow_w, shadow_h, blur, color in shadow_layers:
-        shadow = Image.new('RGBA', (shadow_w, shadow_h), color)
-        shadow_mask = Image.new('L', (shadow_w, shadow_h), 0)
-        sd = ImageDraw.Draw(shadow_mask)
-        sd.rounded_rectangle([0, 0, shadow_w, shadow_h], radius=RADIUS + 8, fill=255)
-        shadow.putalpha(shadow_mask)
-        shadow = shadow.filter(ImageFilter.GaussianBlur(blur))
-        
-        offset_x = CARD_X - (shadow_w - CARD_W) // 2
-        offset_y = CARD_Y - (shadow_h - CARD_H) // 2 + 6
-        canvas.paste(shadow, (offset_x, offset_y), shadow)
-
-    # Create sophisticated card background
-    card_img = Image.new('RGBA', (CARD_W, CARD_H), card_bg)
-    
-    # Header section with navy background
-    header_h = 200
-    header_bg = Image.new('RGB', (CARD_W, header_h), primary_navy)
-    
-    # Create diagonal accent stripe
-    stripe_img = Image.new('RGBA', (CARD_W, header_h), (0, 0, 0, 0))
-    stripe_draw = ImageDraw.Draw(stripe_img)
-    
-    # Diagonal stripe coordinates - matching PDF design
-    stripe_points = [
-        (0, header_h - 60),
-        (int(CARD_W * 0.4), header_h - 60),
-        (int(CARD_W * 0.45), header_h),
-        (0, header_h)
-    ]
-    stripe_draw.polygon(stripe_points, fill=accent_blue)
-    
-    # Combine header elements
-    header_bg.paste(stripe_img, (0, 0), stripe_img)
-    card_img.paste(header_bg, (0, 0))
-
-    # Card mask with rounded corners
-    mask = Image.new('L', (CARD_W, CARD_H), 0)
-    mdraw = ImageDraw.Draw(mask)
-    mdraw.rounded_rectangle([0, 0, CARD_W, CARD_H], radius=RADIUS, fill=255)
+    CARD_W, CARD_H = render_assets.CARD_SIZE
+    CARD_X, CARD_Y = render_assets.card_origin()
+    MARGIN = render_assets.MARGIN
+    header_h = render_assets.HEADER_HEIGHT
 
-    # Apply card to canvas
-    canvas.paste(card_img.convert('RGB'), (CARD_X, CARD_Y), mask)
+    canvas = render_assets.get_card_base_layer().copy()
     draw = ImageDraw.Draw(canvas)
-
-    # Enhanced font loading
-    def load_font(name=None, size=36):
-        font_paths = [
-            '/System/Library/Fonts/Helvetica.ttc',
-            '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
-            '/Windows/Fonts/arial.ttf',
-            'arial.ttf'
-        ]
-        
-        for path in font_paths:
-            try:
-                return ImageFont.truetype(path, size)
-            except:
-                continue
-        return ImageFont.load_default()
-
-    # Font sizes optimized for the design
-    font_logo = load_font(size=42)           # ACRP logo
-    font_org = load_font(size=16)            # Organization name
-    font_badge = load_font(size=12)          # Badge text
-    font_name = load_font(size=38)           # Affiliate name
-    font_title = load_font(size=24)          # Affiliation type
-    font_meta = load_font(size=18)           # Metadata
-    font_small = load_font(size=14)          # Small text
-    font_tiny = load_font(size=12)           # Footer text
+    fonts = render_assets.get_fonts()
 
     # ============================================================================
-    # HEADER SECTION - Matching PDF layout
+    # HEADER SECTION - Card number and status
     # ============================================================================
     header_y_start = CARD_Y + 30
     
-    # ACRP Logo - positioned like PDF
-    draw.text((CARD_X + MARGIN, header_y_start), "ACRP", font=font_logo, fill=text_white)
-    
-    # Organization name - smaller, positioned below
-    org_y = header_y_start + 50
-    draw.text((CARD_X + MARGIN, org_y), "ASSOCIATION OF CHRISTIAN", font=font_org, fill=text_white)
-    draw.text((CARD_X + MARGIN, org_y + 20), "RELIGIOUS PRACTITIONERS", font=font_org, fill=text_white)
-    
-    # Digital card badge - matching PDF style
-    badge_x = CARD_X + MARGIN
-    badge_y = header_y_start + 100
-    badge_width = 240
-    badge_height = 28
-    
-    draw.rounded_rectangle([
-        badge_x, badge_y,
-        badge_x + badge_width, badge_y + badge_height
-    ], radius=8, fill=accent_emerald)
-    
-    draw.text((badge_x + 8, badge_y + 6), "DIGITAL AFFILIATION CARD", 
-              font=font_badge, fill=text_white)
-    
     # Card number - top right
     card_num = f"#{card.card_number}"
-    try:
-        bbox = draw.textbbox((0, 0), card_num, font=font_meta)
-        card_num_width = bbox[2] - bbox[0]
-    except AttributeError:
-        card_num_width = len(card_num) * 12
+    card_num_width = render_assets.text_width(draw, card_num, fonts['meta'], 12)
     
     draw.text((CARD_X + CARD_W - MARGIN - card_num_width, header_y_start + 5), 
-              card_num, font=font_meta, fill=text_white)
+              card_num, font=fonts['meta'], fill=render_assets.TEXT_WHITE)
     
     # Status badge - positioned below card number
     status = card.get_status_display().upper()
     
     # Status color logic - matching PDF
-    if hasattr(card, 'status') and card.status == 'active':
-        status_color = accent_emerald
-    elif hasattr(card, 'status') and card.status == 'pending':
-        status_color = accent_gold
+    if card.status == 'active':
+        status_color = render_assets.ACCENT_EMERALD
+    elif card.status == 'pending':
+        status_color = render_assets.ACCENT_GOLD
     else:
-        status_color = (239, 68, 68)  # Red for inactive
+        status_color = render_assets.ALERT_RED
     
-    try:
-        status_bbox = draw.textbbox((0, 0), status, font=font_small)
-        status_width = status_bbox[2] - status_bbox[0]
-    except AttributeError:
-        status_width = len(status) * 8
+    status_width = render_assets.text_width(draw, status, fonts['small'], 8)
     
     # Status badge positioning
     status_badge_x = CARD_X + CARD_W - MARGIN - status_width - 20
@@ -3364,66 +3152,65 @@ def generate_card_image(card, fmt):
     ], radius=6, fill=status_color)
     
     draw.text((status_badge_x + 10, status_badge_y + 4), status, 
-              font=font_small, fill=text_white)
+              font=fonts['small'], fill=render_assets.TEXT_WHITE)
 
     # ============================================================================
     # MAIN CONTENT AREA - Left side text, right side QR
     # ============================================================================
     content_y = CARD_Y + header_h + 40
     content_x = CARD_X + MARGIN
-    content_max_width = CARD_W - (MARGIN * 2) - 200  # Leave space for QR code
     
     # Affiliate name - prominent display
-    name = card.get_display_name() if hasattr(card, 'get_display_name') else str(getattr(card, 'affiliate_full_name', ''))
+    name = card.get_display_name()
     
     # Smart name truncation
     if len(name) > 25:
         name = name[:22] + "..."
     
-    draw.text((content_x, content_y), name, font=font_name, fill=text_primary)
+    draw.text((content_x, content_y), name, font=fonts['name'], fill=render_assets.TEXT_PRIMARY)
     content_y += 55
     
     # Affiliation type with accent color
-    affiliation = getattr(card, 'affiliation_type', 'Member').title()
-    draw.text((content_x, content_y), affiliation, font=font_title, fill=accent_blue)
+    affiliation = (card.affiliation_type or 'Member').title()
+    draw.text((content_x, content_y), affiliation, font=fonts['title'], fill=render_assets.ACCENT_BLUE)
     content_y += 35
     
     # Council information
-    council = getattr(card, 'council_name', '')
+    council = card.council_name
     if council:
         # Truncate if too long
         if len(council) > 35:
             council = council[:32] + "..."
-        draw.text((content_x, content_y), council, font=font_meta, fill=text_secondary)
+        draw.text((content_x, content_y), council, font=fonts['meta'], fill=render_assets.TEXT_SECONDARY)
         content_y += 28
     
     # Date information
-    if hasattr(card, 'date_issued') and card.date_issued:
+    if card.date_issued:
         issued_text = f"Issued: {card.date_issued.strftime('%B %d, %Y')}"
-        draw.text((content_x, content_y), issued_text, font=font_small, fill=text_muted)
+        draw.text((content_x, content_y), issued_text, font=fonts['small'], fill=render_assets.TEXT_MUTED)
         content_y += 22
     
     # Expiration with color coding
-    if hasattr(card, 'date_expires') and card.date_expires:
-        from datetime import datetime, date
+    if card.date_expires:
+        from datetime import date
         today = date.today()
         
         if card.date_expires < today:
-            expire_color = (239, 68, 68)  # Red for expired
+            expire_color = render_assets.ALERT_RED
         elif (card.date_expires - today).days < 90:
-            expire_color = accent_gold  # Gold for expiring soon
+            expire_color = render_assets.ACCENT_GOLD
         else:
-            expire_color = text_muted  # Normal color
+            expire_color = render_assets.TEXT_MUTED
         
         expires_text = f"Valid Until: {card.date_expires.strftime('%B %Y')}"
-        draw.text((content_x, content_y), expires_text, font=font_small, fill=expire_color)
+        draw.text((content_x, content_y), expires_text, font=fonts['small'], fill=expire_color)
 
     # ============================================================================
     # QR CODE SECTION - Right side, matching PDF design
     # ============================================================================
     
     # Generate functional verification URL - CORRECTED URL FORMAT
-    verification_token = getattr(card, 'verification_token', None)
+    verification_token = card.verification_token
     if not verification_token:
         import uuid
         verification_token = str(uuid.uuid4()).replace('-', '')[:32]
@@ -3465,7 +3252,7 @@ def generate_card_image(card, fmt):
     draw.rounded_rectangle([
         qr_x - qr_padding, qr_y - qr_padding,
         qr_x + qr_size + qr_padding, qr_y + qr_size + qr_padding
-    ], radius=12, fill=card_bg, outline=text_muted, width=1)
+    ], radius=12, fill=render_assets.CARD_BG, outline=render_assets.TEXT_MUTED, width=1)
     
     # Paste QR code
     canvas.paste(qr_img, (qr_x, qr_y), qr_img)
@@ -3474,77 +3261,28 @@ def generate_card_image(card, fmt):
     qr_label_y = qr_y + qr_size + 15
     
     main_label = "SCAN TO VERIFY"
-    try:
-        label_bbox = draw.textbbox((0, 0), main_label, font=font_small)
-        label_width = label_bbox[2] - label_bbox[0]
-    except AttributeError:
-        label_width = len(main_label) * 8
-    
+    label_width = render_assets.text_width(draw, main_label, fonts['small'], 8)
     label_x = qr_x + (qr_size - label_width) // 2
-    draw.text((label_x, qr_label_y), main_label, font=font_small, fill=text_primary)
+    draw.text((label_x, qr_label_y), main_label, font=fonts['small'], fill=render_assets.TEXT_PRIMARY)
     
     # Secondary label
     sub_label = "or visit ams.acrp.org.za"
-    try:
-        sub_bbox = draw.textbbox((0, 0), sub_label, font=font_tiny)
-        sub_width = sub_bbox[2] - sub_bbox[0]
-    except AttributeError:
-        sub_width = len(sub_label) * 6
-    
+    sub_width = render_assets.text_width(draw, sub_label, fonts['tiny'], 6)
     sub_x = qr_x + (qr_size - sub_width) // 2
-    draw.text((sub_x, qr_label_y + 20), sub_label, font=font_tiny, fill=text_muted)
-
-    # ============================================================================
-    # FOOTER SECTION - Clean and professional
-    # ============================================================================
-    footer_y = CARD_Y + CARD_H - 60
-    
-    # Footer background
-    footer_bg = Image.new('RGBA', (CARD_W, 50), (247, 248, 249, 255))
-    canvas.paste(footer_bg, (CARD_X, footer_y), footer_bg)
-    
-    # Footer separator line
-    draw.line([(CARD_X + 30, footer_y), (CARD_X + CARD_W - 30, footer_y)], 
-              fill=text_muted, width=1)
-    
-    # Organization info (left side)
-    draw.text((CARD_X + MARGIN, footer_y + 12), "ACRP South Africa", 
-              font=font_small, fill=text_secondary)
-    draw.text((CARD_X + MARGIN, footer_y + 28), "Professional Religious Practitioners", 
-              font=font_tiny, fill=text_muted)
-    
-    # Verification info (right side)
-    verify_text = "verify: kreeck.com/card/verify"
-    try:
-        verify_bbox = draw.textbbox((0, 0), verify_text, font=font_tiny)
-        verify_width = verify_bbox[2] - verify_bbox[0]
-    except AttributeError:
-        verify_width = len(verify_text) * 6
-    
-    draw.text((CARD_X + CARD_W - MARGIN - verify_width, footer_y + 28), 
-              verify_text, font=font_tiny, fill=text_muted)
-
-    # ============================================================================
-    # FINAL TOUCHES - Borders and finishing
-    # ============================================================================
-    
-    # Outer border
-    draw.rounded_rectangle([CARD_X + 1, CARD_Y + 1, CARD_X + CARD_W - 1, CARD_Y + CARD_H - 1], 
-                          radius=RADIUS, outline=text_muted, width=2)
-    
-    # Inner accent border
-    draw.rounded_rectangle([CARD_X + 3, CARD_Y + 3, CARD_X + CARD_W - 3, CARD_Y + CARD_H - 3], 
-                          radius=RADIUS - 2, outline=accent_blue + (100,), width=1)
+    draw.text((sub_x, qr_label_y + 20), sub_label, font=fonts['tiny'], fill=render_assets.TEXT_MUTED)
 
     # Final image preparation
     out_img = canvas
     if fmt.upper() == 'JPEG' and out_img.mode != 'RGB':
         out_img = out_img.convert('RGB')
 
-    # Save with high quality
+    # Save with high quality. PNG uses zlib level 6 rather than optimize=True,
+    # which triples encode time for a ~3% smaller file.
     buffer = BytesIO()
-    quality = 95 if fmt.upper() == 'JPEG' else None
-    out_img.save(buffer, format=fmt, quality=quality, optimize=True)
+    if fmt.upper() == 'JPEG':
+        out_img.save(buffer, format=fmt, quality=95, optimize=True)
+    else:
+        out_img.save(buffer, format=fmt, compress_level=6)
     buffer.seek(0)
     data = buffer.getvalue()
     buffer.close()
@@ -3560,14 +3298,19 @@ def generate_card_image(card, fmt):
 
 
 def generate_card_file(card, file_format):
-    """Generate card file in specified format with enhanced styling."""
+    """
+    Generate card file in specified format with enhanced styling.
+    
+    Renderings are cached in storage keyed by the card's rendered content
+    (see ``card_cache``), so unchanged cards are not redrawn.
+    """
     fmt = file_format.lower()
     if fmt == 'pdf':
-        return generate_card_pdf(card)
+        return get_card_artifact(card, fmt, lambda: generate_card_pdf(card))
     elif fmt == 'png':
-        return generate_card_image(card, 'PNG')
+        return get_card_artifact(card, fmt, lambda: generate_card_image(card, 'PNG'))
     elif fmt in ('jpg', 'jpeg'):
-        return generate_card_image(card, 'JPEG')
+        return get_card_artifact(card, fmt, lambda: generate_card_image(card, 'JPEG'))
     else:
         raise ValueError(f"Unsupported file format: {file_format}")
     
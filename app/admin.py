@@ -39,6 +39,18 @@ from .models import (
     # Notification System
     Notification,
     
+    # Number Sequences
+    NumberSequence,
+    
+    # Email Outbox
+    EmailOutbox,
+    
+    # System Statistics
+    SystemStat,
+    
+    # Rate Limiting
+    RateLimitCounter,
+    
     # Resource and Training System
     Resource,
     ResourceRating,
@@ -90,6 +102,18 @@ admin.site.register(ActivityLog)
 # Notification System
 admin.site.register(Notification)
 
+# Number Sequences
+admin.site.register(NumberSequence)
+
+# Email Outbox
+admin.site.register(EmailOutbox)
+
+# System Statistics
+admin.site.register(SystemStat)
+
+# Rate Limiting
+admin.site.register(RateLimitCounter)
+
 # Resource and Training System
 admin.site.register(Resource)
 admin.site.register(ResourceRating)
@@ -0,0 +1,129 @@
+"""
+Cache backend that fails over from Redis to the database cache.
+
+``FallbackCache`` is configured as ``CACHES['default']`` when REDIS_URL is
+set. It forwards every call to the PRIMARY cache alias (Redis). If Redis
+cannot be reached the call is retried on the FALLBACK alias (the database
+cache), and the primary is skipped for RETRY_SECONDS before it is tried
+again, so an outage costs one failed connection attempt per worker per
+RETRY_SECONDS rather than one per request.
+
+    CACHES = {
+        'default': {
+            'BACKEND': 'app.cache_backends.FallbackCache',
+            'OPTIONS': {'PRIMARY': 'redis', 'FALLBACK': 'database', 'RETRY_SECONDS': 30},
+        },
+        'redis': {...},
+        'database': {...},
+    }
+
+Writes and deletes made while Redis is down only reach the fallback, so
+entries Redis already held may be served stale after it recovers until
+they expire. Keep timeouts short for data that is invalidated explicitly.
+"""
+import logging
+import threading
+import time
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+logger = logging.getLogger(__name__)
+
+try:
+    from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+    UNAVAILABLE_ERRORS = (RedisConnectionError, RedisTimeoutError, ConnectionError, TimeoutError)
+except ImportError:  # redis is optional
+    UNAVAILABLE_ERRORS = (ConnectionError, TimeoutError)
+
+try:
+    from django_redis.exceptions import ConnectionInterrupted
+    UNAVAILABLE_ERRORS += (ConnectionInterrupted,)
+except ImportError:  # django-redis is optional
+    pass
+
+
+class FallbackCache(BaseCache):
+    """Forward to a primary cache, failing over to a secondary one."""
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._primary_alias = options.get('PRIMARY', 'redis')
+        self._fallback_alias = options.get('FALLBACK', 'database')
+        self._retry_seconds = options.get('RETRY_SECONDS', 30)
+        self._lock = threading.Lock()
+        self._primary_down_until = 0
+
+    # ------------------------------------------------------------------
+    # Backend selection
+    # ------------------------------------------------------------------
+
+    def run(self, func):
+        """
+        Call ``func(cache)`` with the primary cache, failing over to the
+        fallback exactly like the cache API methods. For callers that need
+        the concrete backend (e.g. Redis pipelines for rate limit counters).
+        """
+        if time.monotonic() >= self._primary_down_until:
+            try:
+                return func(caches[self._primary_alias])
+            except UNAVAILABLE_ERRORS as e:
+                with self._lock:
+                    if time.monotonic() >= self._primary_down_until:
+                        logger.error(
+                            f"Cache '{self._primary_alias}' unavailable, using "
+                            f"'{self._fallback_alias}' for {self._retry_seconds}s: {e}"
+                        )
+                    self._primary_down_until = time.monotonic() + self._retry_seconds
+        return func(caches[self._fallback_alias])
+
+    def _call(self, method, *args, **kwargs):
+        return self.run(lambda cache: getattr(cache, method)(*args, **kwargs))
+
+    # ------------------------------------------------------------------
+    # Cache API
+    # ------------------------------------------------------------------
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._call('add', key, value, timeout, version=version)
+
+    def get(self, key, default=None, version=None):
+        return self._call('get', key, default, version=version)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._call('set', key, value, timeout, version=version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._call('touch', key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        return self._call('delete', key, version=version)
+
+    def get_many(self, keys, version=None):
+        return self._call('get_many', keys, version=version)
+
+    def get_or_set(self, key, default, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._call('get_or_set', key, default, timeout, version=version)
+
+    def has_key(self, key, version=None):
+        return self._call('has_key', key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        return self._call('incr', key, delta, version=version)
+
+    def decr(self, key, delta=1, version=None):
+        return self._call('decr', key, delta, version=version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._call('set_many', data, timeout, version=version)
+
+    def delete_many(self, keys, version=None):
+        return self._call('delete_many', keys, version=version)
+
+    def clear(self):
+        return self._call('clear')
+
+    def close(self, **kwargs):
+        # The primary and fallback aliases are closed by Django themselves
+        pass
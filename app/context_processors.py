@@ -1,17 +1,23 @@
-from .notification_utils import get_unread_count, get_recent_notifications
+from django.utils.functional import SimpleLazyObject
+
+from .notification_utils import get_notification_summary
 
 
 def notifications(request):
     """
     Add notification data to template context.
     Available in all templates as: {{ unread_notifications_count }} and {{ recent_notifications }}
+
+    Both values are callables over one lazily loaded summary, so the cached
+    notification summary is only fetched when a template actually uses them.
     """
-    if request.user.is_authenticated:
-        return {
-            'unread_notifications_count': get_unread_count(request.user),
-            'recent_notifications': get_recent_notifications(request.user, limit=5),
-        }
+    def load_summary():
+        if request.user.is_authenticated:
+            return get_notification_summary(request.user)
+        return {'unread': 0, 'recent': []}
+
+    summary = SimpleLazyObject(load_summary)
     return {
-        'unread_notifications_count': 0,
-        'recent_notifications': [],
-    }
\ No newline at end of file
+        'unread_notifications_count': lambda: summary['unread'],
+        'recent_notifications': lambda: summary['recent'][:5],
+    }
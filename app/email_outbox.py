@@ -0,0 +1,330 @@
+"""
+Durable email outbox.
+
+Emails used to be sent inside the request with one ``EmailMessage.send()``
+per recipient, each opening its own provider connection, so page latency
+depended on Mailjet's response time. Callers now build the same
+``EmailMessage`` / ``EmailMultiAlternatives`` as before and hand it to
+``queue_email`` (or ``queue_emails`` for many at once), which stores it as
+an ``EmailOutbox`` row.
+
+A delivery worker claims pending rows in batches, sends each batch over one
+reused connection and records the outcome per message. Failed messages are
+retried with exponential backoff (RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+until MAX_ATTEMPTS is reached.
+
+Dispatch backends (``settings.EMAIL_OUTBOX['BACKEND']``):
+    thread  - in-process delivery thread, woken when messages are queued (default)
+    celery  - ``deliver_outbox_task`` on the configured Celery broker
+    command - left pending for ``python manage.py deliver_outbox`` (cron / --loop)
+
+Retries become due later, so run ``deliver_outbox`` from cron (or with
+``--loop``) with every backend.
+"""
+import base64
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+try:
+    from celery import shared_task
+except ImportError:  # Celery is optional
+    shared_task = None
+
+
+DEFAULT_EMAIL_OUTBOX_SETTINGS = {
+    'BACKEND': 'thread',
+    'BATCH_SIZE': 50,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_BASE_SECONDS': 60,
+    'STALE_AFTER_MINUTES': 15,
+    'RETENTION_DAYS': 30,
+}
+
+_executor = None
+_wakeup_lock = threading.Lock()
+_wakeup_scheduled = False
+
+
+def get_email_outbox_setting(name):
+    """Read an EMAIL_OUTBOX setting, falling back to the defaults above."""
+    return getattr(settings, 'EMAIL_OUTBOX', {}).get(name, DEFAULT_EMAIL_OUTBOX_SETTINGS[name])
+
+
+# ============================================================================
+# QUEUEING
+# ============================================================================
+
+def queue_email(message, category=''):
+    """
+    Queue one email for delivery.
+
+    Args:
+        message: EmailMessage or EmailMultiAlternatives (not sent)
+        category: Short label for reporting, e.g. 'welcome' or 'card_delivery'
+
+    Returns:
+        EmailOutbox instance
+    """
+    return queue_emails([message], category=category)[0]
+
+
+def queue_emails(messages, category=''):
+    """
+    Queue many emails with one INSERT and a single worker wake-up.
+
+    Delivery starts once the surrounding transaction commits.
+
+    Returns:
+        list of EmailOutbox instances
+    """
+    rows = [EmailOutbox(category=category, **serialize_message(message)) for message in messages]
+    if not rows:
+        return []
+    rows = EmailOutbox.objects.bulk_create(rows, batch_size=500)
+    transaction.on_commit(dispatch_delivery)
+    logger.info(f"Queued {len(rows)} {category or 'general'} emails for delivery")
+    return rows
+
+
+def serialize_message(message):
+    """Convert an EmailMessage into EmailOutbox field values."""
+    attachments = []
+    for attachment in message.attachments:
+        if not isinstance(attachment, tuple):
+            raise ValueError("MIME attachments cannot be queued; attach (filename, content, mimetype)")
+        filename, content, mimetype = attachment
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        attachments.append({
+            'filename': filename,
+            'content': base64.b64encode(content).decode('ascii'),
+            'mimetype': mimetype,
+        })
+
+    return {
+        'subject': message.subject,
+        'from_email': message.from_email or settings.DEFAULT_FROM_EMAIL,
+        'to': list(message.to),
+        'cc': list(message.cc),
+        'bcc': list(message.bcc),
+        'reply_to': list(message.reply_to),
+        'headers': dict(message.extra_headers),
+        'body': message.body,
+        'content_subtype': message.content_subtype,
+        'alternatives': [[content, mimetype] for content, mimetype in getattr(message, 'alternatives', [])],
+        'attachments': attachments,
+    }
+
+
+def build_message(outbox, connection=None):
+    """Rebuild the EmailMultiAlternatives stored in an EmailOutbox row."""
+    message = EmailMultiAlternatives(
+        subject=outbox.subject,
+        body=outbox.body,
+        from_email=outbox.from_email,
+        to=outbox.to,
+        cc=outbox.cc,
+        bcc=outbox.bcc,
+        reply_to=outbox.reply_to,
+        headers=outbox.headers,
+        connection=connection,
+    )
+    message.content_subtype = outbox.content_subtype
+    for content, mimetype in outbox.alternatives:
+        message.attach_alternative(content, mimetype)
+    for attachment in outbox.attachments:
+        message.attach(attachment['filename'], base64.b64decode(attachment['content']), attachment['mimetype'])
+    return message
+
+
+# ============================================================================
+# DISPATCH
+# ============================================================================
+
+def dispatch_delivery():
+    """Wake the configured delivery worker."""
+    backend = get_email_outbox_setting('BACKEND')
+
+    if backend == 'command':
+        return
+
+    if backend == 'celery' and shared_task is not None:
+        try:
+            deliver_outbox_task.delay()
+            return
+        except Exception as e:
+            logger.warning(f"Celery unavailable for email delivery, using thread: {e}")
+
+    global _wakeup_scheduled, _executor
+    with _wakeup_lock:
+        # One drain already waiting to start will pick up these messages too
+        if _wakeup_scheduled:
+            return
+        _wakeup_scheduled = True
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='email-outbox')
+    _executor.submit(_deliver_in_thread)
+
+
+def _deliver_in_thread():
+    """Thread entry point; drains everything that is due."""
+    global _wakeup_scheduled
+    with _wakeup_lock:
+        _wakeup_scheduled = False
+    close_old_connections()
+    try:
+        deliver_all_pending()
+    except Exception as e:
+        logger.error(f"Email outbox delivery thread failed: {e}")
+    finally:
+        close_old_connections()
+
+
+if shared_task is not None:
+    @shared_task(name='app.deliver_outbox')
+    def deliver_outbox_task():
+        deliver_all_pending()
+
+
+# ============================================================================
+# DELIVERY
+# ============================================================================
+
+def deliver_all_pending():
+    """Deliver batches until nothing is due. Returns the number of messages sent."""
+    sent = 0
+    while True:
+        batch_sent, claimed = deliver_pending()
+        sent += batch_sent
+        if not claimed:
+            return sent
+
+
+def deliver_pending(batch_size=None):
+    """
+    Claim one batch of due messages and send it over a single connection.
+
+    The claim is a conditional UPDATE tagged with a claim token, so
+    concurrent workers never send the same message twice.
+
+    Returns:
+        tuple: (sent, claimed)
+    """
+    batch = _claim_batch(batch_size or get_email_outbox_setting('BATCH_SIZE'))
+    if not batch:
+        return 0, 0
+
+    sent = 0
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        logger.error(f"Could not open email connection for {len(batch)} messages: {e}")
+        for outbox in batch:
+            _record_failure(outbox, e)
+        return 0, len(batch)
+
+    try:
+        for outbox in batch:
+            try:
+                message = build_message(outbox, connection)
+                if not connection.send_messages([message]):
+                    raise RuntimeError("Message was not accepted by the email backend")
+            except Exception as e:
+                _record_failure(outbox, e)
+            else:
+                _record_success(outbox, message)
+                sent += 1
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    logger.info(f"Email outbox: sent {sent} of {len(batch)} claimed messages")
+    return sent, len(batch)
+
+
+def _claim_batch(batch_size):
+    now = timezone.now()
+    due = list(
+        EmailOutbox.objects.filter(status=EmailOutbox.Status.PENDING, next_attempt_at__lte=now)
+        .order_by('next_attempt_at')
+        .values_list('pk', flat=True)[:batch_size]
+    )
+    if not due:
+        return []
+
+    claim_token = uuid.uuid4()
+    EmailOutbox.objects.filter(pk__in=due, status=EmailOutbox.Status.PENDING).update(
+        status=EmailOutbox.Status.SENDING,
+        claim_token=claim_token,
+        claimed_at=now,
+    )
+    return list(EmailOutbox.objects.filter(claim_token=claim_token).order_by('next_attempt_at'))
+
+
+def _record_success(outbox, message):
+    anymail_status = getattr(message, 'anymail_status', None)
+    EmailOutbox.objects.filter(pk=outbox.pk).update(
+        status=EmailOutbox.Status.SENT,
+        attempts=outbox.attempts + 1,
+        sent_at=timezone.now(),
+        provider_message_id=getattr(anymail_status, 'message_id', None) or '',
+        last_error='',
+    )
+
+
+def _record_failure(outbox, error):
+    attempts = outbox.attempts + 1
+    if attempts >= get_email_outbox_setting('MAX_ATTEMPTS'):
+        status = EmailOutbox.Status.FAILED
+        logger.error(f"Giving up on email {outbox.pk} to {outbox.to} after {attempts} attempts: {error}")
+    else:
+        status = EmailOutbox.Status.PENDING
+        logger.warning(f"Email {outbox.pk} to {outbox.to} failed (attempt {attempts}), will retry: {error}")
+
+    delay = get_email_outbox_setting('RETRY_BASE_SECONDS') * 2 ** (attempts - 1)
+    EmailOutbox.objects.filter(pk=outbox.pk).update(
+        status=status,
+        attempts=attempts,
+        next_attempt_at=timezone.now() + timedelta(seconds=delay),
+        last_error=str(error)[:2000],
+    )
+
+
+# ============================================================================
+# MAINTENANCE
+# ============================================================================
+
+def requeue_stale_messages():
+    """
+    Return messages orphaned by a dead worker to the pending queue.
+
+    Anything left sending past STALE_AFTER_MINUTES is assumed lost. The
+    provider may already have accepted it, so this can produce a duplicate.
+    """
+    cutoff = timezone.now() - timedelta(minutes=get_email_outbox_setting('STALE_AFTER_MINUTES'))
+    return EmailOutbox.objects.filter(
+        status=EmailOutbox.Status.SENDING,
+        claimed_at__lt=cutoff,
+    ).update(status=EmailOutbox.Status.PENDING, claim_token=None)
+
+
+def purge_sent_messages():
+    """Delete sent messages older than RETENTION_DAYS."""
+    cutoff = timezone.now() - timedelta(days=get_email_outbox_setting('RETENTION_DAYS'))
+    deleted, _ = EmailOutbox.objects.filter(status=EmailOutbox.Status.SENT, sent_at__lt=cutoff).delete()
+    return deleted
@@ -0,0 +1,466 @@
+"""
+Error log ingestion.
+
+``ErrorLog.log_error`` used to capture and sanitize the whole request
+context, format the traceback and INSERT one row on the request that was
+already failing, so a flood of 500s added one write (and all of that work)
+per failing request exactly when the database was under stress.
+
+``record_error`` does only in-memory work on the request:
+
+1. The error is fingerprinted by exception type, URL path (numeric ids,
+   UUIDs and long tokens replaced by ``*``) and the innermost application
+   frame (module and function, not line number, so unrelated edits do not
+   split a pattern). The fingerprint is the ``ErrorPattern.pattern_id``.
+   404s are grouped by URL route instead of path, and every URL that
+   matches no route shares one pattern, so scanners probing random paths
+   cannot create a pattern per URL.
+2. Every occurrence is added to an in-process per-pattern counter.
+3. Occurrences are sampled per pattern and SAMPLE_WINDOW_SECONDS window:
+   the first SAMPLE_FIRST are kept in full, then one in every
+   1 / SAMPLE_RATE. A kept row's ``occurrence_count`` includes the
+   occurrences dropped since the previous kept row of its pattern. Kept
+   rows hold a raw request snapshot and an unformatted traceback summary.
+
+A background writer flushes the buffer every FLUSH_SECONDS: one upsert per
+pattern for the occurrence counters, one insert for affected users, and
+one ``bulk_create`` of ErrorLog rows. Sanitizing the context and formatting
+the traceback happen there, off the request. At most MAX_BUFFERED_ROWS
+rows are buffered; beyond that occurrences are only counted. If the
+database is unreachable, the unwritten counters and rows are put back in
+the buffer and written by the next flush.
+
+Backends (``settings.ERROR_LOGGING['BACKEND']``):
+    thread  - background writer thread in each process (default)
+    inline  - written on the request, e.g. for management commands
+"""
+import atexit
+import hashlib
+import ipaddress
+import logging
+import os
+import re
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import OperationalError, close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ErrorLog, ErrorPattern
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_ERROR_LOGGING_SETTINGS = {
+    'BACKEND': 'thread',
+    'FLUSH_SECONDS': 2,
+    'MAX_BUFFERED_ROWS': 1000,
+    'SAMPLE_FIRST': 10,
+    'SAMPLE_RATE': 0.01,
+    'SAMPLE_WINDOW_SECONDS': 300,
+}
+
+SEVERITY_BY_CODE = {
+    '400': 'warning',
+    '401': 'warning',
+    '403': 'warning',
+    '404': 'info',
+    '500': 'critical',
+    '503': 'critical',
+}
+
+# Path segments grouped as '*': numeric ids, UUIDs / hex digests, long tokens
+VARIABLE_SEGMENT = re.compile(r'^(\d+|[0-9a-fA-F-]{16,}|[A-Za-z0-9_-]{32,})$')
+
+LIBRARY_PATH_MARKERS = ('site-packages', 'dist-packages')
+
+# Pattern path of 404s for URLs that match no route
+UNMATCHED_PATH = '(unmatched URL)'
+
+_executor = None
+_lock = threading.Lock()
+_pending_patterns = {}
+_pending_rows = []
+_flush_scheduled = False
+_sample_windows = {}
+
+
+def get_error_logging_setting(name):
+    """Read an ERROR_LOGGING setting, falling back to the defaults above."""
+    return getattr(settings, 'ERROR_LOGGING', {}).get(name, DEFAULT_ERROR_LOGGING_SETTINGS[name])
+
+
+# ============================================================================
+# FINGERPRINTS
+# ============================================================================
+
+def path_pattern(path):
+    """URL path with variable segments replaced by '*'."""
+    return '/'.join(
+        '*' if VARIABLE_SEGMENT.match(segment) else segment
+        for segment in path.split('/')
+    )[:500]
+
+
+def pattern_source_path(request, error_code):
+    """
+    Path an error is grouped by: the request path, or for 404s the matched
+    URL route (UNMATCHED_PATH when nothing matched).
+    """
+    if error_code != '404':
+        return request.path
+    match = getattr(request, 'resolver_match', None)
+    if match is None or not match.route:
+        return UNMATCHED_PATH
+    return '/' + match.route
+
+
+def culprit_frame(exception):
+    """``module:function`` of the innermost application frame, if any."""
+    innermost = None
+    culprit = None
+    for frame, _ in traceback.walk_tb(exception.__traceback__):
+        innermost = frame
+        if not any(marker in frame.f_code.co_filename for marker in LIBRARY_PATH_MARKERS):
+            culprit = frame
+    frame = culprit or innermost
+    if frame is None:
+        return ''
+    filename = frame.f_code.co_filename
+    base_dir = str(getattr(settings, 'BASE_DIR', ''))
+    if base_dir and filename.startswith(base_dir):
+        filename = os.path.relpath(filename, base_dir)
+    return f"{filename}:{frame.f_code.co_name}"
+
+
+def fingerprint(exception, path):
+    """
+    Returns:
+        (pattern_id, error_type, path_pattern, signature)
+    """
+    error_type = type(exception).__name__
+    pattern_path = path_pattern(path)
+    signature = f"{error_type} at {pattern_path} in {culprit_frame(exception) or 'unknown'}"
+    pattern_id = hashlib.sha256(signature.encode('utf-8')).hexdigest()
+    return pattern_id, error_type, pattern_path, signature
+
+
+# ============================================================================
+# SAMPLING
+# ============================================================================
+
+def _sample(pattern_id):
+    """
+    Decide whether this occurrence is kept in full.
+
+    Returns:
+        Number of occurrences the kept row stands for, or 0 if dropped
+    """
+    first = get_error_logging_setting('SAMPLE_FIRST')
+    rate = get_error_logging_setting('SAMPLE_RATE')
+    window = get_error_logging_setting('SAMPLE_WINDOW_SECONDS')
+    interval = max(1, round(1 / rate)) if rate > 0 else None
+    current = time.monotonic()
+
+    with _lock:
+        state = _sample_windows.get(pattern_id)
+        if state is None or current - state[0] >= window:
+            if len(_sample_windows) > 10000:
+                _sample_windows.clear()
+            # [window start, seen in window, dropped since last kept]
+            state = _sample_windows[pattern_id] = [current, 0, 0]
+        state[1] += 1
+        seen = state[1]
+        if seen <= first or (interval and (seen - first) % interval == 0):
+            represented = state[2] + 1
+            state[2] = 0
+            return represented
+        state[2] += 1
+        return 0
+
+
+# ============================================================================
+# RECORDING
+# ============================================================================
+
+def record_error(request, exception, error_id, error_code, context=None, request_context=None):
+    """
+    Record an error occurrence without touching the database.
+
+    Args:
+        request: HttpRequest
+        exception: Exception instance
+        error_id: Unique error identifier
+        error_code: HTTP status code
+        context: Additional context dictionary
+        request_context: Already sanitized request context, if the caller
+            captured one; otherwise a raw snapshot is sanitized later
+
+    Returns:
+        True if this occurrence will be stored in full, False if it was
+        only counted
+    """
+    try:
+        return _record(request, exception, str(error_id), str(error_code), context, request_context)
+    except Exception as e:
+        logger.warning(f"Could not record error {error_id}: {e}")
+        return False
+
+
+def _record(request, exception, error_id, error_code, context, request_context):
+    from .errors import get_client_ip, snapshot_request_context
+
+    timestamp = timezone.now()
+    pattern_id, error_type, pattern_path, signature = fingerprint(
+        exception, pattern_source_path(request, error_code)
+    )
+
+    user = getattr(request, 'user', None)
+    user_id = user.pk if user is not None and user.is_authenticated else None
+
+    row = None
+    represented = _sample(pattern_id)
+    if represented:
+        row = {
+            'error_id': error_id,
+            'pattern_id': pattern_id,
+            'timestamp': timestamp,
+            'error_type': error_type,
+            'error_code': error_code,
+            'message': str(exception),
+            'path': request.path,
+            'full_path': request.get_full_path(),
+            'method': request.method,
+            'query_params': dict(request.GET.items()),
+            'user_id': user_id,
+            'user_agent': request.META.get('HTTP_USER_AGENT', ''),
+            'ip_address': get_client_ip(request),
+            'referrer': request.META.get('HTTP_REFERER'),
+            'traceback': (
+                traceback.TracebackException.from_exception(exception, lookup_lines=False)
+                if exception.__traceback__ else None
+            ),
+            'request_context': request_context,
+            'raw_request_context': snapshot_request_context(request) if request_context is None else None,
+            'additional_context': context or {},
+            'occurrence_count': represented,
+        }
+
+    with _lock:
+        pattern = _pending_patterns.get(pattern_id)
+        if pattern is None:
+            pattern = _pending_patterns[pattern_id] = {
+                'error_type': error_type,
+                'path_pattern': pattern_path,
+                'signature': signature,
+                'count': 0,
+                'first_seen': timestamp,
+                'last_seen': timestamp,
+                'user_ids': set(),
+            }
+        pattern['count'] += 1
+        pattern['last_seen'] = timestamp
+        if user_id:
+            pattern['user_ids'].add(user_id)
+
+        if row is not None and len(_pending_rows) >= get_error_logging_setting('MAX_BUFFERED_ROWS'):
+            row = None
+        if row is not None:
+            _pending_rows.append(row)
+
+    _schedule_flush()
+    return row is not None
+
+
+# ============================================================================
+# BACKGROUND WRITER
+# ============================================================================
+
+def _schedule_flush():
+    if get_error_logging_setting('BACKEND') == 'inline':
+        flush_error_log()
+        return
+
+    global _executor, _flush_scheduled
+    with _lock:
+        # A flush waiting to run will write these occurrences too
+        if _flush_scheduled:
+            return
+        _flush_scheduled = True
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='error-log')
+    _executor.submit(_flush_in_thread)
+
+
+def _flush_in_thread():
+    """Thread entry point; waits for a burst to collect, then writes it."""
+    global _flush_scheduled
+    time.sleep(get_error_logging_setting('FLUSH_SECONDS'))
+    with _lock:
+        _flush_scheduled = False
+    close_old_connections()
+    try:
+        flush_error_log()
+    except Exception as e:
+        logger.error(f"Error log writer failed: {e}")
+    finally:
+        close_old_connections()
+
+
+def flush_error_log():
+    """
+    Write buffered pattern counters and error rows.
+
+    Returns:
+        Number of ErrorLog rows written
+    """
+    global _pending_patterns, _pending_rows
+    with _lock:
+        patterns, rows = _pending_patterns, _pending_rows
+        _pending_patterns, _pending_rows = {}, []
+
+    if patterns:
+        try:
+            _write_patterns(patterns)
+        except OperationalError as e:
+            logger.error(f"Error log flush failed, will retry {len(patterns)} patterns and {len(rows)} rows: {e}")
+            _requeue(patterns, rows)
+            return 0
+    if rows:
+        try:
+            # error_id is unique, so rows written before a failure are skipped on retry
+            ErrorLog.objects.bulk_create(
+                [_build_error_log(row) for row in rows],
+                batch_size=500,
+                ignore_conflicts=True
+            )
+        except OperationalError as e:
+            logger.error(f"Error log flush failed, will retry {len(rows)} rows: {e}")
+            _requeue({}, rows)
+            return 0
+    return len(rows)
+
+
+def _requeue(patterns, rows):
+    """
+    Put unwritten pattern counters and rows back in front of anything
+    recorded since the flush started, keeping at most MAX_BUFFERED_ROWS rows.
+    """
+    global _pending_rows
+    with _lock:
+        for pattern_id, pattern in patterns.items():
+            pending = _pending_patterns.get(pattern_id)
+            if pending is None:
+                _pending_patterns[pattern_id] = pattern
+                continue
+            pending['count'] += pattern['count']
+            pending['first_seen'] = min(pending['first_seen'], pattern['first_seen'])
+            pending['last_seen'] = max(pending['last_seen'], pattern['last_seen'])
+            pending['user_ids'] |= pattern['user_ids']
+        _pending_rows = (rows + _pending_rows)[:get_error_logging_setting('MAX_BUFFERED_ROWS')]
+
+
+def _write_patterns(patterns):
+    with transaction.atomic():
+        ErrorPattern.objects.bulk_create([
+            ErrorPattern(
+                pattern_id=pattern_id,
+                error_type=pattern['error_type'][:255],
+                path_pattern=pattern['path_pattern'],
+                signature=pattern['signature'],
+                occurrence_count=0,
+                first_seen=pattern['first_seen'],
+                last_seen=pattern['first_seen'],
+            )
+            for pattern_id, pattern in patterns.items()
+        ], ignore_conflicts=True)
+
+        # Sorted so concurrent writers lock pattern rows in the same order
+        for pattern_id in sorted(patterns):
+            pattern = patterns[pattern_id]
+            ErrorPattern.objects.filter(pattern_id=pattern_id).update(
+                occurrence_count=F('occurrence_count') + pattern['count'],
+                last_seen=pattern['last_seen'],
+            )
+
+        affected = [
+            (pattern_id, user_id)
+            for pattern_id, pattern in patterns.items()
+            for user_id in pattern['user_ids']
+        ]
+        if affected:
+            pattern_pks = dict(
+                ErrorPattern.objects.filter(
+                    pattern_id__in={pattern_id for pattern_id, _ in affected}
+                ).values_list('pattern_id', 'pk')
+            )
+            Through = ErrorPattern.affected_users.through
+            Through.objects.bulk_create([
+                Through(errorpattern_id=pattern_pks[pattern_id], user_id=user_id)
+                for pattern_id, user_id in affected
+                if pattern_id in pattern_pks
+            ], ignore_conflicts=True)
+
+
+def _build_error_log(row):
+    from .errors import ErrorHandlerConfig, sanitize_data
+
+    request_context = row['request_context']
+    query_params = row['query_params']
+    if ErrorHandlerConfig.SANITIZE_SENSITIVE_DATA:
+        query_params = sanitize_data(query_params)
+        if request_context is None:
+            request_context = sanitize_data(row['raw_request_context'])
+    elif request_context is None:
+        request_context = row['raw_request_context']
+
+    stack_trace = ''.join(row['traceback'].format()) if row['traceback'] is not None else None
+
+    return ErrorLog(
+        error_id=row['error_id'],
+        pattern_id=row['pattern_id'],
+        timestamp=row['timestamp'],
+        error_type=row['error_type'][:255],
+        error_code=row['error_code'][:10],
+        error_message=row['message'],
+        exception_message=row['message'],
+        path=row['path'][:500],
+        full_path=row['full_path'][:1000],
+        method=row['method'][:10],
+        query_params=query_params,
+        user_id=row['user_id'],
+        user_agent=row['user_agent'],
+        ip_address=_valid_ip(row['ip_address']),
+        referrer=(row['referrer'] or '')[:1000] or None,
+        stack_trace=stack_trace,
+        request_context=request_context,
+        additional_context=row['additional_context'],
+        severity=SEVERITY_BY_CODE.get(row['error_code'], 'error'),
+        occurrence_count=row['occurrence_count'],
+        first_seen=row['timestamp'],
+        last_seen=row['timestamp'],
+    )
+
+
+def _valid_ip(value):
+    try:
+        return str(ipaddress.ip_address(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _flush_at_exit():
+    """Write whatever is still buffered when the process stops."""
+    if not (_pending_patterns or _pending_rows):
+        return
+    try:
+        flush_error_log()
+    except Exception as e:
+        logger.error(f"Could not flush error log at exit: {e}")
+
+
+atexit.register(_flush_at_exit)
@@ -1,4 +1,5 @@
 import logging
+import sys
 import traceback
 import json
 import hashlib
@@ -14,6 +15,9 @@ from django.core.exceptions import PermissionDenied, SuspiciousOperation
 from django.views.decorators.cache import never_cache
 from django.utils import timezone
 
+from .error_pipeline import record_error
+from .ratelimit import check_request_rate
+
 # Import error tracking services (install via pip)
 try:
     import sentry_sdk
@@ -210,6 +214,22 @@ def capture_request_context(request: HttpRequest) -> Dict[str, Any]:
     Returns:
         Dictionary containing sanitized request context
     """
+    context = snapshot_request_context(request)
+    
+    # Sanitize sensitive data
+    if ErrorHandlerConfig.SANITIZE_SENSITIVE_DATA:
+        context = sanitize_data(context)
+    
+    return context
+
+
+def snapshot_request_context(request: HttpRequest) -> Dict[str, Any]:
+    """
+    Unsanitized request context, as captured by capture_request_context.
+    
+    Cheap enough to take on a failing request; the error log pipeline
+    sanitizes it later, off the request.
+    """
     context = {
         'method': request.method,
         'path': request.path,
@@ -241,10 +261,6 @@ def capture_request_context(request: HttpRequest) -> Dict[str, Any]:
             if k.startswith('HTTP_')
         }
     
-    # Sanitize sensitive data
-    if ErrorHandlerConfig.SANITIZE_SENSITIVE_DATA:
-        context = sanitize_data(context)
-    
     return context
 
 
@@ -277,7 +293,8 @@ def check_rate_limit(request: HttpRequest, error_code: str) -> Tuple[bool, int]:
     """
     Implement rate limiting for error pages to prevent abuse.
     
-    Uses Django's cache framework to track error page requests per IP.
+    Uses the shared rate limiter (app.ratelimit) to track error page
+    requests per IP.
     This prevents attackers from overwhelming the system by triggering
     errors repeatedly.
     
@@ -291,24 +308,13 @@ def check_rate_limit(request: HttpRequest, error_code: str) -> Tuple[bool, int]:
     if not ErrorHandlerConfig.RATE_LIMIT_ENABLED:
         return True, ErrorHandlerConfig.RATE_LIMIT_REQUESTS
     
-    client_ip = get_client_ip(request)
-    cache_key = f"error_rate_limit:{error_code}:{client_ip}"
-    
-    # Get current request count
-    request_count = cache.get(cache_key, 0)
-    
-    if request_count >= ErrorHandlerConfig.RATE_LIMIT_REQUESTS:
-        return False, 0
-    
-    # Increment counter
-    cache.set(
-        cache_key,
-        request_count + 1,
+    result = check_request_rate(
+        request,
+        f"error_page.{error_code}",
+        ErrorHandlerConfig.RATE_LIMIT_REQUESTS,
         ErrorHandlerConfig.RATE_LIMIT_WINDOW
     )
-    
-    remaining = ErrorHandlerConfig.RATE_LIMIT_REQUESTS - request_count - 1
-    return True, remaining
+    return result.allowed, result.remaining
 
 
 def log_error_to_monitoring(
@@ -491,6 +497,10 @@ def build_error_context(
     # Log to monitoring services
     log_error_to_monitoring(error, request, error_id, request_context)
     
+    # Record in the error log (buffered and sampled; see app.error_pipeline)
+    if ErrorHandlerConfig.ENABLE_DATABASE_LOGGING:
+        record_error(request, error, error_id, error_code, request_context=request_context)
+    
     # Build base context
     context = {
         'error_code': error_code,
@@ -548,6 +558,10 @@ def build_json_error_response(
     # Log to monitoring
     log_error_to_monitoring(error, request, error_id, request_context)
     
+    # Record in the error log (buffered and sampled; see app.error_pipeline)
+    if ErrorHandlerConfig.ENABLE_DATABASE_LOGGING:
+        record_error(request, error, error_id, error_code, request_context=request_context)
+    
     response_data = {
         'error': {
             'code': error_code,
@@ -649,8 +663,9 @@ def error_500(request: HttpRequest) -> HttpResponse:
     """
     error_message = 'An internal server error occurred. Our team has been notified.'
     
-    # Create a generic exception for 500 errors without an exception object
-    exception = Exception("Internal Server Error")
+    # handler500 runs inside Django's except block: use the exception being
+    # handled, so the error log gets its real type, culprit and traceback
+    exception = sys.exc_info()[1] or Exception("Internal Server Error")
     
     # Suggestions for recovery
     suggestions = [
@@ -0,0 +1,272 @@
+"""
+Background export jobs.
+
+Long-running reports and data exports are recorded as ``ExportJob`` rows and
+generated off the request path. A view calls ``enqueue_export`` and
+redirects the user to the job page, which polls for progress and offers a
+download link once the artifact is stored.
+
+Export handlers are plain callables registered by name in
+``EXPORT_HANDLERS``. Each one receives the job and returns the same
+``HttpResponse`` the synchronous view used to return. The runner captures
+the response body into the job's ``output_file``, so existing report
+writers are reused unchanged.
+
+Dispatch backends (``settings.EXPORT_JOBS['BACKEND']``):
+    thread  - in-process thread pool, works without a broker (default)
+    celery  - ``run_export_job_task`` on the configured Celery broker
+    command - left pending for ``python manage.py run_export_jobs`` (cron)
+"""
+import logging
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import ExportJob
+
+logger = logging.getLogger(__name__)
+
+try:
+    from celery import shared_task
+except ImportError:  # Celery is optional
+    shared_task = None
+
+
+# Registered export handlers: name -> dotted path of ``handler(job) -> HttpResponse``
+EXPORT_HANDLERS = {
+    'enrollment_applications': 'enrollments.exports.run_application_export_job',
+    'card_report': 'affiliationcard.views.run_card_report_job',
+    'cpd_compliance': 'cpd.utils.run_compliance_export_job',
+}
+
+DEFAULT_EXPORT_JOB_SETTINGS = {
+    'BACKEND': 'thread',
+    'MAX_WORKERS': 2,
+    'STALE_AFTER_MINUTES': 60,
+    'RETENTION_DAYS': 7,
+    'STORAGE_ROOT': None,
+}
+
+_executor = None
+
+
+def get_export_job_setting(name):
+    """Read an EXPORT_JOBS setting, falling back to the defaults above."""
+    return getattr(settings, 'EXPORT_JOBS', {}).get(name, DEFAULT_EXPORT_JOB_SETTINGS[name])
+
+
+# ============================================================================
+# ENQUEUE AND DISPATCH
+# ============================================================================
+
+def enqueue_export(export_type, user, parameters=None):
+    """
+    Create an export job and hand it to the configured worker.
+
+    Dispatch is deferred until the surrounding transaction commits so the
+    worker never looks for a row that is not visible yet.
+
+    Args:
+        export_type: Key of EXPORT_HANDLERS
+        user: User requesting the export (owner of the job)
+        parameters: JSON-serialisable dict passed to the handler
+
+    Returns:
+        ExportJob instance
+    """
+    if export_type not in EXPORT_HANDLERS:
+        raise ValueError(f"Unknown export type: {export_type}")
+
+    job = ExportJob.objects.create(
+        export_type=export_type,
+        parameters=parameters or {},
+        created_by=user,
+    )
+    transaction.on_commit(lambda: dispatch_export_job(job.pk))
+    logger.info(f"Queued {export_type} export job {job.pk} for user {user.pk}")
+    return job
+
+
+def dispatch_export_job(job_id):
+    """Send a pending job to Celery or the in-process thread pool."""
+    backend = get_export_job_setting('BACKEND')
+
+    if backend == 'command':
+        return
+
+    if backend == 'celery' and shared_task is not None:
+        try:
+            run_export_job_task.delay(str(job_id))
+            return
+        except Exception as e:
+            logger.warning(f"Celery unavailable for export job {job_id}, using thread pool: {e}")
+
+    _get_executor().submit(_run_in_thread, job_id)
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=get_export_job_setting('MAX_WORKERS'),
+            thread_name_prefix='export-job',
+        )
+    return _executor
+
+
+def _run_in_thread(job_id):
+    """Thread-pool entry point; each thread manages its own DB connection."""
+    close_old_connections()
+    try:
+        run_export_job(job_id)
+    finally:
+        close_old_connections()
+
+
+if shared_task is not None:
+    @shared_task(name='app.run_export_job')
+    def run_export_job_task(job_id):
+        run_export_job(job_id)
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+def run_export_job(job_id):
+    """
+    Claim and run one pending export job.
+
+    The claim is a conditional UPDATE, so when a job is dispatched twice
+    (e.g. by the thread pool and the cron command) only one worker runs it.
+
+    Returns:
+        True if this call ran the job, False if it was already claimed.
+    """
+    claimed = ExportJob.objects.filter(pk=job_id, status=ExportJob.Status.PENDING).update(
+        status=ExportJob.Status.RUNNING,
+        started_at=timezone.now(),
+    )
+    if not claimed:
+        return False
+
+    job = ExportJob.objects.select_related('created_by').get(pk=job_id)
+    started = timezone.now()
+
+    try:
+        handler = import_string(EXPORT_HANDLERS[job.export_type])
+        response = handler(job)
+        _store_response(job, response)
+
+        job.status = ExportJob.Status.COMPLETED
+        job.progress = 100
+        job.completed_at = timezone.now()
+        job.save(update_fields=[
+            'status', 'progress', 'row_count', 'output_file', 'file_name',
+            'content_type', 'completed_at', 'updated_at',
+        ])
+        logger.info(
+            f"Export job {job.pk} ({job.export_type}) completed: {job.row_count} rows "
+            f"in {(job.completed_at - started).total_seconds():.1f}s"
+        )
+        _notify_owner(job)
+
+    except Exception as e:
+        logger.exception(f"Export job {job.pk} ({job.export_type}) failed: {e}")
+        job.status = ExportJob.Status.FAILED
+        job.error_message = str(e)
+        job.completed_at = timezone.now()
+        job.save(update_fields=['status', 'error_message', 'completed_at', 'updated_at'])
+        _notify_owner(job)
+
+    return True
+
+
+def _response_filename(response, job):
+    disposition = response.get('Content-Disposition', '')
+    match = re.search(r'filename="?([^";]+)"?', disposition)
+    if match:
+        return match.group(1)
+    return f"{job.export_type}_{timezone.now().strftime('%Y%m%d_%H%M%S')}"
+
+
+def _store_response(job, response):
+    """Copy a (possibly streaming) response body into the job's output file."""
+    with tempfile.TemporaryFile() as spool:
+        if response.streaming:
+            for chunk in response.streaming_content:
+                spool.write(chunk)
+        else:
+            spool.write(response.content)
+        response.close()
+
+        spool.seek(0)
+        job.file_name = _response_filename(response, job)
+        job.content_type = response.get('Content-Type', 'application/octet-stream')
+        job.output_file.save(job.file_name, File(spool), save=False)
+
+
+def _notify_owner(job):
+    """Tell the job owner their export is ready (or failed)."""
+    if not job.created_by:
+        return
+    try:
+        from .notification_utils import create_notification
+
+        if job.status == ExportJob.Status.COMPLETED:
+            title = f"{job.get_export_type_display()} export ready"
+            message = f"Your export ({job.row_count} rows) is ready to download."
+        else:
+            title = f"{job.get_export_type_display()} export failed"
+            message = "Your export could not be generated. Please try again or contact support."
+
+        create_notification(
+            recipient=job.created_by,
+            notification_type='system_alert',
+            title=title,
+            message=message,
+            content_object=job,
+            action_url=job.get_absolute_url(),
+        )
+    except Exception as e:
+        logger.warning(f"Could not notify owner of export job {job.pk}: {e}")
+
+
+# ============================================================================
+# MAINTENANCE
+# ============================================================================
+
+def requeue_stale_jobs():
+    """
+    Return jobs orphaned by a dead worker to the pending queue.
+
+    A thread-pool job dies with its web worker process; anything left
+    running past STALE_AFTER_MINUTES is assumed lost and run again.
+    """
+    cutoff = timezone.now() - timedelta(minutes=get_export_job_setting('STALE_AFTER_MINUTES'))
+    return ExportJob.objects.filter(
+        status=ExportJob.Status.RUNNING,
+        started_at__lt=cutoff,
+    ).update(status=ExportJob.Status.PENDING, progress=0, started_at=None)
+
+
+def purge_expired_jobs():
+    """Delete finished jobs (and their files) older than RETENTION_DAYS."""
+    cutoff = timezone.now() - timedelta(days=get_export_job_setting('RETENTION_DAYS'))
+    purged = 0
+    for job in ExportJob.objects.filter(
+        status__in=[ExportJob.Status.COMPLETED, ExportJob.Status.FAILED],
+        created_at__lt=cutoff,
+    ).iterator():
+        if job.output_file:
+            job.output_file.delete(save=False)
+        job.delete()
+        purged += 1
+    return purged
@@ -0,0 +1,85 @@
+"""
+Django Management Command: Deliver Queued Emails
+
+Sends pending EmailOutbox messages in batches over one connection per
+batch. Use this from cron (or with --loop as a long-running worker) when
+EMAIL_OUTBOX['BACKEND'] is 'command', and with any backend to pick up
+retries once their backoff has elapsed.
+
+File Location: app/management/commands/deliver_outbox.py
+
+Usage:
+    python manage.py deliver_outbox                  # Send everything that is due once
+    python manage.py deliver_outbox --loop           # Keep polling for new messages
+    python manage.py deliver_outbox --batch-size 100 # Messages per connection
+    python manage.py deliver_outbox --requeue-stale  # Retry messages orphaned while sending
+    python manage.py deliver_outbox --purge          # Delete old sent messages
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from app.email_outbox import deliver_pending, purge_sent_messages, requeue_stale_messages
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued outbox emails'
+
+    def add_arguments(self, parser):
+        """Define command-line arguments"""
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling for due messages instead of exiting',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=5,
+            metavar='SECONDS',
+            help='Polling interval when running with --loop (default: 5)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Messages sent per connection (default: EMAIL_OUTBOX BATCH_SIZE)',
+        )
+        parser.add_argument(
+            '--requeue-stale',
+            action='store_true',
+            help='Return messages stuck in sending state to the queue first',
+        )
+        parser.add_argument(
+            '--purge',
+            action='store_true',
+            help='Delete sent messages older than the retention period',
+        )
+
+    def handle(self, *args, **options):
+        if options['requeue_stale']:
+            requeued = requeue_stale_messages()
+            self.stdout.write(f"Requeued {requeued} stale messages")
+
+        if options['purge']:
+            purged = purge_sent_messages()
+            self.stdout.write(f"Purged {purged} sent messages")
+
+        while True:
+            sent, claimed = self.deliver_due(options['batch_size'])
+            if claimed:
+                self.stdout.write(self.style.SUCCESS(f"Sent {sent} of {claimed} messages"))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+    def deliver_due(self, batch_size):
+        """Deliver batches until nothing is due."""
+        total_sent = total_claimed = 0
+        while True:
+            sent, claimed = deliver_pending(batch_size)
+            if not claimed:
+                return total_sent, total_claimed
+            total_sent += sent
+            total_claimed += claimed
@@ -0,0 +1,48 @@
+"""
+Django Management Command: Reconcile System Statistics
+
+Rebuilds the materialized dashboard counters (SystemStat rows) from the
+application, card and CPD approval tables. Signal handlers keep the
+counters current during normal use; run this from cron (e.g. nightly) and
+after imports or bulk updates that bypass model signals.
+
+File Location: app/management/commands/reconcile_system_stats.py
+
+Usage:
+    python manage.py reconcile_system_stats            # Rebuild all counters
+    python manage.py reconcile_system_stats --dry-run  # Show counters that drifted
+"""
+
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from app.models import SystemStat
+from app.system_stats import compute_system_stats, reconcile_system_stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the materialized system statistics from the source tables'
+
+    def add_arguments(self, parser):
+        """Define command-line arguments"""
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report drifted counters without changing them',
+        )
+
+    def handle(self, *args, **options):
+        stored = Counter(dict(SystemStat.objects.values_list('key', 'value')))
+        actual = compute_system_stats() if options['dry_run'] else reconcile_system_stats()
+
+        drifted = sorted(key for key in set(stored) | set(actual) if stored[key] != actual[key])
+        for key in drifted:
+            self.stdout.write(f"  {key}: {stored[key]} -> {actual[key]}")
+
+        if options['dry_run']:
+            self.stdout.write(f"{len(drifted)} counters differ from the source tables (dry run)")
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Reconciled {len(actual)} counters ({len(drifted)} corrected)"
+            ))
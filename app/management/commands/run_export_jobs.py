@@ -0,0 +1,77 @@
+"""
+Django Management Command: Run Background Export Jobs
+
+Processes pending ExportJob rows. Use this from cron when
+EXPORT_JOBS['BACKEND'] is 'command', or as a safety net for jobs left
+behind by a restarted web worker when using the thread backend.
+
+File Location: app/management/commands/run_export_jobs.py
+
+Usage:
+    python manage.py run_export_jobs                  # Run all pending jobs once
+    python manage.py run_export_jobs --loop           # Keep polling for new jobs
+    python manage.py run_export_jobs --requeue-stale  # Retry jobs orphaned while running
+    python manage.py run_export_jobs --purge          # Delete expired jobs and files
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from app.export_jobs import purge_expired_jobs, requeue_stale_jobs, run_export_job
+from app.models import ExportJob
+
+
+class Command(BaseCommand):
+    help = 'Run pending background export jobs'
+
+    def add_arguments(self, parser):
+        """Define command-line arguments"""
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling for pending jobs instead of exiting',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=5,
+            metavar='SECONDS',
+            help='Polling interval when running with --loop (default: 5)',
+        )
+        parser.add_argument(
+            '--requeue-stale',
+            action='store_true',
+            help='Return jobs stuck in running state to the queue first',
+        )
+        parser.add_argument(
+            '--purge',
+            action='store_true',
+            help='Delete finished jobs older than the retention period',
+        )
+
+    def handle(self, *args, **options):
+        if options['requeue_stale']:
+            requeued = requeue_stale_jobs()
+            self.stdout.write(f"Requeued {requeued} stale export jobs")
+
+        if options['purge']:
+            purged = purge_expired_jobs()
+            self.stdout.write(f"Purged {purged} expired export jobs")
+
+        while True:
+            ran = self.run_pending()
+            if ran:
+                self.stdout.write(self.style.SUCCESS(f"Ran {ran} export jobs"))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+    def run_pending(self):
+        """Run every job that is pending now, oldest first."""
+        job_ids = list(
+            ExportJob.objects.filter(status=ExportJob.Status.PENDING)
+            .order_by('created_at')
+            .values_list('pk', flat=True)
+        )
+        return sum(1 for job_id in job_ids if run_export_job(job_id))
@@ -1,4 +1,6 @@
 import traceback
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils import timezone
@@ -1041,6 +1043,235 @@ class Notification(BaseModel):
 
 
 
+### ========== BACKGROUND EXPORT JOBS ========== ###
+
+
+def export_storage():
+    """
+    Storage for export files. They hold applicant personal data, so they
+    live outside MEDIA_ROOT (which is served publicly) and are only served
+    through ``export_job_download``.
+    """
+    location = getattr(settings, 'EXPORT_JOBS', {}).get('STORAGE_ROOT') or settings.BASE_DIR / 'private' / 'exports'
+    return FileSystemStorage(location=location, base_url=None)
+
+
+def export_upload_to(instance, filename):
+    """Store each export under its job's (random) id."""
+    return f"{instance.pk}/{filename}"
+
+
+class ExportJob(BaseModel):
+    """
+    A report or data export running off the request path.
+    
+    The request that asks for an export only creates this row; a worker
+    (Celery, the in-process thread pool or the run_export_jobs command)
+    generates the file, records progress while it runs and stores the
+    finished artifact for download.
+    """
+    
+    class Status(models.TextChoices):
+        PENDING = 'pending', _('Pending')
+        RUNNING = 'running', _('Running')
+        COMPLETED = 'completed', _('Completed')
+        FAILED = 'failed', _('Failed')
+    
+    # What to run
+    export_type = models.CharField(max_length=50, db_index=True, help_text="Registered export name")
+    parameters = models.JSONField(default=dict, blank=True)
+    
+    # Progress tracking
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING, db_index=True)
+    progress = models.PositiveSmallIntegerField(
+        default=0,
+        validators=[MaxValueValidator(100)],
+        help_text="Completion percentage"
+    )
+    row_count = models.PositiveIntegerField(default=0)
+    
+    # Output
+    output_file = models.FileField(upload_to=export_upload_to, storage=export_storage, blank=True, null=True)
+    file_name = models.CharField(max_length=255, blank=True)
+    content_type = models.CharField(max_length=100, blank=True)
+    error_message = models.TextField(blank=True)
+    
+    # Timing
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_by', 'created_at']),
+            models.Index(fields=['status', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_export_type_display()} ({self.get_status_display()})"
+    
+    def get_export_type_display(self):
+        return self.export_type.replace('_', ' ').title()
+    
+    def get_absolute_url(self):
+        return reverse('common:export_job_detail', args=[self.pk])
+    
+    def get_download_url(self):
+        return reverse('common:export_job_download', args=[self.pk])
+    
+    @property
+    def is_finished(self):
+        return self.status in (self.Status.COMPLETED, self.Status.FAILED)
+    
+    def set_progress(self, processed, total):
+        """
+        Record progress without touching the rest of the row.
+        
+        Uses a queryset update so a running export never overwrites fields
+        written by another process, and only writes when the percentage moves.
+        """
+        percent = min(int(processed * 100 / total), 99) if total else 0
+        self.row_count = processed
+        if percent != self.progress:
+            self.progress = percent
+            ExportJob.objects.filter(pk=self.pk).update(progress=percent, row_count=processed)
+
+
+### ========== NUMBER SEQUENCES ========== ###
+
+
+class NumberSequence(models.Model):
+    """
+    Counter for one human-readable numbering scope.
+    
+    Card and application numbers are ``{prefix}{sequence}`` where the prefix
+    encodes council, type and year. Each prefix has one row here; numbers
+    are handed out by incrementing ``last_value`` in a single UPDATE (see
+    ``app.sequences``), so allocation is O(1) and the row lock serialises
+    concurrent allocations instead of letting them read the same count.
+    """
+    
+    scope = models.CharField(max_length=100, primary_key=True)
+    last_value = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Number Sequence"
+        verbose_name_plural = "Number Sequences"
+    
+    def __str__(self):
+        return f"{self.scope}: {self.last_value}"
+
+
+### ========== EMAIL OUTBOX ========== ###
+
+
+class EmailOutbox(models.Model):
+    """
+    An outgoing email waiting for (or recording) delivery.
+
+    Views and utilities queue messages here instead of calling
+    ``EmailMessage.send()`` in the request (see ``app.email_outbox``). A
+    delivery worker claims pending rows in batches, sends each batch over a
+    single provider connection and records the outcome per message, retrying
+    failures with exponential backoff.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', _('Pending')
+        SENDING = 'sending', _('Sending')
+        SENT = 'sent', _('Sent')
+        FAILED = 'failed', _('Failed')
+
+    # Message
+    category = models.CharField(max_length=50, blank=True, db_index=True, help_text="Email purpose, for reporting")
+    subject = models.CharField(max_length=998)
+    from_email = models.CharField(max_length=255, blank=True)
+    to = models.JSONField(default=list)
+    cc = models.JSONField(default=list, blank=True)
+    bcc = models.JSONField(default=list, blank=True)
+    reply_to = models.JSONField(default=list, blank=True)
+    headers = models.JSONField(default=dict, blank=True)
+    body = models.TextField(blank=True)
+    content_subtype = models.CharField(max_length=20, default='plain')
+    alternatives = models.JSONField(default=list, blank=True, help_text="[content, mimetype] pairs")
+    attachments = models.JSONField(default=list, blank=True, help_text="Base64-encoded file attachments")
+
+    # Delivery state
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claim_token = models.UUIDField(null=True, blank=True, db_index=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    provider_message_id = models.CharField(max_length=255, blank=True)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Outgoing Email"
+        verbose_name_plural = "Email Outbox"
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.get_status_display()})"
+
+
+### ========== SYSTEM STATISTICS ========== ###
+
+
+class SystemStat(models.Model):
+    """
+    One materialized counter for the staff dashboard.
+
+    Keys are dotted metric names such as ``applications.status.approved``
+    or ``cards.council.CGMP``. Counters are adjusted by signal handlers when
+    applications and cards are saved or deleted, and rebuilt from the source
+    tables by ``python manage.py reconcile_system_stats`` (see
+    ``app.system_stats``).
+    """
+
+    key = models.CharField(max_length=100, primary_key=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "System Statistic"
+        verbose_name_plural = "System Statistics"
+
+    def __str__(self):
+        return f"{self.key}: {self.value}"
+
+
+### ========== RATE LIMITING ========== ###
+
+
+class RateLimitCounter(models.Model):
+    """
+    Request counter for one rate-limit window.
+
+    Used by ``app.ratelimit`` when the default cache is the database cache,
+    whose ``incr`` is a non-atomic get followed by a set. Each hit is a
+    single ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING`` on this table
+    instead. Expired rows are purged opportunistically.
+    """
+
+    key = models.CharField(max_length=250, primary_key=True)
+    count = models.BigIntegerField(default=0)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        verbose_name = "Rate Limit Counter"
+        verbose_name_plural = "Rate Limit Counters"
+
+    def __str__(self):
+        return f"{self.key}: {self.count}"
+
+
 ### ========== RESOURCE AND TRAINING SYSTEM ========== ###
 
 class Resource(BaseModel):
@@ -1590,6 +1821,13 @@ class ErrorLog(models.Model):
         help_text="Most recent occurrence of this error pattern"
     )
     
+    pattern_id = models.CharField(
+        max_length=64,
+        blank=True,
+        db_index=True,
+        help_text="ErrorPattern this error was grouped into"
+    )
+    
     # Custom manager
     objects = ErrorLogManager()
     
@@ -1648,10 +1886,11 @@ class ErrorLog(models.Model):
     @classmethod
     def log_error(cls, request, exception, error_id, error_code, context=None):
         """
-        Create a new error log entry.
+        Record an error occurrence.
         
-        This is a convenience method for creating error logs from
-        exception handlers.
+        This is a convenience method for exception handlers. The occurrence
+        is fingerprinted into an ErrorPattern, sampled, and written by the
+        background writer in app.error_pipeline rather than on the request.
         
         Args:
             request: HttpRequest object
@@ -1661,46 +1900,12 @@ class ErrorLog(models.Model):
             context: Additional context dictionary
             
         Returns:
-            ErrorLog instance
+            True if this occurrence will be stored as an ErrorLog row,
+            False if it was only counted on its pattern
         """
-        from app.errors import capture_request_context, get_client_ip
-        
-        # Capture request context
-        request_context = capture_request_context(request)
+        from app.error_pipeline import record_error
         
-        # Determine severity based on error code
-        severity_map = {
-            '400': 'warning',
-            '401': 'warning',
-            '403': 'warning',
-            '404': 'info',
-            '500': 'critical',
-            '503': 'critical',
-        }
-        severity = severity_map.get(error_code, 'error')
-        
-        # Create error log
-        error_log = cls.objects.create(
-            error_id=error_id,
-            error_type=type(exception).__name__,
-            error_code=error_code,
-            error_message=str(exception),
-            exception_message=str(exception),
-            path=request.path,
-            full_path=request.get_full_path(),
-            method=request.method,
-            query_params=dict(request.GET.items()),
-            user=request.user if request.user.is_authenticated else None,
-            user_agent=request.META.get('HTTP_USER_AGENT', ''),
-            ip_address=get_client_ip(request),
-            referrer=request.META.get('HTTP_REFERER'),
-            stack_trace=traceback.format_exc() if hasattr(exception, '__traceback__') else None,
-            request_context=request_context,
-            additional_context=context or {},
-            severity=severity,
-        )
-        
-        return error_log
+        return record_error(request, exception, error_id, error_code, context=context)
 
 
 class ErrorPattern(models.Model):
@@ -1784,15 +1989,18 @@ class ErrorPattern(models.Model):
         return f"{self.error_type} ({self.occurrence_count} occurrences)"
     
     def update_statistics(self):
-        """Update occurrence statistics from related error logs."""
-        related_errors = ErrorLog.objects.filter(
-            error_type=self.error_type,
-            path__icontains=self.path_pattern.replace('*', '')
+        """
+        Rebuild occurrence statistics from the stored error logs. Each
+        sampled row counts for the occurrences it stands for.
+        """
+        totals = ErrorLog.objects.filter(pattern_id=self.pattern_id).aggregate(
+            occurrences=models.Sum('occurrence_count'),
+            last_seen=models.Max('timestamp')
         )
         
-        self.occurrence_count = related_errors.count()
-        if self.occurrence_count > 0:
-            self.last_seen = related_errors.order_by('-timestamp').first().timestamp
+        self.occurrence_count = totals['occurrences'] or 0
+        if totals['last_seen']:
+            self.last_seen = totals['last_seen']
         
         self.save()
 
@@ -1824,7 +2032,7 @@ class ErrorLogAdmin(admin.ModelAdmin):
     
     search_fields = [
         'error_id', 'error_message', 'path', 'user__username',
-        'ip_address'
+        'ip_address', 'pattern_id'
     ]
     
     readonly_fields = [
@@ -1853,7 +2061,7 @@ class ErrorLogAdmin(admin.ModelAdmin):
                       'resolution_notes')
         }),
         ('Tracking', {
-            'fields': ('occurrence_count', 'first_seen', 'last_seen',
+            'fields': ('pattern_id', 'occurrence_count', 'first_seen', 'last_seen',
                       'notified', 'sentry_id'),
             'classes': ('collapse',)
         }),
@@ -0,0 +1,202 @@
+"""
+Bulk notification fan-out.
+
+``notify_users`` and ``batch_send_notifications`` used to call
+``create_notification`` / ``send_notification`` once per recipient: a
+preference check (two queries), an INSERT, a delivery attempt and a
+delivered-flag UPDATE for every user, so an announcement to a whole council
+cost thousands of queries.
+
+``fan_out_notifications`` does the same work per chunk of recipients:
+
+1. Recipients are resolved once (a QuerySet is read as a list of ids).
+2. Preferences are evaluated for the whole chunk with two queries: which
+   recipients are active, and which already received the same
+   notification type from the same sender in the last 15 minutes.
+3. Notification rows are written with one ``bulk_create``. Rows that are
+   due are stored as delivered; in-app delivery needs nothing else.
+4. Email notifications are handed to the email outbox (``queue_emails``)
+   instead of being sent inline. SMS and push have no provider yet.
+5. Recipients' cached notification summaries are invalidated with one
+   cache call.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.mail import EmailMultiAlternatives
+from django.db.models import QuerySet
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from .email_outbox import queue_emails
+from .models import Notification
+from .notification_utils import invalidate_notification_summary
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+FANOUT_CHUNK_SIZE = 500
+
+# Same rules as app.utils._should_send_notification
+SELF_NOTIFICATION_TYPES = {'system_alert', 'reminder'}
+DUPLICATE_WINDOW = timedelta(minutes=15)
+
+
+def fan_out_notifications(
+    recipients,
+    notification_type,
+    title,
+    message,
+    content_object=None,
+    sender=None,
+    action_url='',
+    extra_data=None,
+    delivery_method='in_app',
+    scheduled_for=None,
+    expires_at=None,
+    apply_preferences=False,
+    chunk_size=FANOUT_CHUNK_SIZE,
+):
+    """
+    Create the same notification for many recipients.
+
+    Args:
+        recipients: QuerySet, list of Users or list of user ids
+        apply_preferences: Skip inactive users, self-notifications and
+            recent duplicates, as ``send_notification`` does
+        Other args as ``create_notification`` / ``send_notification``
+
+    Returns:
+        List of created Notification objects
+    """
+    valid_types = {choice[0] for choice in Notification.NOTIFICATION_TYPES}
+    if notification_type not in valid_types:
+        logger.warning(f"Invalid notification type: {notification_type}")
+        return []
+
+    recipient_ids = _resolve_recipient_ids(recipients)
+    template = {
+        'notification_type': notification_type,
+        'title': title,
+        'message': message,
+        'sender': sender,
+        'action_url': action_url,
+        'extra_data': extra_data or {},
+        'delivery_method': delivery_method,
+        'scheduled_for': scheduled_for,
+        'expires_at': expires_at,
+    }
+    if content_object is not None:
+        template['content_type'] = ContentType.objects.get_for_model(content_object)
+        template['object_id'] = content_object.pk
+
+    created = []
+    for start in range(0, len(recipient_ids), chunk_size):
+        chunk = recipient_ids[start:start + chunk_size]
+        if apply_preferences:
+            chunk = _filter_by_preferences(chunk, notification_type, sender)
+        created.extend(_create_chunk(chunk, template))
+
+    logger.info(
+        f"Fan-out created {len(created)} {notification_type} notifications "
+        f"for {len(recipient_ids)} recipients"
+    )
+    return created
+
+
+def _resolve_recipient_ids(recipients):
+    if isinstance(recipients, QuerySet):
+        ids = recipients.values_list('pk', flat=True)
+    else:
+        ids = (getattr(recipient, 'pk', recipient) for recipient in recipients)
+    # Preserve order, drop repeats
+    return list(dict.fromkeys(ids))
+
+
+def _filter_by_preferences(recipient_ids, notification_type, sender):
+    """Bulk equivalent of app.utils._should_send_notification."""
+    active = set(
+        User.objects.filter(pk__in=recipient_ids, is_active=True).values_list('pk', flat=True)
+    )
+
+    recently_notified = set(
+        Notification.objects.filter(
+            recipient_id__in=recipient_ids,
+            notification_type=notification_type,
+            sender=sender,
+            created_at__gte=timezone.now() - DUPLICATE_WINDOW,
+        ).values_list('recipient_id', flat=True)
+    )
+
+    sender_id = sender.pk if sender is not None else None
+    return [
+        recipient_id for recipient_id in recipient_ids
+        if recipient_id in active
+        and recipient_id not in recently_notified
+        and (recipient_id != sender_id or notification_type in SELF_NOTIFICATION_TYPES)
+    ]
+
+
+def _create_chunk(recipient_ids, template):
+    if not recipient_ids:
+        return []
+
+    now = timezone.now()
+    scheduled_for = template['scheduled_for']
+    due = not scheduled_for or scheduled_for <= now
+
+    notifications = Notification.objects.bulk_create([
+        Notification(
+            recipient_id=recipient_id,
+            is_delivered=due,
+            delivered_at=now if due else None,
+            **template
+        )
+        for recipient_id in recipient_ids
+    ])
+
+    if due and template['delivery_method'] == 'email':
+        _queue_email_delivery(notifications)
+
+    invalidate_notification_summary(*recipient_ids)
+    return notifications
+
+
+def _queue_email_delivery(notifications):
+    """Render notification emails and hand them to the outbox."""
+    site_name = getattr(settings, 'SITE_NAME', 'Workspace')
+    recipients = User.objects.in_bulk([n.recipient_id for n in notifications])
+
+    messages = []
+    for notification in notifications:
+        recipient = recipients.get(notification.recipient_id)
+        if recipient is None or not recipient.email:
+            continue
+        notification.recipient = recipient
+        context = {
+            'notification': notification,
+            'recipient': recipient,
+            'sender': notification.sender,
+            'action_url': f"{settings.SITE_URL}{notification.action_url}" if notification.action_url else "",
+            'site_name': site_name,
+        }
+        try:
+            html_content = render_to_string('app/emails/notification.html', context)
+        except Exception as e:
+            logger.error(f"Failed to render notification email for {recipient.email}: {e}")
+            continue
+        email = EmailMultiAlternatives(
+            subject=f"[{site_name}] {notification.title}",
+            body=strip_tags(html_content),
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[recipient.email],
+        )
+        email.attach_alternative(html_content, "text/html")
+        messages.append(email)
+
+    queue_emails(messages, category='notification')
@@ -1,10 +1,16 @@
 import logging
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.utils import timezone
 from .models import Notification
 
 logger = logging.getLogger(__name__)
 
+# Per-user notification summary (unread count + most recent notifications)
+# kept in the cache and updated in place by the functions below
+SUMMARY_RECENT_LIMIT = 10
+SUMMARY_TIMEOUT = 300
+
 
 def create_notification(
     recipient,
@@ -89,6 +95,7 @@ def create_notification(
             notification.delivered_at = timezone.now()
         
         notification.save()
+        add_to_notification_summary(notification)
         
         logger.info(
             f"Notification created: {notification_type} for {recipient.username}"
@@ -114,6 +121,8 @@ def notify_users(
     """
     Create notifications for multiple users at once.
     
+    Rows are written in bulk by ``app.notification_fanout``.
+    
     Args:
         recipients: List or QuerySet of User objects
         Other args same as create_notification
@@ -134,26 +143,19 @@ def notify_users(
             sender=user
         )
     """
-    notifications = []
+    # Local import: notification_fanout imports this module
+    from .notification_fanout import fan_out_notifications
     
-    for recipient in recipients:
-        notification = create_notification(
-            recipient=recipient,
-            notification_type=notification_type,
-            title=title,
-            message=message,
-            content_object=content_object,
-            sender=sender,
-            action_url=action_url,
-            extra_data=extra_data
-        )
-        
-        if notification:
-            notifications.append(notification)
-    
-    logger.info(f"Created {len(notifications)} notifications for {len(list(recipients))} recipients")
-    
-    return notifications
+    return fan_out_notifications(
+        recipients,
+        notification_type=notification_type,
+        title=title,
+        message=message,
+        content_object=content_object,
+        sender=sender,
+        action_url=action_url,
+        extra_data=extra_data
+    )
 
 
 def mark_notification_read(notification_id, user):
@@ -173,7 +175,9 @@ def mark_notification_read(notification_id, user):
             recipient=user,
             is_active=True
         )
-        notification.mark_as_read()
+        if not notification.is_read:
+            notification.mark_as_read()
+            _mark_read_in_summary(user.pk, [notification.id], 1)
         return True
     except Notification.DoesNotExist:
         logger.warning(f"Notification {notification_id} not found for user {user.username}")
@@ -202,6 +206,7 @@ def mark_all_read(user):
             is_read=True,
             read_at=timezone.now()
         )
+        _mark_read_in_summary(user.pk, None, count)
         
         logger.info(f"Marked {count} notifications as read for {user.username}")
         return count
@@ -211,6 +216,30 @@ def mark_all_read(user):
         return 0
 
 
+def mark_selected_read(user, notification_ids):
+    """
+    Mark specific notifications as read for a user.
+    
+    Args:
+        user: User object
+        notification_ids: UUIDs of the notifications
+    
+    Returns:
+        Number of notifications marked as read
+    """
+    count = Notification.objects.filter(
+        id__in=notification_ids,
+        recipient=user,
+        is_read=False,
+        is_active=True
+    ).update(
+        is_read=True,
+        read_at=timezone.now()
+    )
+    _mark_read_in_summary(user.pk, notification_ids, count)
+    return count
+
+
 def get_unread_count(user):
     """
     Get count of unread notifications for a user.
@@ -221,15 +250,7 @@ def get_unread_count(user):
     Returns:
         Integer count of unread notifications
     """
-    try:
-        return Notification.objects.filter(
-            recipient=user,
-            is_read=False,
-            is_active=True
-        ).count()
-    except Exception as e:
-        logger.error(f"Error getting unread count: {e}")
-        return 0
+    return get_notification_summary(user)['unread']
 
 
 def get_recent_notifications(user, limit=10):
@@ -241,14 +262,12 @@ def get_recent_notifications(user, limit=10):
         limit: Maximum number of notifications to return
     
     Returns:
-        QuerySet of Notification objects
+        List of notification dicts (id, title, message, notification_type,
+        is_read, action_url, created_at, sender_name), newest first
     """
-    return Notification.objects.filter(
-        recipient=user,
-        is_active=True
-    ).select_related(
-        'sender', 'content_type'
-    ).order_by('-created_at')[:limit]
+    if limit <= SUMMARY_RECENT_LIMIT:
+        return get_notification_summary(user)['recent'][:limit]
+    return [_summary_item(n) for n in _recent_queryset(user.pk)[:limit]]
 
 
 def delete_notification(notification_id, user):
@@ -270,9 +289,144 @@ def delete_notification(notification_id, user):
         )
         notification.is_active = False
         notification.save(update_fields=['is_active', 'updated_at'])
+        _remove_from_summary(user.pk, notification)
         return True
     except Notification.DoesNotExist:
         return False
     except Exception as e:
         logger.error(f"Error deleting notification: {e}")
-        return False
\ No newline at end of file
+        return False
+
+
+# ============================================================================
+# NOTIFICATION SUMMARY CACHE
+# ============================================================================
+#
+# The header bell and dropdown on every page need the unread count and the
+# latest notifications. Rather than two queries per page, both live in one
+# cache entry per user that the functions above update in place when
+# notifications are created, read or deleted. A missing entry is rebuilt
+# from the database on the next read. Concurrent changes for the same user
+# can race on the read-modify-write; the entry expires after
+# SUMMARY_TIMEOUT seconds, which bounds any drift.
+
+def get_notification_summary(user):
+    """
+    Return ``{'unread': int, 'recent': [notification dicts]}`` for a user.
+    """
+    key = _summary_key(user.pk)
+    try:
+        summary = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Notification summary cache read failed: {e}")
+        return _build_summary(user.pk)
+
+    if summary is None:
+        summary = _build_summary(user.pk)
+        _store_summary(key, summary)
+    return summary
+
+
+def invalidate_notification_summary(*user_ids):
+    """Drop cached summaries so they are rebuilt on next read."""
+    try:
+        cache.delete_many([_summary_key(user_id) for user_id in user_ids])
+    except Exception as e:
+        logger.warning(f"Notification summary invalidation failed: {e}")
+
+
+def add_to_notification_summary(notification):
+    """Account for a newly created notification in its recipient's summary."""
+    item = _summary_item(notification)
+
+    def update(summary):
+        if not item['is_read']:
+            summary['unread'] += 1
+        summary['recent'] = [item] + summary['recent'][:SUMMARY_RECENT_LIMIT - 1]
+
+    _update_summary(notification.recipient_id, update)
+
+
+def _mark_read_in_summary(user_id, notification_ids, count):
+    """Mark ``notification_ids`` (None for all) read after ``count`` changed."""
+    if not count:
+        return
+    ids = None if notification_ids is None else {str(pk) for pk in notification_ids}
+
+    def update(summary):
+        summary['unread'] = max(0, summary['unread'] - count)
+        for item in summary['recent']:
+            if ids is None or item['id'] in ids:
+                item['is_read'] = True
+
+    _update_summary(user_id, update)
+
+
+def _remove_from_summary(user_id, notification):
+    item_id = str(notification.id)
+
+    def update(summary):
+        if not notification.is_read:
+            summary['unread'] = max(0, summary['unread'] - 1)
+        remaining = [item for item in summary['recent'] if item['id'] != item_id]
+        if len(remaining) < len(summary['recent']) and len(summary['recent']) == SUMMARY_RECENT_LIMIT:
+            # An older notification moves into the list; rebuild
+            return False
+        summary['recent'] = remaining
+
+    _update_summary(user_id, update)
+
+
+def _update_summary(user_id, update):
+    """Apply ``update(summary)`` to a cached summary; False drops the entry."""
+    key = _summary_key(user_id)
+    try:
+        summary = cache.get(key)
+        if summary is None:
+            return
+        if update(summary) is False:
+            cache.delete(key)
+        else:
+            cache.set(key, summary, SUMMARY_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"Notification summary update failed, dropping it: {e}")
+        invalidate_notification_summary(user_id)
+
+
+def _build_summary(user_id):
+    active = Notification.objects.filter(recipient_id=user_id, is_active=True)
+    return {
+        'unread': active.filter(is_read=False).count(),
+        'recent': [_summary_item(n) for n in _recent_queryset(user_id)[:SUMMARY_RECENT_LIMIT]],
+    }
+
+
+def _recent_queryset(user_id):
+    return Notification.objects.filter(
+        recipient_id=user_id,
+        is_active=True
+    ).select_related('sender').order_by('-created_at')
+
+
+def _summary_item(notification):
+    return {
+        'id': str(notification.id),
+        'title': notification.title,
+        'message': notification.message,
+        'notification_type': notification.notification_type,
+        'is_read': notification.is_read,
+        'action_url': notification.action_url,
+        'created_at': notification.created_at,
+        'sender_name': notification.sender.get_full_name if notification.sender_id else None,
+    }
+
+
+def _summary_key(user_id):
+    return f"notification_summary:{user_id}"
+
+
+def _store_summary(key, summary):
+    try:
+        cache.set(key, summary, SUMMARY_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"Notification summary cache write failed: {e}")
@@ -0,0 +1,405 @@
+"""
+Shared request rate limiting.
+
+Enrollment, card verification, workspace and error-page rate limits used to
+be four separate ``cache.get`` / ``cache.set`` implementations: two round
+trips to the database cache per request, and concurrent requests could
+read the same count and all be let through. They now share this module.
+
+Algorithm: sliding window counter. Each (limit name, client key) has one
+counter per fixed window. A request increments the current window's
+counter atomically and is allowed while
+
+    previous_window_count * (1 - elapsed_fraction) + current_window_count
+
+stays within the limit, which smooths the burst a fixed window allows at
+its boundary. A closed window's count never changes again, so it is read
+once per process and then remembered: in steady state a request costs a
+single atomic increment.
+
+Counter stores (``RATE_LIMIT['STORE']``, 'auto' picks from the cache backend):
+    redis    - INCRBY + EXPIRE in one pipelined round trip (Django's
+               built-in RedisCache or django-redis)
+    database - one INSERT ... ON CONFLICT DO UPDATE ... RETURNING on
+               RateLimitCounter (the database cache's incr is not atomic)
+    cache    - cache.incr / cache.add (atomic on locmem and memcached)
+
+If the store is unavailable, requests are allowed (fail open) and a
+warning is logged.
+
+Limits are declared at the call site and can be overridden per name with
+``RATE_LIMIT['LIMITS'] = {'card_verification': (20, 3600)}``. Hit and
+block counts are tallied per process and flushed to the store every
+STATS_FLUSH_SECONDS; ``get_rate_limit_stats()`` returns the totals.
+"""
+import hashlib
+import logging
+import math
+import random
+import threading
+import time
+from collections import Counter, namedtuple
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.db import DatabaseCache
+from django.core.cache.backends.redis import RedisCache
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.http import JsonResponse
+from django.utils import timezone
+
+from .models import RateLimitCounter
+
+logger = logging.getLogger(__name__)
+
+try:
+    from django_redis.cache import RedisCache as DjangoRedisCache
+except ImportError:  # django-redis is optional
+    DjangoRedisCache = None
+
+
+DEFAULT_RATE_LIMIT_SETTINGS = {
+    'ENABLED': True,
+    'CACHE': 'default',
+    'STORE': 'auto',
+    'LIMITS': {},
+    'STATS_FLUSH_SECONDS': 60,
+    'STATS_TIMEOUT': 30 * 24 * 3600,
+    'PURGE_PROBABILITY': 0.001,
+}
+
+RateLimitResult = namedtuple('RateLimitResult', ['allowed', 'limit', 'remaining', 'retry_after'])
+
+KEY_PREFIX = 'rl'
+
+# Counts of closed windows, which can no longer change
+_closed_windows = {}
+_CLOSED_WINDOWS_MAX = 10000
+
+_stats = Counter()
+_stats_names = set()
+_stats_lock = threading.Lock()
+_stats_flushed_at = time.monotonic()
+
+
+def get_rate_limit_setting(name):
+    """Read a RATE_LIMIT setting, falling back to the defaults above."""
+    return getattr(settings, 'RATE_LIMIT', {}).get(name, DEFAULT_RATE_LIMIT_SETTINGS[name])
+
+
+# ============================================================================
+# CLIENT KEYS
+# ============================================================================
+
+def get_client_ip(request):
+    """Client IP address, preferring the first X-Forwarded-For entry."""
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        return x_forwarded_for.split(',')[0].strip()
+    x_real_ip = request.META.get('HTTP_X_REAL_IP')
+    if x_real_ip:
+        return x_real_ip.strip()
+    return request.META.get('REMOTE_ADDR', 'unknown')
+
+
+def _user_key(request):
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f"user:{user.pk}"
+    return f"ip:{get_client_ip(request)}"
+
+
+def _user_ip_key(request):
+    user = getattr(request, 'user', None)
+    user_id = user.pk if user is not None and user.is_authenticated else 'anonymous'
+    return f"{user_id}:{get_client_ip(request)}"
+
+
+KEY_FUNCTIONS = {
+    'ip': get_client_ip,
+    'user': _user_key,          # user id when logged in, otherwise IP
+    'user_ip': _user_ip_key,    # user id and IP together
+}
+
+
+def get_client_key(request, key='ip'):
+    """
+    Identify the client for a limit.
+
+    Args:
+        key: 'ip', 'user', 'user_ip' or a callable taking the request, e.g.
+            ``lambda request: request.GET.get('token')``. A callable that
+            returns nothing falls back to the client IP.
+    """
+    value = key(request) if callable(key) else KEY_FUNCTIONS[key](request)
+    return str(value) if value else f"ip:{get_client_ip(request)}"
+
+
+# ============================================================================
+# CHECKING
+# ============================================================================
+
+def check_request_rate(request, name, max_requests, window_seconds, key='ip'):
+    """
+    Count one request against limit ``name`` and report whether it is allowed.
+
+    Returns:
+        RateLimitResult(allowed, limit, remaining, retry_after)
+    """
+    return count_hit(name, get_client_key(request, key), max_requests, window_seconds)
+
+
+def count_hit(name, identifier, max_requests, window_seconds):
+    """Count one hit by ``identifier`` against limit ``name``."""
+    max_requests, window_seconds = get_rate_limit_setting('LIMITS').get(name, (max_requests, window_seconds))
+    if not get_rate_limit_setting('ENABLED'):
+        return RateLimitResult(True, max_requests, max_requests, 0)
+
+    now = time.time()
+    window = int(now // window_seconds)
+    elapsed = (now % window_seconds) / window_seconds
+    # Client keys come from request data; hash them so any value is a valid key
+    digest = hashlib.sha256(identifier.encode()).hexdigest()[:32]
+    base_key = f"{KEY_PREFIX}:{name}:{window_seconds}:{digest}"
+
+    def count(store):
+        current = store.incr(f"{base_key}:{window}", 1, window_seconds * 2)
+        # Over the limit on the current window alone: no need for the previous one
+        previous = _closed_window_count(store, f"{base_key}:{window - 1}") if current <= max_requests else 0
+        return current, previous
+
+    try:
+        current, previous = with_counter_store(count)
+    except Exception as e:
+        logger.warning(f"Rate limit store unavailable, allowing request ({name}): {e}")
+        return RateLimitResult(True, max_requests, max_requests, 0)
+
+    estimate = previous * (1 - elapsed) + current
+    allowed = estimate <= max_requests
+
+    if allowed:
+        retry_after = 0
+    elif current > max_requests:
+        retry_after = math.ceil(window_seconds - now % window_seconds)
+    else:
+        # Wait until the previous window's weight has decayed enough
+        allowed_at = 1 - (max_requests - current) / previous
+        retry_after = max(1, math.ceil((allowed_at - elapsed) * window_seconds))
+
+    _record_stats(name, allowed)
+    return RateLimitResult(allowed, max_requests, max(0, int(max_requests - estimate)), retry_after)
+
+
+def _closed_window_count(store, key):
+    count = _closed_windows.get(key)
+    if count is None:
+        count = store.get(key)
+        if len(_closed_windows) >= _CLOSED_WINDOWS_MAX:
+            _closed_windows.clear()
+        _closed_windows[key] = count
+    return count
+
+
+# ============================================================================
+# DECORATOR
+# ============================================================================
+
+def rate_limit(name, max_requests=60, window_seconds=3600, key='ip', blocked_response=None):
+    """
+    Rate limit a view.
+
+    Args:
+        name: Limit name; also the key for RATE_LIMIT['LIMITS'] overrides
+        max_requests: Requests allowed per window
+        window_seconds: Window length
+        key: Client key, see ``get_client_key``
+        blocked_response: Optional callable(request, result) returning the
+            response for blocked requests (default: JSON 429)
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            result = check_request_rate(request, name, max_requests, window_seconds, key)
+            if not result.allowed:
+                logger.warning(f"Rate limit {name} exceeded by {get_client_key(request, key)}")
+                if blocked_response is not None:
+                    return blocked_response(request, result)
+                response = JsonResponse({
+                    'error': 'Rate limit exceeded. Please try again later.'
+                }, status=429)
+                response['Retry-After'] = str(result.retry_after)
+                return response
+            return view_func(request, *args, **kwargs)
+        return _wrapped_view
+    return decorator
+
+
+# ============================================================================
+# COUNTER STORES
+# ============================================================================
+
+def with_counter_store(func):
+    """
+    Call ``func(store)`` with the counter store of the configured cache.
+
+    With a FallbackCache the call goes through its failover, so a Redis
+    outage switches counting to the fallback cache like any other cache call.
+    """
+    cache = caches[get_rate_limit_setting('CACHE')]
+    if hasattr(cache, 'run'):
+        return cache.run(lambda backend: func(get_counter_store(backend)))
+    return func(get_counter_store(cache))
+
+
+def get_counter_store(cache):
+    """Return the counter store for a (concrete) cache backend."""
+    store = get_rate_limit_setting('STORE')
+    if store == 'auto':
+        if isinstance(cache, RedisCache) or (DjangoRedisCache and isinstance(cache, DjangoRedisCache)):
+            store = 'redis'
+        elif isinstance(cache, DatabaseCache):
+            store = 'database'
+        else:
+            store = 'cache'
+
+    if store == 'redis':
+        return RedisCounterStore(cache)
+    if store == 'database':
+        return DatabaseCounterStore()
+    return CacheCounterStore(cache)
+
+
+class CacheCounterStore:
+    """Counters in a cache whose incr is atomic (locmem, memcached)."""
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def incr(self, key, amount, timeout):
+        try:
+            return self.cache.incr(key, amount)
+        except ValueError:
+            if self.cache.add(key, amount, timeout):
+                return amount
+            return self.cache.incr(key, amount)
+
+    def get(self, key):
+        return self.cache.get(key) or 0
+
+
+class RedisCounterStore(CacheCounterStore):
+    """Counters in Redis: INCRBY and EXPIRE in one pipeline."""
+
+    def incr(self, key, amount, timeout):
+        full_key = self.cache.make_and_validate_key(key)
+        if DjangoRedisCache and isinstance(self.cache, DjangoRedisCache):
+            client = self.cache.client.get_client(write=True)
+        else:
+            client = self.cache._cache.get_client(full_key, write=True)
+        pipeline = client.pipeline()
+        pipeline.incrby(full_key, amount)
+        pipeline.expire(full_key, timeout)
+        count, _ = pipeline.execute()
+        return count
+
+
+class DatabaseCounterStore:
+    """Counters in the RateLimitCounter table, one upsert per hit."""
+
+    def incr(self, key, amount, timeout):
+        expires_at = timezone.now() + timedelta(seconds=timeout)
+
+        if connection.vendor in ('postgresql', 'sqlite'):
+            quote = connection.ops.quote_name
+            table = quote(RateLimitCounter._meta.db_table)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {table} ({quote('key')}, {quote('count')}, {quote('expires_at')}) "
+                    f"VALUES (%s, %s, %s) "
+                    f"ON CONFLICT ({quote('key')}) DO UPDATE "
+                    f"SET {quote('count')} = {table}.{quote('count')} + EXCLUDED.{quote('count')} "
+                    f"RETURNING {quote('count')}",
+                    [key, amount, connection.ops.adapt_datetimefield_value(expires_at)],
+                )
+                count = cursor.fetchone()[0]
+        else:
+            count = self._incr_portable(key, amount, expires_at)
+
+        if random.random() < get_rate_limit_setting('PURGE_PROBABILITY'):
+            self.purge_expired()
+        return count
+
+    def _incr_portable(self, key, amount, expires_at):
+        with transaction.atomic():
+            if not RateLimitCounter.objects.filter(key=key).update(count=F('count') + amount):
+                try:
+                    with transaction.atomic():
+                        RateLimitCounter.objects.create(key=key, count=amount, expires_at=expires_at)
+                        return amount
+                except IntegrityError:
+                    RateLimitCounter.objects.filter(key=key).update(count=F('count') + amount)
+            return RateLimitCounter.objects.values_list('count', flat=True).get(key=key)
+
+    def get(self, key):
+        return RateLimitCounter.objects.filter(key=key).values_list('count', flat=True).first() or 0
+
+    def purge_expired(self):
+        deleted, _ = RateLimitCounter.objects.filter(expires_at__lt=timezone.now()).delete()
+        return deleted
+
+
+# ============================================================================
+# STATISTICS
+# ============================================================================
+
+def _record_stats(name, allowed):
+    global _stats_flushed_at
+    with _stats_lock:
+        _stats_names.add(name)
+        _stats[(name, 'hits')] += 1
+        if not allowed:
+            _stats[(name, 'blocked')] += 1
+        due = time.monotonic() - _stats_flushed_at >= get_rate_limit_setting('STATS_FLUSH_SECONDS')
+        if due:
+            _stats_flushed_at = time.monotonic()
+    if due:
+        flush_rate_limit_stats()
+
+
+def flush_rate_limit_stats():
+    """Add this process's hit/block tallies to the shared store."""
+    with _stats_lock:
+        pending = dict(_stats)
+        _stats.clear()
+    if not pending:
+        return
+
+    def add_counts(store):
+        for (name, kind), count in pending.items():
+            store.incr(f"{KEY_PREFIX}:stats:{name}:{kind}", count, get_rate_limit_setting('STATS_TIMEOUT'))
+
+    try:
+        with_counter_store(add_counts)
+    except Exception as e:
+        logger.warning(f"Could not flush rate limit statistics: {e}")
+        with _stats_lock:
+            _stats.update(pending)
+
+
+def get_rate_limit_stats():
+    """
+    Return ``{name: {'hits': n, 'blocked': n}}`` for every limit known to
+    this process (used here or listed in RATE_LIMIT['LIMITS']).
+    """
+    flush_rate_limit_stats()
+    names = sorted(_stats_names | set(get_rate_limit_setting('LIMITS')))
+    return with_counter_store(lambda store: {
+        name: {
+            kind: store.get(f"{KEY_PREFIX}:stats:{name}:{kind}")
+            for kind in ('hits', 'blocked')
+        }
+        for name in names
+    })
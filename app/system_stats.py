@@ -0,0 +1,333 @@
+"""
+Materialized cross-app statistics for the staff dashboard.
+
+The dashboard used to load every Associated, Designated and Student
+application into a Python list just to count statuses, then run separate
+COUNT queries over the card table. The counts now live in ``SystemStat``
+rows and the dashboard reads them all with one query. The CPD approval
+queue reads its pending and urgent counts from the same rows.
+
+Metric keys:
+    applications.total
+    applications.status.<status>
+    applications.type.<associated|designated|student>
+    applications.council.<council code>
+    cards.total
+    cards.status.<status>
+    cards.council.<council code>
+    cards.type.<affiliation type>
+    cpd_approvals.<status>.<priority>
+
+Counters are kept current by the signal handlers below (connected in
+``AppConfig.ready``): pre_save / pre_delete record which metrics the stored
+row counted towards, post_save / post_delete apply the difference once the
+transaction commits. Changes that bypass signals - ``QuerySet.update()``,
+``bulk_create()``, raw SQL - and deltas lost to a crash between commit and
+the on-commit hook are corrected by ``reconcile_system_stats``, which
+rebuilds every counter from grouped aggregates. Run it from cron (e.g.
+nightly) and after data imports.
+"""
+import logging
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.utils import timezone
+
+from affiliationcard.models import AffiliationCard
+from cpd.models import CPDApproval
+from enrollments.models import AssociatedApplication, DesignatedApplication, StudentApplication
+
+from .models import SystemStat
+
+logger = logging.getLogger(__name__)
+
+
+APPLICATION_TYPES = {
+    AssociatedApplication: 'associated',
+    DesignatedApplication: 'designated',
+    StudentApplication: 'student',
+}
+
+APPLICATION_COUNCIL_FIELD = 'onboarding_session__selected_council__code'
+
+# Card fields that decide which counters a card contributes to
+CARD_STAT_FIELDS = ('status', 'council_code', 'affiliation_type')
+
+# CPD approval fields that decide which queue counter an approval counts towards
+APPROVAL_STAT_FIELDS = ('status', 'priority')
+
+STAT_PREFIXES = ('applications.', 'cards.', 'cpd_approvals.')
+
+
+# ============================================================================
+# METRIC KEYS
+# ============================================================================
+
+def application_keys(application_type, status, council_code):
+    """Metric keys one application row contributes to."""
+    keys = {'applications.total', f'applications.status.{status}', f'applications.type.{application_type}'}
+    if council_code:
+        keys.add(f'applications.council.{council_code}')
+    return keys
+
+
+def card_keys(status, council_code, affiliation_type):
+    """Metric keys one card row contributes to."""
+    keys = {'cards.total', f'cards.status.{status}'}
+    if council_code:
+        keys.add(f'cards.council.{council_code}')
+    if affiliation_type:
+        keys.add(f'cards.type.{affiliation_type}')
+    return keys
+
+
+def approval_keys(status, priority):
+    """Metric keys one CPD approval row contributes to."""
+    return {f'cpd_approvals.{status}.{priority}'}
+
+
+def _stored_application_keys(model, pk):
+    row = model.objects.filter(pk=pk).values('status', APPLICATION_COUNCIL_FIELD).first()
+    if row is None:
+        return set()
+    return application_keys(APPLICATION_TYPES[model], row['status'], row[APPLICATION_COUNCIL_FIELD])
+
+
+def _stored_card_keys(pk):
+    row = AffiliationCard.objects.filter(pk=pk).values(*CARD_STAT_FIELDS).first()
+    if row is None:
+        return set()
+    return card_keys(*(row[field] for field in CARD_STAT_FIELDS))
+
+
+def _stored_approval_keys(pk):
+    row = CPDApproval.objects.filter(pk=pk).values(*APPROVAL_STAT_FIELDS).first()
+    if row is None:
+        return set()
+    return approval_keys(*(row[field] for field in APPROVAL_STAT_FIELDS))
+
+
+# ============================================================================
+# READING
+# ============================================================================
+
+def get_system_stats():
+    """
+    Return all counters as a Counter of ``{key: value}`` (missing keys read 0).
+
+    Counters are rebuilt on first use, i.e. before any reconcile has run.
+    """
+    stats = Counter(dict(SystemStat.objects.values_list('key', 'value')))
+    if not stats:
+        stats = reconcile_system_stats()
+    return stats
+
+
+# ============================================================================
+# INCREMENTAL UPDATES
+# ============================================================================
+
+def apply_deltas(deltas):
+    """
+    Add ``{key: delta}`` to the stored counters, creating missing rows.
+
+    Rows are updated in key order so concurrent writers lock them in the
+    same order and cannot deadlock.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    now = timezone.now()
+    with transaction.atomic():
+        for key in sorted(deltas):
+            updated = SystemStat.objects.filter(key=key).update(value=F('value') + deltas[key], updated_at=now)
+            if not updated:
+                _create_stat(key)
+                SystemStat.objects.filter(key=key).update(value=F('value') + deltas[key], updated_at=now)
+
+
+def _create_stat(key):
+    try:
+        with transaction.atomic():
+            SystemStat.objects.create(key=key)
+    except IntegrityError:
+        # Another writer created it first; its row is used instead
+        pass
+
+
+def _schedule_deltas(old_keys, new_keys):
+    deltas = Counter()
+    for key in old_keys - new_keys:
+        deltas[key] -= 1
+    for key in new_keys - old_keys:
+        deltas[key] += 1
+    schedule_stat_deltas(deltas)
+
+
+def schedule_stat_deltas(deltas):
+    """
+    Apply ``{key: delta}`` once the surrounding transaction commits. For bulk
+    writers that bypass the signal handlers.
+    """
+    deltas = Counter({key: delta for key, delta in deltas.items() if delta})
+    if deltas:
+        # Applied after commit: rolled-back saves never count, and the hot
+        # total rows are locked only briefly instead of for the whole
+        # surrounding transaction
+        transaction.on_commit(lambda: _apply_deltas_safely(deltas))
+
+
+def _apply_deltas_safely(deltas):
+    try:
+        apply_deltas(deltas)
+    except Exception as e:
+        logger.error(f"Could not update system statistics {dict(deltas)}: {e}")
+
+
+# ============================================================================
+# SIGNAL HANDLERS
+# ============================================================================
+
+def _application_pre_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    instance._system_stat_keys = _stored_application_keys(sender, instance.pk) if instance.pk else set()
+
+
+def _application_post_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    old_keys = getattr(instance, '_system_stat_keys', set())
+    _schedule_deltas(old_keys, _stored_application_keys(sender, instance.pk))
+    instance._system_stat_keys = set()
+
+
+def _application_pre_delete(sender, instance, **kwargs):
+    instance._system_stat_keys = _stored_application_keys(sender, instance.pk)
+
+
+def _application_post_delete(sender, instance, **kwargs):
+    _schedule_deltas(getattr(instance, '_system_stat_keys', set()), set())
+
+
+def _card_pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not set(update_fields) & set(CARD_STAT_FIELDS)):
+        # Counter-only saves (verifications, downloads) cannot change any stat
+        instance._system_stat_keys = None
+        return
+    instance._system_stat_keys = _stored_card_keys(instance.pk) if instance.pk else set()
+
+
+def _card_post_save(sender, instance, raw=False, **kwargs):
+    old_keys = getattr(instance, '_system_stat_keys', None)
+    if raw or old_keys is None:
+        return
+    new_keys = card_keys(*(getattr(instance, field) for field in CARD_STAT_FIELDS))
+    _schedule_deltas(old_keys, new_keys)
+    instance._system_stat_keys = None
+
+
+def _card_pre_delete(sender, instance, **kwargs):
+    instance._system_stat_keys = _stored_card_keys(instance.pk)
+
+
+def _card_post_delete(sender, instance, **kwargs):
+    _schedule_deltas(getattr(instance, '_system_stat_keys', None) or set(), set())
+
+
+def _approval_pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not set(update_fields) & set(APPROVAL_STAT_FIELDS)):
+        instance._system_stat_keys = None
+        return
+    instance._system_stat_keys = _stored_approval_keys(instance.pk) if instance.pk else set()
+
+
+def _approval_post_save(sender, instance, raw=False, **kwargs):
+    old_keys = getattr(instance, '_system_stat_keys', None)
+    if raw or old_keys is None:
+        return
+    new_keys = approval_keys(*(getattr(instance, field) for field in APPROVAL_STAT_FIELDS))
+    _schedule_deltas(old_keys, new_keys)
+    instance._system_stat_keys = None
+
+
+def _approval_pre_delete(sender, instance, **kwargs):
+    instance._system_stat_keys = _stored_approval_keys(instance.pk)
+
+
+def _approval_post_delete(sender, instance, **kwargs):
+    _schedule_deltas(getattr(instance, '_system_stat_keys', None) or set(), set())
+
+
+def connect_signals():
+    """Connect the counter maintenance handlers; called from AppConfig.ready."""
+    for model in APPLICATION_TYPES:
+        pre_save.connect(_application_pre_save, sender=model, dispatch_uid=f'system_stats_pre_save_{model.__name__}')
+        post_save.connect(_application_post_save, sender=model, dispatch_uid=f'system_stats_post_save_{model.__name__}')
+        pre_delete.connect(_application_pre_delete, sender=model, dispatch_uid=f'system_stats_pre_delete_{model.__name__}')
+        post_delete.connect(_application_post_delete, sender=model, dispatch_uid=f'system_stats_post_delete_{model.__name__}')
+
+    pre_save.connect(_card_pre_save, sender=AffiliationCard, dispatch_uid='system_stats_pre_save_card')
+    post_save.connect(_card_post_save, sender=AffiliationCard, dispatch_uid='system_stats_post_save_card')
+    pre_delete.connect(_card_pre_delete, sender=AffiliationCard, dispatch_uid='system_stats_pre_delete_card')
+    post_delete.connect(_card_post_delete, sender=AffiliationCard, dispatch_uid='system_stats_post_delete_card')
+
+    pre_save.connect(_approval_pre_save, sender=CPDApproval, dispatch_uid='system_stats_pre_save_cpd_approval')
+    post_save.connect(_approval_post_save, sender=CPDApproval, dispatch_uid='system_stats_post_save_cpd_approval')
+    pre_delete.connect(_approval_pre_delete, sender=CPDApproval, dispatch_uid='system_stats_pre_delete_cpd_approval')
+    post_delete.connect(_approval_post_delete, sender=CPDApproval, dispatch_uid='system_stats_post_delete_cpd_approval')
+
+
+# ============================================================================
+# RECONCILIATION
+# ============================================================================
+
+def compute_system_stats():
+    """Compute every counter from the source tables with grouped aggregates."""
+    stats = Counter({'applications.total': 0, 'cards.total': 0})
+
+    for model, application_type in APPLICATION_TYPES.items():
+        for row in model.objects.order_by().values('status', APPLICATION_COUNCIL_FIELD).annotate(n=Count('pk')):
+            for key in application_keys(application_type, row['status'], row[APPLICATION_COUNCIL_FIELD]):
+                stats[key] += row['n']
+
+    for row in AffiliationCard.objects.order_by().values(*CARD_STAT_FIELDS).annotate(n=Count('pk')):
+        for key in card_keys(*(row[field] for field in CARD_STAT_FIELDS)):
+            stats[key] += row['n']
+
+    for row in CPDApproval.objects.order_by().values(*APPROVAL_STAT_FIELDS).annotate(n=Count('pk')):
+        for key in approval_keys(*(row[field] for field in APPROVAL_STAT_FIELDS)):
+            stats[key] += row['n']
+
+    return stats
+
+
+def reconcile_system_stats():
+    """
+    Rebuild all counters from the source tables.
+
+    Returns:
+        Counter of the rebuilt values
+    """
+    stats = compute_system_stats()
+    now = timezone.now()
+
+    with transaction.atomic():
+        stale = Q()
+        for prefix in STAT_PREFIXES:
+            stale |= Q(key__startswith=prefix)
+        SystemStat.objects.filter(stale).exclude(key__in=list(stats)).delete()
+
+        existing = set(SystemStat.objects.filter(key__in=list(stats)).values_list('key', flat=True))
+        SystemStat.objects.bulk_create(
+            [SystemStat(key=key, value=value) for key, value in stats.items() if key not in existing],
+            ignore_conflicts=True,
+        )
+        for key in existing:
+            SystemStat.objects.filter(key=key).exclude(value=stats[key]).update(value=stats[key], updated_at=now)
+
+    logger.info(f"Reconciled {len(stats)} system statistics")
+    return stats
@@ -0,0 +1,100 @@
+"""
+Two-tier cache for hot reference data.
+
+Councils, affiliation types and the card system settings are read on most
+enrollment and card pages but change a few times a year. Reading them from
+the shared cache still costs a network (or database cache) round trip, so
+they are also kept in a small per-process LRU in front of it:
+
+    L1  per-process LRU, LOCAL_TIMEOUT seconds (no round trip)
+    L2  the default cache (Redis in production), SHARED_TIMEOUT seconds
+    -   the loader (database)
+
+``invalidate_cached`` clears L2 and this process's L1 and is called when
+the underlying rows are saved or deleted. Other processes keep their L1
+copy until LOCAL_TIMEOUT elapses, so only use this for data where that
+much staleness is acceptable. Values are shared by every request in the
+process: treat them as read-only and load a fresh row to edit.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_TIERED_CACHE_SETTINGS = {
+    'ENABLED': True,
+    'LOCAL_TIMEOUT': 60,
+    'LOCAL_MAX_ENTRIES': 256,
+    'SHARED_TIMEOUT': 3600,
+}
+
+KEY_PREFIX = 'tiered'
+
+_local = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def get_tiered_cache_setting(name):
+    """Read a TIERED_CACHE setting, falling back to the defaults above."""
+    return getattr(settings, 'TIERED_CACHE', {}).get(name, DEFAULT_TIERED_CACHE_SETTINGS[name])
+
+
+def get_cached(key, loader):
+    """
+    Return the value for ``key`` from L1, then L2, then ``loader()``.
+
+    Args:
+        key: Short name, e.g. 'enrollments:active_councils'
+        loader: Callable producing the value (must be picklable)
+    """
+    if not get_tiered_cache_setting('ENABLED'):
+        return loader()
+
+    now = time.monotonic()
+    with _local_lock:
+        entry = _local.get(key)
+        if entry is not None and entry[0] > now:
+            _local.move_to_end(key)
+            return entry[1]
+
+    shared_key = f"{KEY_PREFIX}:{key}"
+    try:
+        value = cache.get(shared_key)
+    except Exception as e:
+        logger.warning(f"Shared cache read failed for {key}: {e}")
+        value = None
+
+    if value is None:
+        value = loader()
+        try:
+            cache.set(shared_key, value, get_tiered_cache_setting('SHARED_TIMEOUT'))
+        except Exception as e:
+            logger.warning(f"Shared cache write failed for {key}: {e}")
+
+    _set_local(key, value, now + get_tiered_cache_setting('LOCAL_TIMEOUT'))
+    return value
+
+
+def _set_local(key, value, expires_at):
+    with _local_lock:
+        _local[key] = (expires_at, value)
+        _local.move_to_end(key)
+        while len(_local) > get_tiered_cache_setting('LOCAL_MAX_ENTRIES'):
+            _local.popitem(last=False)
+
+
+def invalidate_cached(*keys):
+    """Drop ``keys`` from the shared cache and this process's local cache."""
+    with _local_lock:
+        for key in keys:
+            _local.pop(key, None)
+    try:
+        cache.delete_many([f"{KEY_PREFIX}:{key}" for key in keys])
+    except Exception as e:
+        logger.warning(f"Shared cache invalidation failed for {keys}: {e}")
@@ -125,6 +125,10 @@ urlpatterns = [
     path('notifications/mark-all-read/', views.notification_mark_all_read, name='notification_mark_all_read'),
     path('notifications/<uuid:pk>/delete/', views.notification_delete, name='notification_delete'),
     path('notifications/fetch/', views.notification_fetch, name='notification_fetch'),
+
+    # Background export jobs
+    path('exports/<uuid:pk>/', views.export_job_detail, name='export_job_detail'),
+    path('exports/<uuid:pk>/download/', views.export_job_download, name='export_job_download'),
 ]
 
 
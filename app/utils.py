@@ -7,6 +7,7 @@ from decimal import Decimal
 
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.contenttypes.prefetch import GenericPrefetch
 from django.core.cache import cache
 from django.core.mail import send_mail, EmailMultiAlternatives
 from django.conf import settings
@@ -20,6 +21,8 @@ from .models import (
     ActivityLog, Notification, Projects, Task, Comment, TimeEntry,
     WorkspacePermission, Tag, ProjectMembership
 )
+from .notification_fanout import fan_out_notifications
+from .notification_utils import add_to_notification_summary
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -81,7 +84,7 @@ def log_activity(user: User, action_type: str, content_object: Any,
         )
         
         # Update cache for activity feeds
-        _invalidate_activity_cache(user, related_project)
+        _invalidate_activity_cache(user, related_project, action_type)
         
         return activity
         
@@ -103,17 +106,98 @@ def get_client_ip(request) -> str:
     return ip
 
 
-def _invalidate_activity_cache(user: User, project: 'Projects' = None):
-    """Invalidate relevant activity feed caches."""
-    cache_keys = [
-        f"activity_feed_user_{user.id}",
-        "activity_feed_global",
-    ]
-    
+# Activity feeds are cached per scope ('user_<id>' or 'project_<id>') and
+# per (days, limit). Rather than deleting every variant of a feed key, each
+# cached feed is stamped with the version counters of the scopes it was
+# built from; logging an activity bumps the counters, which makes every
+# variant that depended on them stale at once.
+ACTIVITY_FEED_TIMEOUT = 300
+ACTIVITY_FEED_BROADCAST_ACTIONS = ('create', 'complete', 'approve')  # Always shown in user feeds
+
+ACTIVITY_ACTION_SCORES = {
+    'create': 3.0,
+    'complete': 5.0,
+    'approve': 4.0,
+    'assign': 4.0,
+    'comment': 2.0,
+    'update': 1.0,
+    'delete': 2.0,
+}
+
+
+def _activity_version_key(scope: str) -> str:
+    return f"activity_feed_version_{scope}"
+
+
+def _get_activity_versions(scopes: List[str]) -> Dict[str, int]:
+    """
+    Current version of each feed scope. Missing counters are seeded from the
+    clock so a counter lost to eviction never matches a feed stamped before.
+    """
+    keys = {_activity_version_key(scope): scope for scope in scopes}
+    try:
+        found = cache.get_many(list(keys))
+    except Exception as e:
+        logger.warning(f"Failed to read activity feed versions: {e}")
+        return {}
+
+    versions = {}
+    for key, scope in keys.items():
+        version = found.get(key)
+        if version is None:
+            version = int(timezone.now().timestamp() * 1000)
+            if not cache.add(key, version, None):
+                version = cache.get(key, version)
+        versions[scope] = version
+    return versions
+
+
+def _invalidate_activity_cache(user: User, project: 'Projects' = None,
+                               action_type: str = None):
+    """Invalidate activity feeds that may include a new activity."""
+    scopes = [f"user_{user.id}"]
     if project:
-        cache_keys.append(f"activity_feed_project_{project.id}")
-    
-    cache.delete_many(cache_keys)
+        scopes.append(f"project_{project.id}")
+    if action_type in ACTIVITY_FEED_BROADCAST_ACTIONS:
+        scopes.append("global")
+
+    for scope in scopes:
+        key = _activity_version_key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Not seeded yet: no cached feed can depend on it
+            pass
+        except Exception as e:
+            logger.warning(f"Failed to invalidate activity feed {scope}: {e}")
+
+
+def _build_relevance_context(user: User) -> Dict[str, Any]:
+    """
+    Load everything relevance scoring needs to know about the user in two
+    queries, instead of per-activity membership lookups.
+    """
+    member_project_ids = set(
+        ProjectMembership.objects.filter(user=user).values_list('project_id', flat=True)
+    )
+
+    managed_project_ids = set()
+    active_project_ids = set()
+    for project_id, manager_id, is_active in Projects.objects.filter(
+        Q(manager=user) | Q(id__in=member_project_ids)
+    ).values_list('id', 'manager_id', 'is_active'):
+        if manager_id == user.id:
+            managed_project_ids.add(project_id)
+        if is_active:
+            active_project_ids.add(project_id)
+
+    return {
+        'user_id': user.id,
+        'member_project_ids': member_project_ids,
+        'managed_project_ids': managed_project_ids,
+        'active_project_ids': active_project_ids,
+        'now': timezone.now(),
+    }
 
 
 def generate_activity_feed(user: User, project: 'Projects' = None, 
@@ -131,15 +215,23 @@ def generate_activity_feed(user: User, project: 'Projects' = None,
     Returns:
         List of activity dictionaries with metadata
     """
-    cache_key = f"activity_feed_{'project_' + str(project.id) if project else 'user_' + str(user.id)}_{days}_{limit}"
+    scope = f"project_{project.id}" if project else f"user_{user.id}"
+    cache_key = f"activity_feed_{scope}_{days}_{limit}"
     cached_feed = cache.get(cache_key)
     
     if cached_feed is not None:
-        return cached_feed
+        stamped = cached_feed['versions']
+        if stamped and _get_activity_versions(list(stamped)) == stamped:
+            return cached_feed['items']
     
-    # Base queryset
+    context = _build_relevance_context(user)
+    
+    # Base queryset. Generic targets are prefetched with one query per
+    # content type rather than one per activity.
     activities = ActivityLog.objects.select_related(
         'user', 'content_type', 'related_project', 'related_task'
+    ).prefetch_related(
+        GenericPrefetch('content_object', [Task.objects.select_related('project')])
     ).filter(
         timestamp__gte=timezone.now() - timedelta(days=days)
     )
@@ -148,30 +240,38 @@ def generate_activity_feed(user: User, project: 'Projects' = None,
     if project:
         # Project-specific feed
         activities = activities.filter(related_project=project)
+        scopes = [scope]
     else:
         # User's personalized feed
-        user_projects = Projects.objects.filter(
-            Q(manager=user) | Q(team_members=user),
-            is_active=True
-        ).values_list('id', flat=True)
-        
+        user_projects = context['active_project_ids']
         activities = activities.filter(
             Q(related_project__id__in=user_projects) |
             Q(user=user) |
-            Q(action_type__in=['create', 'complete', 'approve'])  # Always show important actions
+            Q(action_type__in=ACTIVITY_FEED_BROADCAST_ACTIONS)  # Always show important actions
         )
+        scopes = [scope, "global"] + [f"project_{project_id}" for project_id in user_projects]
+    
+    # Read versions before the query so activities logged meanwhile
+    # invalidate the feed being built
+    versions = _get_activity_versions(scopes)
     
     # Fetch and enhance activities
     feed_items = []
+    avatar_urls = {}
     for activity in activities.order_by('-timestamp')[:limit]:
         try:
+            actor = activity.user
+            if actor.id not in avatar_urls:
+                avatar_urls[actor.id] = get_user_avatar_url(actor)
+            
+            content_object = activity.content_object
             item = {
                 'id': activity.id,
                 'user': {
-                    'id': activity.user.id,
-                    'name': activity.user.get_full_name(),
-                    'username': activity.user.username,
-                    'avatar_url': get_user_avatar_url(activity.user),
+                    'id': actor.id,
+                    'name': actor.get_full_name,
+                    'username': actor.username,
+                    'avatar_url': avatar_urls[actor.id],
                 },
                 'action_type': activity.action_type,
                 'description': activity.description,
@@ -179,18 +279,17 @@ def generate_activity_feed(user: User, project: 'Projects' = None,
                 'content_type': activity.content_type.model,
                 'object_id': activity.object_id,
                 'extra_data': activity.extra_data,
-                'relevance_score': _calculate_relevance_score(activity, user),
+                'relevance_score': _calculate_relevance_score(activity, content_object, context),
             }
             
             # Add object details if still exists
             try:
-                content_object = activity.content_object
                 if content_object:
                     item['object'] = {
                         'title': str(content_object),
                         'url': getattr(content_object, 'get_absolute_url', lambda: '#')(),
                     }
-            except:
+            except Exception:
                 item['object'] = {'title': 'Deleted object', 'url': '#'}
             
             # Add project context
@@ -211,41 +310,41 @@ def generate_activity_feed(user: User, project: 'Projects' = None,
     # Sort by relevance and timestamp
     feed_items.sort(key=lambda x: (x['relevance_score'], x['timestamp']), reverse=True)
     
-    # Cache for 5 minutes
-    cache.set(cache_key, feed_items, 300)
+    # Cache for 5 minutes, stamped with the versions it was built from
+    if versions:
+        cache.set(cache_key, {'versions': versions, 'items': feed_items}, ACTIVITY_FEED_TIMEOUT)
     
     return feed_items
 
 
-def _calculate_relevance_score(activity: ActivityLog, user: User) -> float:
+def _calculate_relevance_score(activity: ActivityLog, content_object: Any,
+                               context: Dict[str, Any]) -> float:
     """
     Calculate relevance score for activity based on user relationship
     and action importance.
+    
+    Args:
+        activity: Activity being scored
+        content_object: The activity's (prefetched) target, or None
+        context: Result of _build_relevance_context for the viewing user
     """
     score = 0.0
+    user_id = context['user_id']
     
     # Base score by action type
-    action_scores = {
-        'create': 3.0,
-        'complete': 5.0,
-        'approve': 4.0,
-        'assign': 4.0,
-        'comment': 2.0,
-        'update': 1.0,
-        'delete': 2.0,
-    }
-    score += action_scores.get(activity.action_type, 1.0)
+    score += ACTIVITY_ACTION_SCORES.get(activity.action_type, 1.0)
     
     # User relationship bonus
-    if activity.user == user:
+    project_id = activity.related_project_id
+    if activity.user_id == user_id:
         score += 2.0  # Own actions
-    elif activity.related_project and user in activity.related_project.team_members.all():
+    elif project_id and project_id in context['member_project_ids']:
         score += 1.5  # Team member actions
-    elif activity.related_project and activity.related_project.manager == user:
+    elif project_id and project_id in context['managed_project_ids']:
         score += 1.8  # Actions in managed projects
     
     # Recency bonus (higher score for recent activities)
-    hours_ago = (timezone.now() - activity.timestamp).total_seconds() / 3600
+    hours_ago = (context['now'] - activity.timestamp).total_seconds() / 3600
     if hours_ago < 1:
         score += 2.0
     elif hours_ago < 6:
@@ -254,14 +353,10 @@ def _calculate_relevance_score(activity: ActivityLog, user: User) -> float:
         score += 0.5
     
     # Action target bonus
-    try:
-        content_object = activity.content_object
-        if isinstance(content_object, Task) and content_object.assigned_to == user:
-            score += 3.0  # Actions on user's tasks
-        elif isinstance(content_object, Projects) and content_object.manager == user:
-            score += 2.0  # Actions on user's projects
-    except:
-        pass
+    if isinstance(content_object, Task) and content_object.assigned_to_id == user_id:
+        score += 3.0  # Actions on user's tasks
+    elif isinstance(content_object, Projects) and content_object.manager_id == user_id:
+        score += 2.0  # Actions on user's projects
     
     return score
 
@@ -317,8 +412,8 @@ def send_notification(recipient: User, notification_type: str, title: str,
         if not scheduled_for or scheduled_for <= timezone.now():
             _deliver_notification(notification)
         
-        # Invalidate notification cache
-        cache.delete(f"unread_notifications_{recipient.id}")
+        # Update the recipient's cached notification summary
+        add_to_notification_summary(notification)
         
         return notification
         
@@ -429,17 +524,31 @@ def batch_send_notifications(notifications: List[Dict], delay_minutes: int = 0):
     """
     Send multiple notifications efficiently with optional batching delay.
     Useful for bulk operations and digest emails.
+    
+    Notifications that differ only in their recipient are fanned out together
+    (see ``app.notification_fanout``), with preferences checked in bulk.
     """
     scheduled_time = timezone.now() + timedelta(minutes=delay_minutes) if delay_minutes > 0 else None
     
-    created_notifications = []
+    # Group identical notifications so each group is one fan-out
+    groups = []
     for notif_data in notifications:
-        notification = send_notification(
+        fields = {key: value for key, value in notif_data.items() if key != 'recipient'}
+        for group_fields, recipients in groups:
+            if group_fields == fields:
+                recipients.append(notif_data['recipient'])
+                break
+        else:
+            groups.append((fields, [notif_data['recipient']]))
+    
+    created_notifications = []
+    for fields, recipients in groups:
+        created_notifications.extend(fan_out_notifications(
+            recipients,
             scheduled_for=scheduled_time,
-            **notif_data
-        )
-        if notification:
-            created_notifications.append(notification)
+            apply_preferences=True,
+            **fields
+        ))
     
     return created_notifications
 
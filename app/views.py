@@ -7,11 +7,11 @@ from django.db.models import (
     Count, Sum, Q, Avg, F, Prefetch, Case, When, 
     IntegerField, DecimalField, DateField
 )
-from django.db.models.functions import Round
+from django.db.models.functions import Coalesce, Round
 from django import forms
 from django.http import (
     HttpResponseForbidden, JsonResponse, HttpResponse, 
-    HttpResponseBadRequest, Http404
+    HttpResponseBadRequest, Http404, FileResponse
 )
 from django.utils import timezone
 from datetime import timedelta
@@ -45,11 +45,15 @@ from .utils import (
 from django.views.decorators.http import require_http_methods
 from .notification_utils import (
     get_unread_count,
+    get_notification_summary,
     mark_notification_read, 
     mark_all_read, 
+    mark_selected_read,
     delete_notification,
-    get_recent_notifications
 )
+from .error_pipeline import record_error
+from .ratelimit import check_request_rate, rate_limit
+from .system_stats import get_system_stats
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -91,33 +95,6 @@ def permission_required_or_owner(permission, model_class, pk_field='pk'):
     return decorator
 
 
-def rate_limit(key_prefix, max_requests=60, window_seconds=3600):
-    """
-    Simple rate limiting decorator using Django cache.
-    Prevents abuse of API endpoints and resource-intensive operations.
-    """
-    def decorator(view_func):
-        def _wrapped_view(request, *args, **kwargs):
-            # Create unique key for this user/IP
-            user_id = request.user.id if request.user.is_authenticated else 'anonymous'
-            ip = request.META.get('REMOTE_ADDR', 'unknown')
-            cache_key = f"rate_limit:{key_prefix}:{user_id}:{ip}"
-            
-            # Get current request count
-            current_requests = cache.get(cache_key, 0)
-            
-            if current_requests >= max_requests:
-                return JsonResponse({
-                    'error': 'Rate limit exceeded. Please try again later.'
-                }, status=429)
-            
-            # Increment counter
-            cache.set(cache_key, current_requests + 1, window_seconds)
-            
-            return view_func(request, *args, **kwargs)
-        return _wrapped_view
-    return decorator
-
 class ResourceForm(forms.ModelForm):
     class Meta:
         model = Resource
@@ -207,63 +184,47 @@ def dashboard(request):
     # SYSTEM-WIDE STATISTICS
     # ============================================================================
     
-    stats = {}
+    # Application and card counts come from the materialized counters
+    # (app.system_stats) in a single query
+    counters = get_system_stats()
     
-    # Enrollment Statistics
-    try:
-        from enrollments.models import AssociatedApplication, DesignatedApplication, StudentApplication
-        
-        # Get all applications across types
-        all_applications = []
-        for model in [AssociatedApplication, DesignatedApplication, StudentApplication]:
-            all_applications.extend(model.objects.all())
-        
-        stats['total_applications'] = len(all_applications)
-        stats['pending_applications'] = len([app for app in all_applications if app.status in ['submitted', 'under_review']])
-        stats['approved_applications'] = len([app for app in all_applications if app.status == 'approved'])
-        
-    except ImportError:
-        stats['total_applications'] = 0
-        stats['pending_applications'] = 0
-        stats['approved_applications'] = 0
+    stats = {
+        'total_applications': counters['applications.total'],
+        'pending_applications': counters['applications.status.submitted'] + counters['applications.status.under_review'],
+        'approved_applications': counters['applications.status.approved'],
+        'total_cards': counters['cards.total'],
+        'active_cards': counters['cards.status.active'],
+    }
     
-    # Digital Card Statistics
+    # Expiry is relative to today, so it is counted live (status/date_expires index)
     try:
         from affiliationcard.models import AffiliationCard
         
-        stats['total_cards'] = AffiliationCard.objects.count()
-        stats['active_cards'] = AffiliationCard.objects.filter(status='active').count()
         stats['expiring_cards'] = AffiliationCard.objects.filter(
             date_expires__lte=timezone.now().date() + timedelta(days=30),
             status='active'
         ).count()
         
     except ImportError:
-        stats['total_cards'] = 0
-        stats['active_cards'] = 0
         stats['expiring_cards'] = 0
     
     # CPD Statistics
     try:
-        from cpd.models import CPDRecord, CPDApproval
+        from cpd.models import CPDRecord
         
         current_year = timezone.now().year
         
-        # Get completed CPD records for current year with approved status
-        approved_records = CPDRecord.objects.filter(
+        # Sum approved hours for completed CPD records this year in the database
+        total_hours = CPDRecord.objects.filter(
             user=user,
             completion_date__year=current_year,
-            status='COMPLETED'
-        ).filter(
+            status='COMPLETED',
             approval__status='APPROVED'
-        )
-        
-        # Calculate total hours
-        total_hours = 0
-        for record in approved_records:
-            total_hours += float(record.hours_awarded or record.hours_claimed or 0)
+        ).aggregate(
+            total=Sum(Coalesce('hours_awarded', 'hours_claimed'))
+        )['total']
         
-        stats['cpd_hours'] = total_hours
+        stats['cpd_hours'] = float(total_hours or 0)
         
     except (ImportError, AttributeError):
         stats['cpd_hours'] = 0
@@ -342,8 +303,6 @@ def dashboard(request):
         'announcements': announcements,
         'events': events,
         'projects': projects,
-        'unread_notifications_count': get_unread_count(request.user),
-        'recent_notifications': get_recent_notifications(request.user, limit=5),
         'stats': stats,
         'pending_items': pending_items,
         'user_role': getattr(getattr(user, 'role', None), 'title', 'Member') if hasattr(user, 'role') else 'Member',
@@ -651,8 +610,6 @@ def learner_dashboard(request):
         'quick_links': quick_links,
         'page_title': 'My Learning Dashboard',
         'current_year': timezone.now().year,
-        'unread_notifications_count': get_unread_count(request.user),
-        'recent_notifications': get_recent_notifications(request.user, limit=5),
     }
     
     return render(request, 'app/learner_dashboard.html', context)
@@ -1078,7 +1035,7 @@ def kanban_workspace(request):
 
 @login_required
 @require_POST
-@rate_limit('kanban_update', max_requests=100, window_seconds=3600)
+@rate_limit('kanban_update', max_requests=100, window_seconds=3600, key='user_ip')
 def kanban_update_task_status(request, task_id):
     """
     AJAX endpoint for updating task status via drag-and-drop in kanban board.
@@ -1975,7 +1932,7 @@ def time_tracking_dashboard(request):
 
 @login_required
 @require_POST
-@rate_limit('comment_create', max_requests=100, window_seconds=3600)
+@rate_limit('comment_create', max_requests=100, window_seconds=3600, key='user_ip')
 def add_comment_ajax(request):
     """
     AJAX endpoint for adding comments to projects, tasks, or any content type.
@@ -2421,25 +2378,10 @@ def mark_notifications_read(request):
         
         if mark_all:
             # Mark all user's notifications as read
-            updated_count = Notification.objects.filter(
-                recipient=request.user,
-                is_read=False,
-                is_active=True
-            ).update(
-                is_read=True,
-                read_at=timezone.now()
-            )
+            updated_count = mark_all_read(request.user)
         elif notification_ids:
             # Mark specific notifications as read
-            updated_count = Notification.objects.filter(
-                id__in=notification_ids,
-                recipient=request.user,
-                is_read=False,
-                is_active=True
-            ).update(
-                is_read=True,
-                read_at=timezone.now()
-            )
+            updated_count = mark_selected_read(request.user, notification_ids)
         else:
             return JsonResponse({
                 'success': False,
@@ -3287,33 +3229,74 @@ def notification_delete(request, pk):
 @login_required
 def notification_fetch(request):
     """Fetch recent notifications via AJAX for real-time updates."""
-    notifications = get_recent_notifications(request.user, limit=10)
+    summary = get_notification_summary(request.user)
     
     notifications_data = []
-    for notification in notifications:
-        sender_name = None
+    for notification in summary['recent'][:10]:
         notifications_data.append({
-            'id': str(notification.id),
-            'title': notification.title,
-            'message': notification.message,
-            'type': notification.notification_type,
-            'is_read': notification.is_read,
-            'action_url': notification.action_url,
-            'created_at': notification.created_at.isoformat(),
-            'sender_name': sender_name,
+            'id': notification['id'],
+            'title': notification['title'],
+            'message': notification['message'],
+            'type': notification['notification_type'],
+            'is_read': notification['is_read'],
+            'action_url': notification['action_url'],
+            'created_at': notification['created_at'].isoformat(),
+            'sender_name': notification['sender_name'],
         })
     
     return JsonResponse({
         'success': True,
         'notifications': notifications_data,
-        'unread_count': get_unread_count(request.user)
+        'unread_count': summary['unread']
     })
 
 
+### ========== BACKGROUND EXPORT JOBS ========== ###
+@login_required
+def export_job_detail(request, pk):
+    """Show the status of an export job; AJAX requests poll for progress."""
+    job = get_object_or_404(ExportJob, pk=pk, created_by=request.user)
+    
+    if request.headers.get('x-requested-with') == 'XMLHttpRequest':
+        return JsonResponse({
+            'status': job.status,
+            'progress': job.progress,
+            'row_count': job.row_count,
+            'is_finished': job.is_finished,
+            'download_url': job.get_download_url() if job.status == ExportJob.Status.COMPLETED else None,
+            'error': job.error_message if job.status == ExportJob.Status.FAILED else None,
+        })
+    
+    context = {
+        'job': job,
+        'page_title': f'{job.get_export_type_display()} Export',
+    }
+    
+    return render(request, 'app/export_job_detail.html', context)
+
+
+@login_required
+def export_job_download(request, pk):
+    """Download the file produced by a completed export job."""
+    job = get_object_or_404(
+        ExportJob, pk=pk, created_by=request.user, status=ExportJob.Status.COMPLETED
+    )
+    if not job.output_file:
+        raise Http404("Export file not found")
+    
+    return FileResponse(
+        job.output_file.open('rb'),
+        as_attachment=True,
+        filename=job.file_name,
+        content_type=job.content_type or None,
+    )
+
+
 
 
 
 import logging
+import sys
 import traceback
 import json
 import hashlib
@@ -3592,7 +3575,8 @@ def check_rate_limit(request: HttpRequest, error_code: str) -> Tuple[bool, int]:
     """
     Implement rate limiting for error pages to prevent abuse.
     
-    Uses Django's cache framework to track error page requests per IP.
+    Uses the shared rate limiter (app.ratelimit) to track error page
+    requests per IP.
     This prevents attackers from overwhelming the system by triggering
     errors repeatedly.
     
@@ -3606,24 +3590,13 @@ def check_rate_limit(request: HttpRequest, error_code: str) -> Tuple[bool, int]:
     if not ErrorHandlerConfig.RATE_LIMIT_ENABLED:
         return True, ErrorHandlerConfig.RATE_LIMIT_REQUESTS
     
-    client_ip = get_client_ip(request)
-    cache_key = f"error_rate_limit:{error_code}:{client_ip}"
-    
-    # Get current request count
-    request_count = cache.get(cache_key, 0)
-    
-    if request_count >= ErrorHandlerConfig.RATE_LIMIT_REQUESTS:
-        return False, 0
-    
-    # Increment counter
-    cache.set(
-        cache_key,
-        request_count + 1,
+    result = check_request_rate(
+        request,
+        f"error_page.{error_code}",
+        ErrorHandlerConfig.RATE_LIMIT_REQUESTS,
         ErrorHandlerConfig.RATE_LIMIT_WINDOW
     )
-    
-    remaining = ErrorHandlerConfig.RATE_LIMIT_REQUESTS - request_count - 1
-    return True, remaining
+    return result.allowed, result.remaining
 
 
 def log_error_to_monitoring(
@@ -3806,6 +3779,10 @@ def build_error_context(
     # Log to monitoring services
     log_error_to_monitoring(error, request, error_id, request_context)
     
+    # Record in the error log (buffered and sampled; see app.error_pipeline)
+    if ErrorHandlerConfig.ENABLE_DATABASE_LOGGING:
+        record_error(request, error, error_id, error_code, request_context=request_context)
+    
     # Build base context
     context = {
         'error_code': error_code,
@@ -3863,6 +3840,10 @@ def build_json_error_response(
     # Log to monitoring
     log_error_to_monitoring(error, request, error_id, request_context)
     
+    # Record in the error log (buffered and sampled; see app.error_pipeline)
+    if ErrorHandlerConfig.ENABLE_DATABASE_LOGGING:
+        record_error(request, error, error_id, error_code, request_context=request_context)
+    
     response_data = {
         'error': {
             'code': error_code,
@@ -3964,8 +3945,9 @@ def error_500(request: HttpRequest) -> HttpResponse:
     """
     error_message = 'An internal server error occurred. Our team has been notified.'
     
-    # Create a generic exception for 500 errors without an exception object
-    exception = Exception("Internal Server Error")
+    # handler500 runs inside Django's except block: use the exception being
+    # handled, so the error log gets its real type, culprit and traceback
+    exception = sys.exc_info()[1] or Exception("Internal Server Error")
     
     # Suggestions for recovery
     suggestions = [
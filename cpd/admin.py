@@ -4,7 +4,8 @@ from django.contrib import admin
 from .models import (
     CPDProvider, CPDCategory, CPDRequirement, CPDActivity, 
     CPDPeriod, CPDRecord, CPDEvidence, CPDApproval, 
-    CPDCompliance, CPDCertificate, CPDAuditLog
+    CPDCompliance, CPDCertificate, CPDDailyStats, CPDAuditLog,
+    CPDReminder, CPDCertificateBatch
 )
 
 
@@ -92,6 +93,25 @@ class CPDCertificateAdmin(admin.ModelAdmin):
     readonly_fields = ['verification_token']
 
 
+@admin.register(CPDCertificateBatch)
+class CPDCertificateBatchAdmin(admin.ModelAdmin):
+    list_display = ['period', 'status', 'total', 'generated', 'skipped', 'failed', 'started_at', 'completed_at']
+    list_filter = ['status', 'period']
+    ordering = ['-started_at']
+    readonly_fields = [
+        'period', 'status', 'total', 'generated', 'skipped', 'failed',
+        'errors', 'started_by', 'started_at', 'completed_at'
+    ]
+
+
+@admin.register(CPDDailyStats)
+class CPDDailyStatsAdmin(admin.ModelAdmin):
+    list_display = ['period', 'date', 'records', 'points', 'updated_at']
+    list_filter = ['period']
+    ordering = ['-date']
+    readonly_fields = ['period', 'date', 'records', 'points', 'updated_at']
+
+
 @admin.register(CPDAuditLog)
 class CPDAuditLogAdmin(admin.ModelAdmin):
     list_display = ['user', 'action', 'content_type', 'object_id', 'timestamp']
@@ -99,4 +119,13 @@ class CPDAuditLogAdmin(admin.ModelAdmin):
     search_fields = ['user__username', 'notes']
     ordering = ['-timestamp']
     date_hierarchy = 'timestamp'
-    readonly_fields = ['user', 'action', 'content_type', 'object_id', 'timestamp', 'field_changes']
\ No newline at end of file
+    readonly_fields = ['user', 'action', 'content_type', 'object_id', 'timestamp', 'field_changes']
+
+
+@admin.register(CPDReminder)
+class CPDReminderAdmin(admin.ModelAdmin):
+    list_display = ['user', 'period', 'days_before', 'compliance_status', 'sent_at']
+    list_filter = ['period', 'days_before', 'compliance_status']
+    search_fields = ['user__username', 'user__email']
+    ordering = ['-sent_at']
+    readonly_fields = ['user', 'period', 'days_before', 'compliance_status', 'sent_at']
@@ -0,0 +1,346 @@
+"""
+CPD analytics rollups.
+
+The analytics dashboard used to run one aggregate query per calendar day of
+the period for its timeline, and re-join every record of the period once for
+the category breakdown and again for provider performance.
+
+Timeline
+    One query grouped by ``completion_date`` (already a date, so no
+    truncation is needed); days without records are filled in Python. With
+    CPD_ANALYTICS['USE_DAILY_STATS'] enabled the timeline reads the
+    ``CPDDailyStats`` rollup table instead, one row per period and day.
+
+Activity, category and provider statistics
+    One query grouped by activity over the period's records; the three
+    rollups are summed from those rows in Python, and the category and
+    provider objects are loaded with one ``in_bulk`` each.
+
+``CPDDailyStats`` is maintained incrementally by the CPDRecord signal
+handlers below, which are connected only when the table is enabled: the
+approval workflow saves ``points_awarded`` through ``CPDRecord.save``, so
+approvals update the rollup as they happen. Changes that bypass signals
+(``QuerySet.update()``, bulk operations, raw SQL) can call
+``apply_daily_deltas`` themselves or be corrected with
+``rebuild_cpd_daily_stats``.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.utils.timezone import now
+
+from .models import CPDCategory, CPDDailyStats, CPDPeriod, CPDProvider, CPDRecord
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CPD_ANALYTICS_SETTINGS = {
+    'USE_DAILY_STATS': False,
+}
+
+# Record fields that decide which daily rollup a record counts towards
+DAILY_STAT_FIELDS = ('period_id', 'completion_date', 'points_awarded')
+
+TOP_PROVIDERS = 10
+
+
+def get_cpd_analytics_setting(name):
+    """Read a CPD_ANALYTICS setting, falling back to the defaults above."""
+    return getattr(settings, 'CPD_ANALYTICS', {}).get(name, DEFAULT_CPD_ANALYTICS_SETTINGS[name])
+
+
+# ============================================================================
+# TIMELINE
+# ============================================================================
+
+def get_timeline(period: CPDPeriod, end_date=None) -> List[Dict]:
+    """
+    Records completed and points awarded per day, from the start of the
+    period to ``end_date`` (default: the period end or today, whichever is
+    earlier). Every day is present; days without records read zero.
+    """
+    start_date = period.start_date
+    end_date = end_date or min(period.end_date, now().date())
+    if end_date < start_date:
+        return []
+
+    if get_cpd_analytics_setting('USE_DAILY_STATS'):
+        days = _daily_totals_from_rollup(period, start_date, end_date)
+    else:
+        days = _daily_totals_from_records(period, start_date, end_date)
+
+    timeline = []
+    current_date = start_date
+    while current_date <= end_date:
+        records, points = days.get(current_date, (0, None))
+        timeline.append({
+            'date': current_date.strftime('%Y-%m-%d'),
+            'records': records,
+            'points': float(points or 0),
+        })
+        current_date += timedelta(days=1)
+
+    return timeline
+
+
+def _daily_totals_from_records(period, start_date, end_date):
+    rows = CPDRecord.objects.filter(
+        period=period,
+        completion_date__range=(start_date, end_date)
+    ).order_by().values('completion_date').annotate(
+        count=Count('id'),
+        points=Sum('points_awarded')
+    )
+    return {row['completion_date']: (row['count'], row['points']) for row in rows}
+
+
+def _daily_totals_from_rollup(period, start_date, end_date):
+    rows = CPDDailyStats.objects.filter(
+        period=period,
+        date__range=(start_date, end_date)
+    ).values_list('date', 'records', 'points')
+    return {date: (records, points) for date, records, points in rows}
+
+
+# ============================================================================
+# ACTIVITY, CATEGORY AND PROVIDER ROLLUPS
+# ============================================================================
+
+def get_activity_rollups(period: CPDPeriod) -> Tuple[Dict, List[CPDCategory], List[CPDProvider]]:
+    """
+    Activity, category and provider statistics for a period.
+
+    Ratings are activity ratings weighted by the number of records, as the
+    per-join averages were.
+
+    Returns:
+        (activity_stats, category_stats, provider_stats): a dict with
+        total_activities / avg_participants / avg_rating; categories with
+        records, ordered by total_records and annotated with total_records /
+        total_points / avg_rating; the top providers by participants,
+        annotated with total_activities / total_participants / avg_rating
+    """
+    rows = CPDRecord.objects.filter(period=period).order_by().values(
+        'activity_id', 'activity__category_id', 'activity__provider_id', 'activity__average_rating'
+    ).annotate(
+        records=Count('id'),
+        points=Sum('points_awarded')
+    )
+
+    overall = _RatingTotals()
+    categories = defaultdict(_RatingTotals)
+    providers = defaultdict(_RatingTotals)
+    for row in rows:
+        for totals in (overall, categories[row['activity__category_id']], providers[row['activity__provider_id']]):
+            totals.add(row)
+
+    activity_stats = {
+        'total_activities': overall.activities,
+        'avg_participants': overall.records / overall.activities if overall.activities else None,
+        'avg_rating': overall.avg_rating,
+    }
+
+    category_stats = []
+    for category_id, category in CPDCategory.objects.in_bulk(list(categories)).items():
+        totals = categories[category_id]
+        category.total_records = totals.records
+        category.total_points = totals.points
+        category.avg_rating = totals.avg_rating
+        category_stats.append(category)
+    category_stats.sort(key=lambda category: category.total_records, reverse=True)
+
+    top_provider_ids = sorted(providers, key=lambda provider_id: providers[provider_id].records, reverse=True)[:TOP_PROVIDERS]
+    provider_objects = CPDProvider.objects.in_bulk(top_provider_ids)
+    provider_stats = []
+    for provider_id in top_provider_ids:
+        provider = provider_objects.get(provider_id)
+        if provider is None:
+            continue
+        totals = providers[provider_id]
+        provider.total_activities = totals.activities
+        provider.total_participants = totals.records
+        provider.avg_rating = totals.avg_rating
+        provider_stats.append(provider)
+
+    return activity_stats, category_stats, provider_stats
+
+
+class _RatingTotals:
+    """Running totals over per-activity rows."""
+
+    def __init__(self):
+        self.activities = 0
+        self.records = 0
+        self.points = None
+        self._rating_sum = Decimal('0')
+        self._rated_records = 0
+
+    def add(self, row):
+        self.activities += 1
+        self.records += row['records']
+        if row['points'] is not None:
+            self.points = (self.points or Decimal('0')) + row['points']
+        if row['activity__average_rating'] is not None:
+            self._rating_sum += row['activity__average_rating'] * row['records']
+            self._rated_records += row['records']
+
+    @property
+    def avg_rating(self):
+        return self._rating_sum / self._rated_records if self._rated_records else None
+
+
+# ============================================================================
+# DAILY ROLLUP MAINTENANCE
+# ============================================================================
+
+def apply_daily_deltas(deltas: Dict[Tuple[int, object], List]) -> None:
+    """
+    Add ``{(period_id, date): [records, points]}`` to the daily rollup,
+    creating missing rows. Rows are updated in key order so concurrent
+    writers lock them in the same order.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta[0] or delta[1]}
+    if not deltas:
+        return
+
+    with transaction.atomic():
+        for period_id, date in sorted(deltas):
+            records, points = deltas[(period_id, date)]
+            rows = CPDDailyStats.objects.filter(period_id=period_id, date=date)
+            changes = {'records': F('records') + records, 'points': F('points') + points, 'updated_at': now()}
+            if not rows.update(**changes):
+                _create_daily_stat(period_id, date)
+                rows.update(**changes)
+
+
+def _create_daily_stat(period_id, date):
+    try:
+        with transaction.atomic():
+            CPDDailyStats.objects.create(period_id=period_id, date=date)
+    except IntegrityError:
+        # Another writer created it first; its row is used instead
+        pass
+
+
+def record_contribution(period_id, completion_date, points_awarded) -> Optional[Tuple]:
+    """The rollup key and ``[records, points]`` one record contributes."""
+    if completion_date is None:
+        return None
+    return (period_id, completion_date), [1, points_awarded or Decimal('0')]
+
+
+def _stored_contribution(pk):
+    row = CPDRecord.objects.filter(pk=pk).values(*DAILY_STAT_FIELDS).first()
+    if row is None:
+        return None
+    return record_contribution(*(row[field] for field in DAILY_STAT_FIELDS))
+
+
+def _schedule_contribution_change(old, new):
+    deltas = defaultdict(lambda: [0, Decimal('0')])
+    if old:
+        key, (records, points) = old
+        deltas[key][0] -= records
+        deltas[key][1] -= points
+    if new:
+        key, (records, points) = new
+        deltas[key][0] += records
+        deltas[key][1] += points
+    schedule_daily_deltas(deltas)
+
+
+def schedule_daily_deltas(deltas: Dict[Tuple[int, object], List]) -> None:
+    """
+    Apply daily rollup deltas once the current transaction commits. A
+    failure is logged rather than raised, since the change itself has
+    already been committed.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta[0] or delta[1]}
+    if deltas:
+        transaction.on_commit(lambda: _apply_daily_deltas_safely(deltas))
+
+
+def _apply_daily_deltas_safely(deltas):
+    try:
+        apply_daily_deltas(deltas)
+    except Exception as e:
+        logger.error(f"Could not update CPD daily statistics: {e}")
+
+
+def _record_pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not {'period', 'completion_date', 'points_awarded'} & set(update_fields)):
+        instance._daily_stat_contribution = False
+        return
+    instance._daily_stat_contribution = _stored_contribution(instance.pk) if instance.pk else None
+
+
+def _record_post_save(sender, instance, raw=False, **kwargs):
+    old = getattr(instance, '_daily_stat_contribution', False)
+    if raw or old is False:
+        return
+    _schedule_contribution_change(old, _stored_contribution(instance.pk))
+    instance._daily_stat_contribution = False
+
+
+def _record_pre_delete(sender, instance, **kwargs):
+    instance._daily_stat_contribution = _stored_contribution(instance.pk)
+
+
+def _record_post_delete(sender, instance, **kwargs):
+    _schedule_contribution_change(getattr(instance, '_daily_stat_contribution', None), None)
+
+
+def connect_signals():
+    """Connect the rollup maintenance handlers when the daily table is enabled."""
+    if not get_cpd_analytics_setting('USE_DAILY_STATS'):
+        return
+    pre_save.connect(_record_pre_save, sender=CPDRecord, dispatch_uid='cpd_daily_stats_pre_save')
+    post_save.connect(_record_post_save, sender=CPDRecord, dispatch_uid='cpd_daily_stats_post_save')
+    pre_delete.connect(_record_pre_delete, sender=CPDRecord, dispatch_uid='cpd_daily_stats_pre_delete')
+    post_delete.connect(_record_post_delete, sender=CPDRecord, dispatch_uid='cpd_daily_stats_post_delete')
+
+
+# ============================================================================
+# REBUILD
+# ============================================================================
+
+def rebuild_daily_stats(period: CPDPeriod = None) -> int:
+    """
+    Rebuild the daily rollup (for one period, or all) from the records.
+
+    Returns:
+        Number of daily rows written
+    """
+    records = CPDRecord.objects.filter(completion_date__isnull=False)
+    stats = CPDDailyStats.objects.all()
+    if period is not None:
+        records = records.filter(period=period)
+        stats = stats.filter(period=period)
+
+    rows = records.order_by().values('period_id', 'completion_date').annotate(
+        count=Count('id'),
+        points=Sum('points_awarded')
+    )
+
+    with transaction.atomic():
+        stats.delete()
+        created = CPDDailyStats.objects.bulk_create([
+            CPDDailyStats(
+                period_id=row['period_id'],
+                date=row['completion_date'],
+                records=row['count'],
+                points=row['points'] or 0,
+            )
+            for row in rows
+        ], batch_size=1000)
+
+    logger.info(f"Rebuilt {len(created)} CPD daily statistics rows")
+    return len(created)
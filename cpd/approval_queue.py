@@ -0,0 +1,215 @@
+"""
+CPD approval work queue.
+
+The queue is ordered by ``(priority, submitted_at, id)``, matching the
+``cpd_approval_queue_idx`` index and, for open approvals, the partial
+``cpd_approval_open_queue_idx`` index. Pages are read with keyset
+pagination: a cursor holds the sort key of the first or last row shown,
+and the next page is the rows strictly after it. Every page therefore
+costs one index range scan of ``page_size`` rows, however deep the
+backlog is, instead of a COUNT plus an OFFSET that grows with the page
+number. ``next_in_queue`` / ``previous_in_queue`` use the same sort, so
+moving between approvals follows the order reviewers see in the list.
+
+Counts come from the ``cpd_approvals.<status>.<priority>`` counters in
+``app.system_stats``, which are maintained incrementally. "Overdue" moves
+with the clock, so it is derived as pending minus pending submitted within
+the last OVERDUE_AFTER; that second count only scans recent submissions.
+"""
+
+import base64
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from django.db.models import Q
+from django.utils.timezone import now
+
+from app.system_stats import get_system_stats
+
+from .approvals import OPEN_STATUSES
+from .models import CPDApproval
+
+logger = logging.getLogger(__name__)
+
+
+QUEUE_ORDERING = ('priority', 'submitted_at', 'id')
+QUEUE_PAGE_SIZE = 20
+
+OVERDUE_AFTER = timedelta(days=7)
+
+
+# ============================================================================
+# KEYSET CURSORS
+# ============================================================================
+
+def queue_key(approval: CPDApproval):
+    """Sort key of an approval in the queue."""
+    return approval.priority, approval.submitted_at, approval.pk
+
+
+def encode_cursor(approval: CPDApproval) -> str:
+    priority, submitted_at, pk = queue_key(approval)
+    payload = json.dumps([priority, submitted_at.isoformat(), pk])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str):
+    """Return the sort key held by ``cursor``, or None if it is missing or invalid."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        priority, submitted_at, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return str(priority), datetime.fromisoformat(submitted_at), int(pk)
+    except (ValueError, TypeError):
+        logger.warning(f"Ignoring invalid approval queue cursor: {cursor[:100]}")
+        return None
+
+
+def _after(key) -> Q:
+    priority, submitted_at, pk = key
+    return (
+        Q(priority__gt=priority) |
+        Q(priority=priority, submitted_at__gt=submitted_at) |
+        Q(priority=priority, submitted_at=submitted_at, id__gt=pk)
+    )
+
+
+def _before(key) -> Q:
+    priority, submitted_at, pk = key
+    return (
+        Q(priority__lt=priority) |
+        Q(priority=priority, submitted_at__lt=submitted_at) |
+        Q(priority=priority, submitted_at=submitted_at, id__lt=pk)
+    )
+
+
+# ============================================================================
+# PAGES AND NAVIGATION
+# ============================================================================
+
+class QueuePage:
+    """One page of the approval queue with cursors for its neighbours."""
+
+    def __init__(self, object_list: List[CPDApproval], next_cursor: Optional[str], previous_cursor: Optional[str]):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def get_queue_page(queryset, cursor: str = None, direction: str = 'next',
+                   page_size: int = QUEUE_PAGE_SIZE) -> QueuePage:
+    """
+    Read one page of ``queryset`` in queue order.
+
+    Args:
+        queryset: Filtered CPDApproval queryset (its ordering is replaced)
+        cursor: Cursor from a previous page, or None for the first page
+        direction: 'next' for the rows after the cursor, 'previous' for
+            the rows before it
+    """
+    key = decode_cursor(cursor)
+
+    if direction == 'previous' and key:
+        descending = [f'-{field}' for field in QUEUE_ORDERING]
+        rows = list(queryset.filter(_before(key)).order_by(*descending)[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size][::-1]
+        return QueuePage(
+            rows,
+            next_cursor=encode_cursor(rows[-1]) if rows else None,
+            previous_cursor=encode_cursor(rows[0]) if rows and has_more else None,
+        )
+
+    if key:
+        queryset = queryset.filter(_after(key))
+    rows = list(queryset.order_by(*QUEUE_ORDERING)[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    return QueuePage(
+        rows,
+        next_cursor=encode_cursor(rows[-1]) if rows and has_more else None,
+        previous_cursor=encode_cursor(rows[0]) if rows and key else None,
+    )
+
+
+def next_in_queue(approval: CPDApproval, statuses=OPEN_STATUSES) -> Optional[CPDApproval]:
+    """The open approval after ``approval`` in queue order."""
+    return CPDApproval.objects.filter(
+        status__in=statuses
+    ).filter(_after(queue_key(approval))).order_by(*QUEUE_ORDERING).first()
+
+
+def previous_in_queue(approval: CPDApproval, statuses=OPEN_STATUSES) -> Optional[CPDApproval]:
+    """The open approval before ``approval`` in queue order."""
+    return CPDApproval.objects.filter(
+        status__in=statuses
+    ).filter(_before(queue_key(approval))).order_by(*[f'-{field}' for field in QUEUE_ORDERING]).first()
+
+
+# ============================================================================
+# COUNTERS
+# ============================================================================
+
+def get_queue_counts(stats=None) -> Dict[str, int]:
+    """
+    Pending, urgent and overdue counts for the queue header.
+
+    Args:
+        stats: Result of get_system_stats(), if the caller already has it
+    """
+    stats = stats if stats is not None else get_system_stats()
+
+    pending = _counted(stats, [CPDApproval.Status.PENDING])
+    recent = CPDApproval.objects.filter(
+        status=CPDApproval.Status.PENDING,
+        submitted_at__gte=now() - OVERDUE_AFTER
+    ).count()
+
+    return {
+        'pending_count': _counted(stats, OPEN_STATUSES),
+        'urgent_count': _counted(stats, [CPDApproval.Status.PENDING], [CPDApproval.Priority.URGENT]),
+        'overdue_count': max(0, pending - recent),
+    }
+
+
+def count_queue(status_filter: str = 'pending', priority_filter: str = 'all', stats=None) -> int:
+    """Number of approvals matching the queue's status and priority filters."""
+    stats = stats if stats is not None else get_system_stats()
+    if status_filter == 'pending':
+        statuses = OPEN_STATUSES
+    elif status_filter == 'all':
+        statuses = CPDApproval.Status.values
+    else:
+        statuses = [status_filter]
+    priorities = None if priority_filter == 'all' else [priority_filter]
+    return _counted(stats, statuses, priorities)
+
+
+def _counted(stats, statuses, priorities=None) -> int:
+    priorities = priorities or CPDApproval.Priority.values
+    return sum(
+        stats[f'cpd_approvals.{status}.{priority}']
+        for status in statuses
+        for priority in priorities
+    )
@@ -0,0 +1,284 @@
+"""
+Bulk CPD approval decisions.
+
+``bulk_approval`` used to save each selected CPDApproval on its own (one
+approval UPDATE plus one record UPDATE each) and send every notification
+email inline. ``approval_detail`` also recalculated the member's full
+compliance inside the request.
+
+``apply_bulk_decision`` handles a whole selection at once:
+
+1. The selected approvals that are still open are loaded with their
+   records in one query.
+2. Status, reviewer and timing fields are written with one ``bulk_update``,
+   and approved records get their ``points_awarded`` with a second one
+   (the same rule as ``CPDApproval.save``). The approval queue counters in
+   ``app.system_stats`` are adjusted with the same deltas the signal
+   handlers would have applied.
+3. One CPDAuditLog row per decision is written with ``bulk_create``.
+4. Notification emails are queued in the email outbox with one insert.
+5. The affected (period, member) pairs are recalculated once, after the
+   transaction commits, by ``schedule_compliance_recalculation``.
+
+Compliance recalculation backends (``settings.CPD_APPROVALS['COMPLIANCE_BACKEND']``):
+    thread  - in-process worker thread; pairs queued meanwhile are merged (default)
+    celery  - ``recalculate_compliance_task`` on the configured Celery broker
+    inline  - recalculated in the committing request
+"""
+
+import logging
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import Iterable, List, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils.timezone import now
+
+from app.email_outbox import queue_emails
+from app.system_stats import approval_keys, schedule_stat_deltas
+
+from .analytics import get_cpd_analytics_setting, schedule_daily_deltas
+from .compliance import recalculate_period_compliance
+from .models import CPDApproval, CPDAuditLog, CPDPeriod, CPDRecord
+from .utils import build_approval_notification
+
+logger = logging.getLogger(__name__)
+
+try:
+    from celery import shared_task
+except ImportError:  # Celery is optional
+    shared_task = None
+
+
+DEFAULT_CPD_APPROVAL_SETTINGS = {
+    'COMPLIANCE_BACKEND': 'thread',
+}
+
+OPEN_STATUSES = [CPDApproval.Status.PENDING, CPDApproval.Status.UNDER_REVIEW]
+
+DECISIONS = {
+    'approve': CPDApproval.Status.APPROVED,
+    'reject': CPDApproval.Status.REJECTED,
+}
+
+PRIORITIES = {
+    'priority_high': CPDApproval.Priority.HIGH,
+    'priority_normal': CPDApproval.Priority.NORMAL,
+}
+
+APPROVAL_DECISION_FIELDS = [
+    'status', 'reviewer', 'reviewed_at', 'days_in_review',
+    'reviewer_comments', 'rejection_reason', 'updated_at',
+]
+
+_executor = None
+_pending_lock = threading.Lock()
+_pending_pairs = set()
+_drain_scheduled = False
+
+
+def get_cpd_approval_setting(name):
+    """Read a CPD_APPROVALS setting, falling back to the defaults above."""
+    return getattr(settings, 'CPD_APPROVALS', {}).get(name, DEFAULT_CPD_APPROVAL_SETTINGS[name])
+
+
+# ============================================================================
+# BULK DECISIONS
+# ============================================================================
+
+def apply_bulk_decision(approval_ids: List[int], action: str, reviewer, comments: str = '') -> int:
+    """
+    Apply one bulk action to the selected approvals.
+
+    Args:
+        approval_ids: CPDApproval ids
+        action: 'approve', 'reject', 'priority_high' or 'priority_normal'
+        reviewer: User making the decision
+        comments: Reviewer comments (approve) or rejection reason (reject)
+
+    Returns:
+        Number of approvals updated
+    """
+    if action in PRIORITIES:
+        priority = PRIORITIES[action]
+        with transaction.atomic():
+            selected = CPDApproval.objects.select_for_update().filter(
+                id__in=approval_ids, status__in=OPEN_STATUSES
+            ).exclude(priority=priority)
+            stat_deltas = Counter()
+            for old_status, old_priority in selected.values_list('status', 'priority'):
+                stat_deltas.subtract(approval_keys(old_status, old_priority))
+                stat_deltas.update(approval_keys(old_status, priority))
+            updated = selected.update(priority=priority, updated_at=now())
+            # QuerySet.update() bypasses the approval counter signals
+            schedule_stat_deltas(stat_deltas)
+        logger.info(f"Bulk {action} applied to {updated} approvals by {reviewer.username}")
+        return updated
+
+    if action not in DECISIONS:
+        raise ValueError(f"Unknown bulk approval action: {action}")
+
+    status = DECISIONS[action]
+    reviewed_at = now()
+
+    with transaction.atomic():
+        approvals = list(
+            CPDApproval.objects.select_for_update(of=('self',)).filter(
+                id__in=approval_ids, status__in=OPEN_STATUSES
+            ).select_related('record__user', 'record__activity')
+        )
+        if not approvals:
+            return 0
+
+        records = []
+        daily_deltas = defaultdict(lambda: [0, Decimal('0')])
+        stat_deltas = Counter()
+        for approval in approvals:
+            stat_deltas.subtract(approval_keys(approval.status, approval.priority))
+            stat_deltas.update(approval_keys(status, approval.priority))
+            approval.status = status
+            approval.reviewer = reviewer
+            approval.reviewed_at = reviewed_at
+            approval.updated_at = reviewed_at
+            if approval.submitted_at:
+                approval.days_in_review = (reviewed_at - approval.submitted_at).days
+            if comments and status == CPDApproval.Status.APPROVED:
+                approval.reviewer_comments = comments
+            elif comments:
+                approval.rejection_reason = comments
+
+            if status == CPDApproval.Status.APPROVED:
+                record = approval.record
+                final_points = approval.adjusted_points or approval.original_points
+                if record.completion_date:
+                    key = (record.period_id, record.completion_date)
+                    daily_deltas[key][1] += (final_points or 0) - (record.points_awarded or 0)
+                record.points_awarded = final_points
+                records.append(record)
+
+        CPDApproval.objects.bulk_update(approvals, APPROVAL_DECISION_FIELDS, batch_size=500)
+        # bulk_update bypasses the approval counter signals
+        schedule_stat_deltas(stat_deltas)
+        if records:
+            CPDRecord.objects.bulk_update(records, ['points_awarded'], batch_size=500)
+            if get_cpd_analytics_setting('USE_DAILY_STATS'):
+                # bulk_update bypasses the record signals that maintain the rollup
+                schedule_daily_deltas(dict(daily_deltas))
+
+        audit_action = 'APPROVE' if status == CPDApproval.Status.APPROVED else 'REJECT'
+        CPDAuditLog.objects.bulk_create([
+            CPDAuditLog(
+                user=reviewer,
+                action=audit_action,
+                content_type='CPDRecord',
+                object_id=approval.record_id,
+                notes=f"Bulk approval decision: {approval.get_status_display()}"[:500],
+            )
+            for approval in approvals
+        ], batch_size=500)
+
+        _queue_notifications(approvals)
+
+        if status == CPDApproval.Status.APPROVED:
+            schedule_compliance_recalculation(
+                (approval.record.period_id, approval.record.user_id) for approval in approvals
+            )
+
+    logger.info(f"Bulk {action} applied to {len(approvals)} approvals by {reviewer.username}")
+    return len(approvals)
+
+
+def _queue_notifications(approvals):
+    messages = []
+    for approval in approvals:
+        try:
+            email = build_approval_notification(approval)
+        except Exception as e:
+            logger.error(f"Failed to build approval notification for approval {approval.pk}: {e}")
+            continue
+        if email is not None:
+            messages.append(email)
+    queue_emails(messages, category='cpd_approval')
+
+
+# ============================================================================
+# DEFERRED COMPLIANCE RECALCULATION
+# ============================================================================
+
+def schedule_compliance_recalculation(pairs: Iterable[Tuple[int, int]]) -> None:
+    """
+    Recalculate compliance for ``(period_id, user_id)`` pairs once the
+    surrounding transaction commits, one aggregate pass per period.
+    """
+    pairs = set(pairs)
+    if pairs:
+        transaction.on_commit(lambda: dispatch_compliance_recalculation(pairs))
+
+
+def dispatch_compliance_recalculation(pairs) -> None:
+    """Hand committed pairs to the configured backend."""
+    backend = get_cpd_approval_setting('COMPLIANCE_BACKEND')
+
+    if backend == 'inline':
+        recalculate_compliance_pairs(pairs)
+        return
+
+    if backend == 'celery' and shared_task is not None:
+        try:
+            recalculate_compliance_task.delay([list(pair) for pair in pairs])
+            return
+        except Exception as e:
+            logger.warning(f"Celery unavailable for compliance recalculation, using thread: {e}")
+
+    global _drain_scheduled, _executor
+    with _pending_lock:
+        _pending_pairs.update(pairs)
+        # A drain already waiting to start will pick these pairs up too
+        if _drain_scheduled:
+            return
+        _drain_scheduled = True
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='cpd-compliance')
+    _executor.submit(_recalculate_in_thread)
+
+
+def _recalculate_in_thread():
+    """Thread entry point; recalculates everything queued so far."""
+    global _drain_scheduled
+    with _pending_lock:
+        pairs = set(_pending_pairs)
+        _pending_pairs.clear()
+        _drain_scheduled = False
+    close_old_connections()
+    try:
+        recalculate_compliance_pairs(pairs)
+    except Exception as e:
+        logger.error(f"CPD compliance recalculation thread failed: {e}")
+    finally:
+        close_old_connections()
+
+
+def recalculate_compliance_pairs(pairs) -> int:
+    """
+    Recalculate compliance for ``(period_id, user_id)`` pairs.
+
+    Returns:
+        Number of compliance rows updated
+    """
+    users_by_period = defaultdict(list)
+    for period_id, user_id in pairs:
+        users_by_period[period_id].append(user_id)
+
+    updated = 0
+    for period in CPDPeriod.objects.filter(pk__in=list(users_by_period)):
+        updated += recalculate_period_compliance(period, users_by_period[period.pk])
+    return updated
+
+
+if shared_task is not None:
+    @shared_task(name='cpd.recalculate_compliance')
+    def recalculate_compliance_task(pairs):
+        recalculate_compliance_pairs([tuple(pair) for pair in pairs])
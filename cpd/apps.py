@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CpdConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'cpd'
+
+    def ready(self):
+        from .analytics import connect_signals
+        connect_signals()
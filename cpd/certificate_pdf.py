@@ -0,0 +1,130 @@
+"""
+CPD compliance certificate PDF layout.
+
+The stylesheet, paragraph styles and the static parts of the page (title,
+headings, footer) are built once per process by ``CertificateRenderer``
+and reused for every certificate; only the member-specific paragraphs are
+created per PDF.
+
+This module imports nothing from Django so that process pool workers can
+load it without configuring Django. Certificates are passed in as the
+plain dicts built by ``cpd.certificates.certificate_inputs``.
+"""
+
+from io import BytesIO
+
+
+# Bump when the layout changes so existing PDFs are regenerated
+LAYOUT_VERSION = 1
+
+ORGANISATION_NAME = "Association of Christian Religious Practitioners (ACRP)"
+
+_renderer = None
+
+
+class CertificateRenderer:
+    """Renders certificate PDFs with styles and static elements built once."""
+
+    def __init__(self):
+        from reportlab.lib.colors import HexColor
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+        from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+        self._doc_class = SimpleDocTemplate
+        self._paragraph = Paragraph
+        self._spacer = Spacer
+        self.pagesize = A4
+
+        styles = getSampleStyleSheet()
+        self.normal_style = styles['Normal']
+        self.title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            spaceAfter=30,
+            alignment=1,  # Center
+            textColor=HexColor('#2c3e50')
+        )
+        self.heading_style = ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=16,
+            spaceAfter=12,
+            textColor=HexColor('#34495e')
+        )
+
+        # Static elements, identical on every certificate
+        self.title = Paragraph("CERTIFICATE OF CPD COMPLIANCE", self.title_style)
+        self.certify_text = Paragraph("This is to certify that", self.normal_style)
+        self.summary_heading = Paragraph("CPD SUMMARY", self.heading_style)
+        self.footer = Paragraph(ORGANISATION_NAME, self.normal_style)
+
+    def render(self, inputs: dict) -> bytes:
+        """Render one certificate and return the PDF bytes."""
+        Paragraph, Spacer = self._paragraph, self._spacer
+
+        story = [
+            self.title,
+            Spacer(1, 20),
+            self.certify_text,
+            Spacer(1, 12),
+            Paragraph(f"<b>{inputs['full_name']}</b>", self.heading_style),
+            Spacer(1, 12),
+            Paragraph(
+                f"has successfully completed the required Continuing Professional Development "
+                f"for the period {inputs['period_name']}",
+                self.normal_style
+            ),
+            Spacer(1, 20),
+            self.summary_heading,
+        ]
+
+        details = [
+            f"Points Earned: {inputs['points_certified']}",
+            f"Hours Completed: {inputs['hours_certified']}",
+            f"Period: {inputs['period_name']}",
+            f"Certificate Number: {inputs['certificate_number']}",
+            f"Issue Date: {inputs['issue_date']}",
+            f"Valid Until: {inputs['expiry_date']}",
+        ]
+        for detail in details:
+            story.append(Paragraph(detail, self.normal_style))
+            story.append(Spacer(1, 6))
+
+        story += [
+            Spacer(1, 30),
+            Paragraph(f"This certificate can be verified at: {inputs['verification_url']}", self.normal_style),
+            Spacer(1, 40),
+            self.footer,
+        ]
+
+        buffer = BytesIO()
+        doc = self._doc_class(
+            buffer,
+            pagesize=self.pagesize,
+            rightMargin=72,
+            leftMargin=72,
+            topMargin=72,
+            bottomMargin=18
+        )
+        doc.build(story)
+        return buffer.getvalue()
+
+
+def get_renderer() -> CertificateRenderer:
+    """The process-wide renderer, built on first use."""
+    global _renderer
+    if _renderer is None:
+        _renderer = CertificateRenderer()
+    return _renderer
+
+
+def init_worker():
+    """Process pool initializer: build the renderer before the first task."""
+    get_renderer()
+
+
+def render_certificate_pdf(inputs: dict) -> bytes:
+    """Render one certificate with the process-wide renderer."""
+    return get_renderer().render(inputs)
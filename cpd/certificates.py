@@ -0,0 +1,243 @@
+"""
+Batch CPD certificate generation.
+
+``generate_compliance_certificate`` used to rebuild the ReportLab
+stylesheet and custom paragraph styles for every certificate and render
+one PDF per call, so issuing a period's certificates at period close ran
+thousands of sequential renders inside one process.
+
+``generate_period_certificates`` renders every valid certificate of a
+period:
+
+1. Certificates are read in primary key chunks with their member and
+   period. Each one is reduced to the plain values printed on it
+   (``certificate_inputs``). A certificate whose stored PDF was rendered
+   from the same values and layout (``content_hash``) is skipped.
+2. The remaining chunk is rendered across a process pool. Each worker
+   builds one ``CertificateRenderer`` (styles and static page elements)
+   when it starts and reuses it for every PDF.
+3. The PDFs are written to storage from the calling process. File names
+   and hashes are saved with one ``bulk_update`` per chunk, and replaced
+   files are deleted afterwards.
+4. Progress and per-certificate failures are recorded on a
+   ``CPDCertificateBatch`` after every chunk.
+
+Settings (``settings.CPD_CERTIFICATES``):
+    WORKERS     - render processes; 1 renders in the calling process
+    CHUNK_SIZE  - certificates read, rendered and saved together
+"""
+
+import hashlib
+import json
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils.timezone import now
+
+from .certificate_pdf import LAYOUT_VERSION, init_worker, render_certificate_pdf
+from .models import CPDCertificate, CPDCertificateBatch, CPDPeriod
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CPD_CERTIFICATE_SETTINGS = {
+    'WORKERS': 2,
+    'CHUNK_SIZE': 200,
+}
+
+# Failures kept on the batch row; the count keeps going past this
+MAX_RECORDED_ERRORS = 100
+
+
+def get_cpd_certificate_setting(name):
+    """Read a CPD_CERTIFICATES setting, falling back to the defaults above."""
+    return getattr(settings, 'CPD_CERTIFICATES', {}).get(name, DEFAULT_CPD_CERTIFICATE_SETTINGS[name])
+
+
+# ============================================================================
+# CERTIFICATE INPUTS
+# ============================================================================
+
+def certificate_inputs(certificate: CPDCertificate) -> dict:
+    """The values printed on a certificate, as plain strings."""
+    site_url = getattr(settings, 'SITE_URL', 'https://acrpafrica.co.za')
+    return {
+        'full_name': certificate.user.get_full_name,
+        'period_name': certificate.period.name,
+        'points_certified': str(certificate.points_certified),
+        'hours_certified': str(certificate.hours_certified),
+        'certificate_number': certificate.certificate_number,
+        'issue_date': certificate.issue_date.strftime('%B %d, %Y'),
+        'expiry_date': certificate.expiry_date.strftime('%B %d, %Y'),
+        'verification_url': f"{site_url}/cpd/verify/{certificate.verification_token}/",
+    }
+
+
+def inputs_fingerprint(inputs: dict) -> str:
+    """Hash of the certificate values and layout version."""
+    payload = json.dumps({'layout': LAYOUT_VERSION, 'inputs': inputs}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def store_certificate_pdf(certificate: CPDCertificate, pdf: bytes, fingerprint: str) -> Optional[str]:
+    """
+    Write a rendered PDF to storage and set ``content_hash`` (the row is
+    not saved). Returns the name of the file it replaced, if any.
+    """
+    old_name = certificate.certificate_file.name if certificate.certificate_file else None
+    certificate.certificate_file.save(f"{certificate.certificate_number}.pdf", ContentFile(pdf), save=False)
+    certificate.content_hash = fingerprint
+    if old_name and old_name != certificate.certificate_file.name:
+        return old_name
+    return None
+
+
+def delete_replaced_files(names: List[str]) -> None:
+    storage = CPDCertificate._meta.get_field('certificate_file').storage
+    for name in names:
+        try:
+            storage.delete(name)
+        except Exception as e:
+            logger.warning(f"Could not delete replaced certificate file {name}: {e}")
+
+
+# ============================================================================
+# BATCH GENERATION
+# ============================================================================
+
+def generate_period_certificates(
+    period: CPDPeriod,
+    started_by=None,
+    force: bool = False,
+    workers: int = None,
+    chunk_size: int = None
+) -> CPDCertificateBatch:
+    """
+    Render the PDFs of every valid certificate in a period.
+
+    Args:
+        period: CPD period
+        started_by: User running the batch
+        force: Re-render certificates whose details have not changed
+        workers: Render processes (default: CPD_CERTIFICATES['WORKERS'])
+        chunk_size: Certificates per chunk (default: CPD_CERTIFICATES['CHUNK_SIZE'])
+
+    Returns:
+        The finished CPDCertificateBatch
+    """
+    workers = workers or get_cpd_certificate_setting('WORKERS')
+    chunk_size = chunk_size or get_cpd_certificate_setting('CHUNK_SIZE')
+
+    certificates = CPDCertificate.objects.filter(
+        period=period, is_valid=True
+    ).select_related('user', 'period')
+
+    batch = CPDCertificateBatch.objects.create(
+        period=period,
+        started_by=started_by,
+        total=certificates.count(),
+    )
+
+    pool = None
+    try:
+        # Fails early (e.g. ReportLab missing) and warms the in-process renderer
+        init_worker()
+        pool = _start_pool(workers)
+
+        last_pk = 0
+        while True:
+            chunk = list(certificates.filter(pk__gt=last_pk).order_by('pk')[:chunk_size])
+            if not chunk:
+                break
+            last_pk = chunk[-1].pk
+            _process_chunk(chunk, batch, pool, force)
+
+        batch.status = CPDCertificateBatch.Status.COMPLETED
+    except Exception as e:
+        logger.error(f"Certificate batch {batch.pk} for period {period.name} failed: {e}")
+        batch.status = CPDCertificateBatch.Status.FAILED
+        batch.errors.append({'certificate': None, 'error': str(e)[:500]})
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        batch.completed_at = now()
+        batch.save(update_fields=['status', 'errors', 'completed_at'])
+
+    logger.info(
+        f"Certificate batch {batch.pk} for period {period.name}: {batch.generated} generated, "
+        f"{batch.skipped} unchanged, {batch.failed} failed"
+    )
+    return batch
+
+
+def _start_pool(workers):
+    if workers <= 1:
+        return None
+    # Spawned workers start clean: no inherited database connections or
+    # locks held by the parent's background threads
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=init_worker,
+    )
+
+
+def _process_chunk(chunk, batch, pool, force):
+    work = []
+    for certificate in chunk:
+        inputs = certificate_inputs(certificate)
+        fingerprint = inputs_fingerprint(inputs)
+        if not force and certificate.certificate_file and certificate.content_hash == fingerprint:
+            batch.skipped += 1
+            continue
+        work.append((certificate, inputs, fingerprint))
+
+    results = _render_all([inputs for _, inputs, _ in work], pool)
+
+    stored = []
+    replaced = []
+    for (certificate, _, fingerprint), result in zip(work, results):
+        try:
+            if isinstance(result, Exception):
+                raise result
+            old_name = store_certificate_pdf(certificate, result, fingerprint)
+        except Exception as e:
+            logger.error(f"Error generating certificate PDF {certificate.certificate_number}: {e}")
+            batch.failed += 1
+            if len(batch.errors) < MAX_RECORDED_ERRORS:
+                batch.errors.append({'certificate': certificate.pk, 'error': str(e)[:500]})
+            continue
+        stored.append(certificate)
+        if old_name:
+            replaced.append(old_name)
+
+    CPDCertificate.objects.bulk_update(stored, ['certificate_file', 'content_hash'])
+    delete_replaced_files(replaced)
+
+    batch.generated += len(stored)
+    batch.save(update_fields=['generated', 'skipped', 'failed', 'errors'])
+
+
+def _render_all(inputs_list, pool):
+    """Render PDFs in order; a failed render yields its exception."""
+    if pool is None:
+        results = []
+        for inputs in inputs_list:
+            try:
+                results.append(render_certificate_pdf(inputs))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    futures = [pool.submit(render_certificate_pdf, inputs) for inputs in inputs_list]
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            results.append(e)
+    return results
@@ -0,0 +1,157 @@
+"""
+Set-based CPD compliance recalculation.
+
+``CPDCompliance.recalculate_compliance`` used to load every approved record
+for the member, sum ``final_points``/``final_hours`` in Python and follow
+``record.activity.category`` per record; ``bulk_recalculate_compliance``
+repeated that for each compliance row with OFFSET slicing.
+
+Here the totals, the category breakdown and the last activity date for
+every member of a period come from one grouped aggregate query over
+approved records (one row per member and category). The compliance rows
+are then updated in memory and written back with ``bulk_update``.
+
+The aggregate expressions mirror the ``CPDRecord.final_points`` and
+``final_hours`` properties: a zero or missing awarded value falls back to
+the claimed value, and hours fall back to the activity duration.
+"""
+
+import logging
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, List
+
+from django.db import transaction
+from django.db.models import DecimalField, Max, Sum, Value
+from django.db.models.functions import Coalesce, NullIf
+from django.utils.timezone import now
+
+from .models import CPDApproval, CPDCompliance, CPDPeriod, CPDRecord
+
+logger = logging.getLogger(__name__)
+
+
+RECALCULATION_BATCH_SIZE = 1000
+
+ZERO = Decimal('0')
+
+FINAL_POINTS = Coalesce(
+    NullIf('points_awarded', Value(ZERO)),
+    NullIf('points_claimed', Value(ZERO)),
+    Value(ZERO),
+    output_field=DecimalField(max_digits=8, decimal_places=2),
+)
+
+FINAL_HOURS = Coalesce(
+    NullIf('hours_awarded', Value(ZERO)),
+    NullIf('hours_claimed', Value(ZERO)),
+    'activity__duration_hours',
+    output_field=DecimalField(max_digits=8, decimal_places=2),
+)
+
+COMPLIANCE_FIELDS = [
+    'total_points_earned', 'total_hours_completed', 'category_breakdown',
+    'points_progress_percentage', 'hours_progress_percentage',
+    'points_deficit', 'hours_deficit', 'compliance_status',
+    'compliance_achieved_date', 'last_activity_date', 'calculated_at',
+]
+
+
+# ============================================================================
+# AGGREGATION
+# ============================================================================
+
+def empty_compliance_totals() -> Dict:
+    """Totals for a member with no approved records."""
+    return {
+        'points': ZERO,
+        'hours': ZERO,
+        'breakdown': {},
+        'last_activity_date': None,
+    }
+
+
+def compute_compliance_totals(period: CPDPeriod, user_ids: List[int] = None) -> Dict[int, Dict]:
+    """
+    Aggregate approved records for a period, per member.
+
+    Returns:
+        {user_id: {'points', 'hours', 'breakdown', 'last_activity_date'}}
+        for members with at least one approved record
+    """
+    records = CPDRecord.objects.filter(
+        period=period,
+        approval__status=CPDApproval.Status.APPROVED
+    )
+    if user_ids:
+        records = records.filter(user_id__in=user_ids)
+
+    rows = records.order_by().values('user_id', 'activity__category_id').annotate(
+        points=Sum(FINAL_POINTS),
+        hours=Sum(FINAL_HOURS),
+        last_date=Max(Coalesce('completion_date', 'attendance_date')),
+    )
+
+    totals = defaultdict(empty_compliance_totals)
+    for row in rows:
+        points = row['points'] or ZERO
+        hours = row['hours'] or ZERO
+        member = totals[row['user_id']]
+        member['points'] += points
+        member['hours'] += hours
+        member['breakdown'][str(row['activity__category_id'])] = {
+            'points': float(points),
+            'hours': float(hours),
+        }
+        last_date = row['last_date']
+        if last_date and (member['last_activity_date'] is None or last_date > member['last_activity_date']):
+            member['last_activity_date'] = last_date
+
+    return dict(totals)
+
+
+# ============================================================================
+# RECALCULATION
+# ============================================================================
+
+def recalculate_period_compliance(
+    period: CPDPeriod,
+    user_ids: List[int] = None,
+    batch_size: int = RECALCULATION_BATCH_SIZE
+) -> int:
+    """
+    Recalculate every compliance row of a period (optionally limited to
+    ``user_ids``) from one aggregate query, writing back in batches.
+
+    Returns number of compliance rows updated.
+    """
+    totals = compute_compliance_totals(period, user_ids)
+
+    compliance_qs = CPDCompliance.objects.filter(period=period).select_related('requirement')
+    if user_ids:
+        compliance_qs = compliance_qs.filter(user_id__in=user_ids)
+
+    calculated_at = now()
+    updated_count = 0
+    batch = []
+
+    for compliance in compliance_qs.order_by('pk').iterator(chunk_size=batch_size):
+        compliance.apply_totals(totals.get(compliance.user_id) or empty_compliance_totals())
+        compliance.calculated_at = calculated_at
+        batch.append(compliance)
+
+        if len(batch) >= batch_size:
+            updated_count += _write_batch(batch)
+            batch = []
+
+    if batch:
+        updated_count += _write_batch(batch)
+
+    logger.info(f"Recalculated {updated_count} compliance records for period {period.name}")
+    return updated_count
+
+
+def _write_batch(batch: List[CPDCompliance]) -> int:
+    with transaction.atomic():
+        CPDCompliance.objects.bulk_update(batch, COMPLIANCE_FIELDS)
+    return len(batch)
@@ -0,0 +1,76 @@
+"""
+Django Management Command: Generate CPD Certificates
+
+Renders the PDF of every valid certificate in a CPD period across a
+process pool and stores it. Certificates whose details have not changed
+since their PDF was rendered are skipped, so the command can be re-run
+after an interruption or after correcting a few certificates. Progress
+and failures are recorded as a CPDCertificateBatch.
+
+File Location: cpd/management/commands/generate_cpd_certificates.py
+
+Usage:
+    python manage.py generate_cpd_certificates                  # Current period
+    python manage.py generate_cpd_certificates --period 3       # One period
+    python manage.py generate_cpd_certificates --workers 4      # Four render processes
+    python manage.py generate_cpd_certificates --force          # Re-render unchanged PDFs too
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from cpd.certificates import generate_period_certificates
+from cpd.models import CPDCertificateBatch, CPDPeriod
+
+
+class Command(BaseCommand):
+    help = 'Render and store the PDF certificates of a CPD period'
+
+    def add_arguments(self, parser):
+        """Define command-line arguments"""
+        parser.add_argument(
+            '--period',
+            type=int,
+            help='CPD period (id); defaults to the current period',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Render processes (default: CPD_CERTIFICATES["WORKERS"]); 1 renders in-process',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            help='Certificates per chunk (default: CPD_CERTIFICATES["CHUNK_SIZE"])',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-render certificates whose details have not changed',
+        )
+
+    def handle(self, *args, **options):
+        if options['period']:
+            try:
+                period = CPDPeriod.objects.get(pk=options['period'])
+            except CPDPeriod.DoesNotExist:
+                raise CommandError(f"CPD period {options['period']} does not exist")
+        else:
+            period = CPDPeriod.objects.filter(is_current=True).first()
+            if period is None:
+                raise CommandError("No current CPD period")
+
+        batch = generate_period_certificates(
+            period,
+            force=options['force'],
+            workers=options['workers'],
+            chunk_size=options['chunk_size'],
+        )
+
+        summary = (
+            f"{period.name}: {batch.generated} generated, {batch.skipped} unchanged, "
+            f"{batch.failed} failed of {batch.total}"
+        )
+        if batch.status == CPDCertificateBatch.Status.FAILED:
+            raise CommandError(f"Certificate batch {batch.pk} failed ({summary})")
+        style = self.style.WARNING if batch.failed else self.style.SUCCESS
+        self.stdout.write(style(summary))
@@ -0,0 +1,43 @@
+"""
+Django Management Command: Rebuild CPD Daily Statistics
+
+Rebuilds the CPDDailyStats rollup read by the analytics timeline when
+CPD_ANALYTICS['USE_DAILY_STATS'] is enabled. Signal handlers keep the rollup
+current during normal use; run this after enabling the table, and after
+imports or bulk updates that bypass model signals.
+
+File Location: cpd/management/commands/rebuild_cpd_daily_stats.py
+
+Usage:
+    python manage.py rebuild_cpd_daily_stats              # Rebuild every period
+    python manage.py rebuild_cpd_daily_stats --period 3   # Rebuild one period
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from cpd.analytics import rebuild_daily_stats
+from cpd.models import CPDPeriod
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the CPD daily statistics rollup from the CPD records'
+
+    def add_arguments(self, parser):
+        """Define command-line arguments"""
+        parser.add_argument(
+            '--period',
+            type=int,
+            help='Only rebuild this CPD period (id)',
+        )
+
+    def handle(self, *args, **options):
+        period = None
+        if options['period']:
+            try:
+                period = CPDPeriod.objects.get(pk=options['period'])
+            except CPDPeriod.DoesNotExist:
+                raise CommandError(f"CPD period {options['period']} does not exist")
+
+        rows = rebuild_daily_stats(period)
+        scope = period.name if period else 'all periods'
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} daily statistics rows for {scope}"))
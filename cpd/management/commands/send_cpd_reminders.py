@@ -0,0 +1,65 @@
+"""
+Django Management Command: Send CPD Deadline Reminders
+
+Queues deadline reminder emails for members who are at risk or
+non-compliant, at the stages in CPD_SETTINGS['NOTIFICATION_REMINDER_DAYS'].
+Each stage is sent once per member and recorded in CPDReminder, so the
+command is safe to run daily from cron and to re-run after an interruption.
+
+File Location: cpd/management/commands/send_cpd_reminders.py
+
+Usage:
+    python manage.py send_cpd_reminders                  # Stage due today, current period
+    python manage.py send_cpd_reminders --period 3       # Stage due today, one period
+    python manage.py send_cpd_reminders --days 14        # Force the 14-day stage
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.template import TemplateDoesNotExist
+
+from cpd.models import CPDPeriod
+from cpd.reminders import REMINDER_CHUNK_SIZE, dispatch_deadline_reminders
+
+
+class Command(BaseCommand):
+    help = 'Queue CPD deadline reminders for members who are behind'
+
+    def add_arguments(self, parser):
+        """Define command-line arguments"""
+        parser.add_argument(
+            '--period',
+            type=int,
+            help='CPD period (id); defaults to the current period',
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            help='Reminder stage to send instead of the one due today',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=REMINDER_CHUNK_SIZE,
+            help=f'Members per transaction (default: {REMINDER_CHUNK_SIZE})',
+        )
+
+    def handle(self, *args, **options):
+        if options['period']:
+            try:
+                period = CPDPeriod.objects.get(pk=options['period'])
+            except CPDPeriod.DoesNotExist:
+                raise CommandError(f"CPD period {options['period']} does not exist")
+        else:
+            period = CPDPeriod.objects.filter(is_current=True).first()
+            if period is None:
+                raise CommandError("No current CPD period")
+
+        try:
+            sent = dispatch_deadline_reminders(
+                period,
+                days_before=options['days'],
+                chunk_size=options['chunk_size'],
+            )
+        except TemplateDoesNotExist as e:
+            raise CommandError(f"Deadline reminder email template {e} is missing")
+        self.stdout.write(self.style.SUCCESS(f"Queued {sent} deadline reminders for {period.name}"))
@@ -801,6 +801,16 @@ class CPDApproval(models.Model):
             models.Index(fields=['status', 'priority']),
             models.Index(fields=['reviewer', 'status']),
             models.Index(fields=['submitted_at', 'reviewed_at']),
+            # Approval queue ordering (see cpd.approval_queue)
+            models.Index(
+                fields=['status', 'priority', 'submitted_at', 'id'],
+                name='cpd_approval_queue_idx'
+            ),
+            models.Index(
+                fields=['priority', 'submitted_at', 'id'],
+                condition=models.Q(status__in=['PENDING', 'UNDER_REVIEW']),
+                name='cpd_approval_open_queue_idx'
+            ),
         ]
 
     def __str__(self):
@@ -918,40 +928,31 @@ class CPDCompliance(models.Model):
 
     def recalculate_compliance(self):
         """Recalculate compliance based on current records."""
-        # Get approved records for this user and period
-        approved_records = self.user.cpd_records.filter(
-            period=self.period,
-            approval__status=CPDApproval.Status.APPROVED
-        )
+        from .compliance import compute_compliance_totals, empty_compliance_totals
         
-        # Calculate totals
-        self.total_points_earned = sum(
-            record.final_points for record in approved_records
-        )
-        self.total_hours_completed = sum(
-            record.final_hours for record in approved_records
-        )
-        
-        # Calculate category breakdown
-        breakdown = {}
-        for record in approved_records:
-            cat_id = str(record.activity.category.id)
-            if cat_id not in breakdown:
-                breakdown[cat_id] = {'points': 0, 'hours': 0}
-            breakdown[cat_id]['points'] += float(record.final_points)
-            breakdown[cat_id]['hours'] += float(record.final_hours)
-        self.category_breakdown = breakdown
+        totals = compute_compliance_totals(self.period_id, [self.user_id])
+        self.apply_totals(totals.get(self.user_id) or empty_compliance_totals())
+        self.save()
+
+    def apply_totals(self, totals):
+        """
+        Set totals, progress, deficits and status from aggregated approved
+        records (see cpd.compliance.compute_compliance_totals). Does not save.
+        """
+        self.total_points_earned = totals['points']
+        self.total_hours_completed = totals['hours']
+        self.category_breakdown = totals['breakdown']
         
         # Calculate progress percentages
         if self.requirement.total_points_required > 0:
-            self.points_progress_percentage = min(
+            self.points_progress_percentage = round(min(
                 100, (self.total_points_earned / self.requirement.total_points_required) * 100
-            )
+            ), 2)
         
         if self.requirement.total_hours_required > 0:
-            self.hours_progress_percentage = min(
+            self.hours_progress_percentage = round(min(
                 100, (self.total_hours_completed / self.requirement.total_hours_required) * 100
-            )
+            ), 2)
         
         # Calculate deficits
         self.points_deficit = max(
@@ -975,14 +976,8 @@ class CPDCompliance(models.Model):
             self.compliance_status = self.Status.NON_COMPLIANT
         
         # Set last activity date
-        if approved_records:
-            self.last_activity_date = max(
-                record.completion_date or record.attendance_date 
-                for record in approved_records 
-                if record.completion_date or record.attendance_date
-            )
-        
-        self.save()
+        if totals['last_activity_date']:
+            self.last_activity_date = totals['last_activity_date']
 
 
 class CPDCertificate(models.Model):
@@ -1017,6 +1012,10 @@ class CPDCertificate(models.Model):
         null=True, blank=True,
         help_text="Generated PDF certificate"
     )
+    content_hash = models.CharField(
+        max_length=64, blank=True,
+        help_text="Fingerprint of the details the PDF was rendered from"
+    )
     
     # Verification
     verification_token = models.UUIDField(default=uuid.uuid4, unique=True)
@@ -1059,6 +1058,92 @@ class CPDCertificate(models.Model):
         return reverse('cpd:verify_certificate', kwargs={'token': self.verification_token})
 
 
+class CPDCertificateBatch(models.Model):
+    """
+    One batch run of certificate PDF generation for a period, written by
+    cpd.certificates while it runs so progress and failures can be followed
+    in the admin.
+    """
+    
+    class Status(models.TextChoices):
+        RUNNING = 'RUNNING', _('Running')
+        COMPLETED = 'COMPLETED', _('Completed')
+        FAILED = 'FAILED', _('Failed')
+    
+    period = models.ForeignKey(
+        CPDPeriod, on_delete=models.CASCADE,
+        related_name='certificate_batches'
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.RUNNING
+    )
+    
+    # Progress tracking
+    total = models.PositiveIntegerField(default=0)
+    generated = models.PositiveIntegerField(default=0)
+    skipped = models.PositiveIntegerField(default=0, help_text="Unchanged since the last PDF")
+    failed = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(
+        default=list, blank=True,
+        help_text="[{'certificate': id, 'error': message}] for failed certificates"
+    )
+    
+    # Administrative fields
+    started_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='cpd_certificate_batches'
+    )
+    started_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-started_at']
+        verbose_name = "CPD Certificate Batch"
+        verbose_name_plural = "CPD Certificate Batches"
+
+    def __str__(self):
+        return f"{self.period.name} certificates ({self.get_status_display()})"
+
+    @property
+    def processed(self):
+        return self.generated + self.skipped + self.failed
+
+
+class CPDDailyStats(models.Model):
+    """
+    Daily rollup of completed CPD records per period, used by the analytics
+    timeline when CPD_ANALYTICS['USE_DAILY_STATS'] is enabled.
+    Maintained incrementally by cpd.analytics and rebuilt by the
+    rebuild_cpd_daily_stats command.
+    """
+    period = models.ForeignKey(
+        CPDPeriod, on_delete=models.CASCADE,
+        related_name='daily_stats'
+    )
+    date = models.DateField()
+    
+    # Totals for records completed on this date
+    records = models.IntegerField(default=0)
+    points = models.DecimalField(
+        max_digits=12, decimal_places=2,
+        default=0,
+        help_text="Sum of awarded points"
+    )
+    
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['period', 'date']
+        unique_together = ['period', 'date']
+        verbose_name = "CPD Daily Statistics"
+        verbose_name_plural = "CPD Daily Statistics"
+
+    def __str__(self):
+        return f"{self.period.name} {self.date}: {self.records} records, {self.points} pts"
+
+
 # ============================================================================
 # AUDIT AND TRACKING MODELS
 # ============================================================================
@@ -1112,4 +1197,38 @@ class CPDAuditLog(models.Model):
         ]
 
     def __str__(self):
-        return f"{self.action} {self.content_type}({self.object_id}) by {self.user} at {self.timestamp}"
\ No newline at end of file
+        return f"{self.action} {self.content_type}({self.object_id}) by {self.user} at {self.timestamp}"
+
+class CPDReminder(models.Model):
+    """
+    Deadline reminders already sent, one per member, period and reminder
+    stage (a day count from CPD_SETTINGS['NOTIFICATION_REMINDER_DAYS']).
+    Written by cpd.reminders in the same transaction that queues the email,
+    so an interrupted campaign resumes without reminding anyone twice.
+    """
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE,
+        related_name='cpd_reminders'
+    )
+    period = models.ForeignKey(
+        CPDPeriod, on_delete=models.CASCADE,
+        related_name='reminders'
+    )
+    days_before = models.PositiveSmallIntegerField(
+        help_text="Reminder stage: days before the submission deadline"
+    )
+    
+    # Compliance at the time of the reminder
+    compliance_status = models.CharField(max_length=20, blank=True)
+    
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-sent_at']
+        unique_together = ['user', 'period', 'days_before']
+        indexes = [
+            models.Index(fields=['period', 'days_before']),
+        ]
+
+    def __str__(self):
+        return f"{self.user} - {self.period.name} ({self.days_before} days)"
@@ -0,0 +1,172 @@
+"""
+CPD deadline reminder campaigns.
+
+``send_deadline_reminders`` used to load every at-risk compliance row with
+all of its member's CPD records prefetched (never read), check one 24-hour
+cache key per member, and render two templates from scratch per member.
+Evicted or expired cache keys meant members could be reminded again.
+
+``dispatch_deadline_reminders`` runs one reminder stage of a period:
+
+1. The stage is the reminder day count from
+   ``CPD_SETTINGS['NOTIFICATION_REMINDER_DAYS']`` that the period's
+   submission deadline has most recently come within. Each stage is sent
+   once per member, so the command can run daily.
+2. Eligible compliance rows (at risk or non-compliant, with an email
+   address, not yet reminded for this stage) are read in chunks of
+   members, ordered by user id. A member with several compliance rows in
+   the period (one per requirement) gets one reminder, for their most
+   severe status. Rows locked by a concurrent run are skipped.
+3. Both templates are loaded and compiled once per run and rendered per
+   member.
+4. Each chunk's ``CPDReminder`` rows and outbox emails are written in one
+   transaction. The outbox worker delivers each batch over one reused
+   connection. An interrupted run resumes at the first member without a
+   reminder row.
+"""
+
+import logging
+from typing import Optional
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.template.loader import get_template
+from django.utils.timezone import now
+
+from app.email_outbox import queue_emails
+
+from .models import CPDCompliance, CPDPeriod, CPDReminder
+
+logger = logging.getLogger(__name__)
+
+
+REMINDER_CHUNK_SIZE = 500
+
+DEFAULT_REMINDER_DAYS = [30, 14, 7, 1]
+
+REMINDER_STATUSES = [
+    CPDCompliance.Status.AT_RISK,
+    CPDCompliance.Status.NON_COMPLIANT,
+]
+
+
+def get_reminder_days():
+    """Reminder stages from CPD_SETTINGS, largest first."""
+    days = getattr(settings, 'CPD_SETTINGS', {}).get('NOTIFICATION_REMINDER_DAYS', DEFAULT_REMINDER_DAYS)
+    return sorted(set(days), reverse=True)
+
+
+def due_reminder_stage(period: CPDPeriod, today=None) -> Optional[int]:
+    """
+    The reminder stage due for ``period`` today: the smallest scheduled day
+    count that the time left before the submission deadline is within, or
+    None before the first stage and after the deadline.
+    """
+    today = today or now().date()
+    days_left = (period.submission_deadline - today).days
+    if days_left < 0:
+        return None
+    due = [days for days in get_reminder_days() if days_left <= days]
+    return min(due) if due else None
+
+
+# ============================================================================
+# CAMPAIGN
+# ============================================================================
+
+def dispatch_deadline_reminders(
+    period: CPDPeriod,
+    days_before: int = None,
+    chunk_size: int = REMINDER_CHUNK_SIZE
+) -> int:
+    """
+    Queue the due deadline reminders for a period.
+
+    Args:
+        period: CPD period
+        days_before: Reminder stage to send; defaults to the stage due today
+        chunk_size: Members handled per transaction
+
+    Returns:
+        Number of reminders queued
+    """
+    if days_before is None:
+        days_before = due_reminder_stage(period)
+        if days_before is None:
+            logger.info(f"No deadline reminder stage due for period {period.name}")
+            return 0
+
+    html_template = get_template('cpd/emails/deadline_reminder.html')
+    text_template = get_template('cpd/emails/deadline_reminder.txt')
+
+    eligible = CPDCompliance.objects.filter(
+        period=period,
+        compliance_status__in=REMINDER_STATUSES,
+        user__email__gt='',
+    ).exclude(
+        Exists(CPDReminder.objects.filter(
+            user_id=OuterRef('user_id'),
+            period=period,
+            days_before=days_before,
+        ))
+    ).select_related('user')
+
+    base_context = {
+        'period': period,
+        'days_remaining': period.days_until_deadline,
+        'site_url': getattr(settings, 'SITE_URL', 'https://acrpafrica.co.za'),
+    }
+    subject = f'CPD Deadline Reminder - {period.days_until_deadline} Days Remaining'
+    from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@acrpafrica.co.za')
+
+    sent = 0
+    last_user_id = 0
+    while True:
+        with transaction.atomic():
+            user_ids = list(
+                eligible.filter(user_id__gt=last_user_id).order_by('user_id')
+                .values_list('user_id', flat=True).distinct()[:chunk_size]
+            )
+            if not user_ids:
+                break
+            last_user_id = user_ids[-1]
+
+            # One row per member: REMINDER_STATUSES runs from least to most severe
+            by_user = {}
+            for compliance in eligible.filter(user_id__in=user_ids).select_for_update(
+                of=('self',), skip_locked=True
+            ).order_by('user_id', 'pk'):
+                current = by_user.get(compliance.user_id)
+                if current is None or (
+                    REMINDER_STATUSES.index(compliance.compliance_status)
+                    > REMINDER_STATUSES.index(current.compliance_status)
+                ):
+                    by_user[compliance.user_id] = compliance
+
+            messages = []
+            reminders = []
+            for compliance in by_user.values():
+                context = dict(base_context, user=compliance.user, compliance=compliance)
+                email = EmailMultiAlternatives(
+                    subject=subject,
+                    body=text_template.render(context),
+                    from_email=from_email,
+                    to=[compliance.user.email],
+                )
+                email.attach_alternative(html_template.render(context), 'text/html')
+                messages.append(email)
+                reminders.append(CPDReminder(
+                    user_id=compliance.user_id,
+                    period=period,
+                    days_before=days_before,
+                    compliance_status=compliance.compliance_status,
+                ))
+
+            CPDReminder.objects.bulk_create(reminders)
+            queue_emails(messages, category='cpd_deadline_reminder')
+            sent += len(messages)
+
+    logger.info(f"Queued {sent} {days_before}-day deadline reminders for period {period.name}")
+    return sent
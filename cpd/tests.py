@@ -1,3 +1,59 @@
-from django.test import TestCase
+import datetime
+from decimal import Decimal
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+
+from accounts.models import User
+from app.models import EmailOutbox
+
+from .models import CPDCompliance, CPDPeriod, CPDReminder, CPDRequirement
+from .reminders import dispatch_deadline_reminders
+
+
+@override_settings(EMAIL_OUTBOX={'BACKEND': 'command'})
+class DeadlineReminderTests(TestCase):
+    def setUp(self):
+        self.period = CPDPeriod.objects.create(
+            name='2026',
+            start_date=datetime.date(2026, 1, 1),
+            end_date=datetime.date(2026, 12, 31),
+            submission_deadline=datetime.date(2027, 1, 31),
+        )
+        self.requirements = [
+            CPDRequirement.objects.create(
+                name=f'Requirement {i}',
+                description='Annual CPD',
+                total_points_required=Decimal('10'),
+                total_hours_required=Decimal('8'),
+                effective_date=datetime.date(2025, 1, 1 + i),
+            )
+            for i in range(2)
+        ]
+
+    def make_compliance(self, user, requirement, status):
+        compliance = CPDCompliance.objects.create(user=user, period=self.period, requirement=requirement)
+        CPDCompliance.objects.filter(pk=compliance.pk).update(compliance_status=status)
+
+    def test_one_reminder_per_member_with_several_requirements(self):
+        member = User.objects.create_user(username='member', email='member@example.com', password='x')
+        other = User.objects.create_user(username='other', email='other@example.com', password='x')
+        self.make_compliance(member, self.requirements[0], CPDCompliance.Status.AT_RISK)
+        self.make_compliance(member, self.requirements[1], CPDCompliance.Status.AT_RISK)
+        self.make_compliance(other, self.requirements[0], CPDCompliance.Status.AT_RISK)
+        self.make_compliance(other, self.requirements[1], CPDCompliance.Status.NON_COMPLIANT)
+
+        sent = dispatch_deadline_reminders(self.period, days_before=30)
+
+        self.assertEqual(sent, 2)
+        self.assertEqual(CPDReminder.objects.filter(period=self.period, days_before=30).count(), 2)
+        self.assertEqual(
+            sorted(email for to in EmailOutbox.objects.values_list('to', flat=True) for email in to),
+            ['member@example.com', 'other@example.com'],
+        )
+        self.assertEqual(
+            CPDReminder.objects.get(user=other).compliance_status,
+            CPDCompliance.Status.NON_COMPLIANT,
+        )
+
+        # The stage is sent once per member
+        self.assertEqual(dispatch_deadline_reminders(self.period, days_before=30), 0)
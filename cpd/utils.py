@@ -18,12 +18,21 @@ from django.db import transaction, connection
 from django.db.models import Count, Sum, Avg, Q, F, Value
 from django.db.models.functions import Coalesce
 from django.core.cache import cache
-from django.core.mail import send_mail
+from django.core.mail import EmailMultiAlternatives, send_mail
 from django.template.loader import render_to_string
 from django.conf import settings
 from django.utils.timezone import now
 from django.contrib.auth import get_user_model
 
+from app.email_outbox import queue_email, queue_emails
+
+from .certificate_pdf import get_renderer
+from .certificates import (
+    certificate_inputs, delete_replaced_files, inputs_fingerprint, store_certificate_pdf
+)
+from .compliance import recalculate_period_compliance
+from .reminders import dispatch_deadline_reminders
+
 from .models import (
     CPDRecord, CPDApproval, CPDCompliance, CPDAuditLog,
     CPDActivity, CPDPeriod, CPDRequirement, CPDCertificate
@@ -138,36 +147,12 @@ def bulk_recalculate_compliance(period: CPDPeriod, user_ids: List[int] = None) -
     """
     Efficiently recalculate compliance for multiple users.
     
-    Uses bulk operations and optimized queries for large datasets.
+    Totals come from one grouped aggregate query and rows are written
+    back with bulk_update (see cpd.compliance).
     Returns number of records updated.
     """
     try:
-        # Get compliance records to update
-        compliance_qs = CPDCompliance.objects.filter(period=period)
-        
-        if user_ids:
-            compliance_qs = compliance_qs.filter(user_id__in=user_ids)
-        
-        updated_count = 0
-        
-        # Process in batches for memory efficiency
-        batch_size = 100
-        compliance_records = compliance_qs.select_related('user', 'requirement')
-        
-        for i in range(0, compliance_records.count(), batch_size):
-            batch = compliance_records[i:i + batch_size]
-            
-            with transaction.atomic():
-                for compliance in batch:
-                    compliance.recalculate_compliance()
-                    updated_count += 1
-        
-        # Clear related caches
-        cache_pattern = f"compliance_*_{period.id}"
-        # Note: In production, use Redis with pattern deletion
-        
-        logger.info(f"Bulk recalculated {updated_count} compliance records for period {period.name}")
-        return updated_count
+        return recalculate_period_compliance(period, user_ids)
         
     except Exception as e:
         logger.error(f"Error in bulk compliance recalculation: {e}")
@@ -178,64 +163,76 @@ def bulk_recalculate_compliance(period: CPDPeriod, user_ids: List[int] = None) -
 # NOTIFICATION UTILITIES
 # ============================================================================
 
+def build_approval_notification(approval: CPDApproval) -> Optional[EmailMultiAlternatives]:
+    """
+    Build the email telling the user about an approval decision.
+    
+    Returns None for statuses that are not notified.
+    """
+    user = approval.record.user
+    activity_title = approval.record.activity.title
+    
+    # Determine email template and subject based on status
+    template_map = {
+        CPDApproval.Status.APPROVED: {
+            'template': 'cpd/emails/approval_approved.html',
+            'subject': f'CPD Activity Approved: {activity_title}'
+        },
+        CPDApproval.Status.REJECTED: {
+            'template': 'cpd/emails/approval_rejected.html',
+            'subject': f'CPD Activity Rejected: {activity_title}'
+        },
+        CPDApproval.Status.NEEDS_MORE_INFO: {
+            'template': 'cpd/emails/approval_more_info.html',
+            'subject': f'CPD Activity Needs More Information: {activity_title}'
+        }
+    }
+    
+    if approval.status not in template_map:
+        return None
+    
+    email_config = template_map[approval.status]
+    
+    # Render email content
+    context = {
+        'user': user,
+        'approval': approval,
+        'record': approval.record,
+        'activity': approval.record.activity,
+        'site_url': getattr(settings, 'SITE_URL', 'https://acrpafrica.co.za'),
+    }
+    
+    html_content = render_to_string(email_config['template'], context)
+    plain_content = render_to_string(
+        email_config['template'].replace('.html', '.txt'), 
+        context
+    )
+    
+    email = EmailMultiAlternatives(
+        subject=email_config['subject'],
+        body=plain_content,
+        from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@acrpafrica.co.za'),
+        to=[user.email],
+    )
+    email.attach_alternative(html_content, 'text/html')
+    return email
+
+
 def send_approval_notification(approval: CPDApproval) -> bool:
     """
     Send notification to user about approval decision.
     
-    Optimized with email queuing and template caching.
-    Returns True if sent successfully.
+    The email is queued in the outbox and delivered by its worker.
+    Returns True if queued successfully.
     """
     try:
-        user = approval.record.user
-        activity_title = approval.record.activity.title
-        
-        # Determine email template and subject based on status
-        template_map = {
-            CPDApproval.Status.APPROVED: {
-                'template': 'cpd/emails/approval_approved.html',
-                'subject': f'CPD Activity Approved: {activity_title}'
-            },
-            CPDApproval.Status.REJECTED: {
-                'template': 'cpd/emails/approval_rejected.html',
-                'subject': f'CPD Activity Rejected: {activity_title}'
-            },
-            CPDApproval.Status.NEEDS_MORE_INFO: {
-                'template': 'cpd/emails/approval_more_info.html',
-                'subject': f'CPD Activity Needs More Information: {activity_title}'
-            }
-        }
-        
-        if approval.status not in template_map:
+        email = build_approval_notification(approval)
+        if email is None:
             return False
         
-        email_config = template_map[approval.status]
-        
-        # Render email content
-        context = {
-            'user': user,
-            'approval': approval,
-            'record': approval.record,
-            'activity': approval.record.activity,
-            'site_url': getattr(settings, 'SITE_URL', 'https://acrpafrica.co.za'),
-        }
-        
-        html_content = render_to_string(email_config['template'], context)
-        plain_content = render_to_string(
-            email_config['template'].replace('.html', '.txt'), 
-            context
-        )
-        
-        # Send email (in production, use Celery for async sending)
-        send_mail(
-            subject=email_config['subject'],
-            message=plain_content,
-            html_message=html_content,
-            from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@acrpafrica.co.za'),
-            recipient_list=[user.email],
-            fail_silently=False
-        )
+        queue_email(email, category='cpd_approval')
         
-        logger.info(f"Approval notification sent to {user.email} for {activity_title}")
+        logger.info(f"Approval notification queued for {approval.record.user.email} for {approval.record.activity.title}")
         return True
         
     except Exception as e:
@@ -276,58 +273,16 @@ def send_registration_confirmation(user: User, activity: CPDActivity) -> bool:
         return False
 
 
-def send_deadline_reminders(period: CPDPeriod, days_before: int = 30) -> int:
+def send_deadline_reminders(period: CPDPeriod, days_before: int = None) -> int:
     """
     Send deadline reminder emails to users who are behind.
     
-    Optimized bulk email sending for compliance reminders.
-    Returns number of emails sent.
+    Runs the reminder stage due today (or ``days_before``) through
+    cpd.reminders, which records each reminder so nobody gets the same
+    stage twice. Returns number of emails queued.
     """
     try:
-        # Get users who are not compliant and need reminders
-        at_risk_compliance = CPDCompliance.objects.filter(
-            period=period,
-            compliance_status__in=[
-                CPDCompliance.Status.AT_RISK,
-                CPDCompliance.Status.NON_COMPLIANT
-            ]
-        ).select_related('user').prefetch_related('user__cpd_records')
-        
-        emails_sent = 0
-        
-        for compliance in at_risk_compliance:
-            # Check if reminder already sent recently
-            cache_key = f"reminder_sent_{compliance.user.id}_{period.id}"
-            if cache.get(cache_key):
-                continue
-            
-            context = {
-                'user': compliance.user,
-                'compliance': compliance,
-                'period': period,
-                'days_remaining': period.days_until_deadline,
-                'site_url': getattr(settings, 'SITE_URL', 'https://acrpafrica.co.za'),
-            }
-            
-            html_content = render_to_string('cpd/emails/deadline_reminder.html', context)
-            plain_content = render_to_string('cpd/emails/deadline_reminder.txt', context)
-            
-            send_mail(
-                subject=f'CPD Deadline Reminder - {days_before} Days Remaining',
-                message=plain_content,
-                html_message=html_content,
-                from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@acrpafrica.co.za'),
-                recipient_list=[compliance.user.email],
-                fail_silently=True
-            )
-            
-            # Cache to prevent duplicate reminders (24 hours)
-            cache.set(cache_key, True, 86400)
-            emails_sent += 1
-        
-        logger.info(f"Sent {emails_sent} deadline reminder emails for period {period.name}")
-        return emails_sent
-        
+        return dispatch_deadline_reminders(period, days_before=days_before)
     except Exception as e:
         logger.error(f"Error sending deadline reminders: {e}")
         return 0
@@ -341,124 +296,24 @@ def generate_compliance_certificate(certificate: CPDCertificate) -> Optional[str
     """
     Generate PDF compliance certificate.
     
-    Optimized for batch generation and caching.
+    Uses the process-wide renderer from cpd.certificate_pdf, so styles are
+    built once per process; cpd.certificates renders whole periods.
     Returns file path if successful, None if failed.
     """
     try:
-        # Import PDF generation libraries (ReportLab recommended)
         try:
-            from reportlab.pdfgen import canvas
-            from reportlab.lib.pagesizes import letter, A4
-            from reportlab.lib.colors import HexColor
-            from reportlab.lib.units import inch
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+            renderer = get_renderer()
         except ImportError:
             logger.error("ReportLab not installed. Cannot generate PDF certificates.")
             return None
         
-        # Create PDF buffer
-        buffer = BytesIO()
-        
-        # Create PDF document
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=A4,
-            rightMargin=72,
-            leftMargin=72,
-            topMargin=72,
-            bottomMargin=18
-        )
-        
-        # Build content
-        story = []
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            spaceAfter=30,
-            alignment=1,  # Center
-            textColor=HexColor('#2c3e50')
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=16,
-            spaceAfter=12,
-            textColor=HexColor('#34495e')
-        )
+        inputs = certificate_inputs(certificate)
+        pdf_content = renderer.render(inputs)
         
-        # Certificate content
-        story.append(Paragraph("CERTIFICATE OF CPD COMPLIANCE", title_style))
-        story.append(Spacer(1, 20))
-        
-        story.append(Paragraph("This is to certify that", styles['Normal']))
-        story.append(Spacer(1, 12))
-        
-        story.append(Paragraph(
-            f"<b>{certificate.user.get_full_name}</b>", 
-            heading_style
-        ))
-        story.append(Spacer(1, 12))
-        
-        story.append(Paragraph(
-            f"has successfully completed the required Continuing Professional Development "
-            f"for the period {certificate.period.name}", 
-            styles['Normal']
-        ))
-        story.append(Spacer(1, 20))
-        
-        # CPD Details
-        story.append(Paragraph("CPD SUMMARY", heading_style))
-        
-        details = [
-            f"Points Earned: {certificate.points_certified}",
-            f"Hours Completed: {certificate.hours_certified}",
-            f"Period: {certificate.period.name}",
-            f"Certificate Number: {certificate.certificate_number}",
-            f"Issue Date: {certificate.issue_date.strftime('%B %d, %Y')}",
-            f"Valid Until: {certificate.expiry_date.strftime('%B %d, %Y')}"
-        ]
-        
-        for detail in details:
-            story.append(Paragraph(detail, styles['Normal']))
-            story.append(Spacer(1, 6))
-        
-        story.append(Spacer(1, 30))
-        
-        # Verification
-        story.append(Paragraph(
-            f"This certificate can be verified at: "
-            f"{getattr(settings, 'SITE_URL', 'https://acrpafrica.co.za')}/cpd/verify/{certificate.verification_token}/",
-            styles['Normal']
-        ))
-        
-        story.append(Spacer(1, 40))
-        
-        # Footer
-        story.append(Paragraph(
-            "Association of Christian Religious Practitioners (ACRP)",
-            styles['Normal']
-        ))
-        
-        # Build PDF
-        doc.build(story)
-        
-        # Get PDF content
-        pdf_content = buffer.getvalue()
-        buffer.close()
-        
-        # Save to file field
-        from django.core.files.base import ContentFile
-        pdf_file = ContentFile(pdf_content)
-        pdf_file.name = f"{certificate.certificate_number}.pdf"
-        
-        certificate.certificate_file = pdf_file
+        old_name = store_certificate_pdf(certificate, pdf_content, inputs_fingerprint(inputs))
         certificate.save()
+        if old_name:
+            delete_replaced_files([old_name])
         
         logger.info(f"Generated certificate PDF for {certificate.certificate_number}")
         return certificate.certificate_file.name
@@ -472,16 +327,53 @@ def generate_compliance_certificate(certificate: CPDCertificate) -> Optional[str
 # DATA EXPORT UTILITIES
 # ============================================================================
 
+# CSV layouts: (header, value) pairs for one compliance row
+COMPLIANCE_EXPORT_COLUMNS = [
+    ('User ID', lambda c: c.user.id),
+    ('Full Name', lambda c: c.user.get_full_name),
+    ('Email', lambda c: c.user.email),
+    ('Council', lambda c: c.requirement.get_council_display()),
+    ('User Level', lambda c: c.requirement.get_user_level_display()),
+    ('Points Required', lambda c: c.requirement.total_points_required),
+    ('Points Earned', lambda c: c.total_points_earned),
+    ('Hours Required', lambda c: c.requirement.total_hours_required),
+    ('Hours Completed', lambda c: c.total_hours_completed),
+    ('Compliance Status', lambda c: c.get_compliance_status_display()),
+    ('Progress Percentage', lambda c: c.points_progress_percentage),
+    ('Last Activity Date', lambda c: c.last_activity_date.strftime('%Y-%m-%d') if c.last_activity_date else ''),
+]
+
+# Layout of the CSV download on the compliance report page
+COMPLIANCE_REPORT_COLUMNS = [
+    ('User', lambda c: c.user.get_full_name),
+    ('Email', lambda c: c.user.email),
+    ('Council', lambda c: c.requirement.get_council_display()),
+    ('User Level', lambda c: c.requirement.get_user_level_display()),
+    ('Points Required', lambda c: c.requirement.total_points_required),
+    ('Points Earned', lambda c: c.total_points_earned),
+    ('Hours Required', lambda c: c.requirement.total_hours_required),
+    ('Hours Completed', lambda c: c.total_hours_completed),
+    ('Compliance Status', lambda c: c.get_compliance_status_display()),
+    ('Progress %', lambda c: c.points_progress_percentage),
+]
+
+
 def export_compliance_data(
     period: CPDPeriod, 
     format_type: str = 'csv',
-    filters: Dict[str, Any] = None
+    filters: Dict[str, Any] = None,
+    on_progress=None,
+    columns=None
 ) -> Optional[BytesIO]:
     """
     Export compliance data in various formats.
     
     Optimized for large datasets with streaming and pagination.
+    ``on_progress(processed, total)`` is called every 1000 rows and once
+    at the end with the number of rows written. ``columns`` defaults to
+    COMPLIANCE_EXPORT_COLUMNS.
     """
+    columns = columns or COMPLIANCE_EXPORT_COLUMNS
     try:
         # Build queryset with filters
         compliance_qs = CPDCompliance.objects.filter(
@@ -492,11 +384,16 @@ def export_compliance_data(
             if filters.get('council'):
                 compliance_qs = compliance_qs.filter(requirement__council=filters['council'])
             
+            if filters.get('user_level'):
+                compliance_qs = compliance_qs.filter(requirement__user_level=filters['user_level'])
+            
             if filters.get('compliance_status'):
                 compliance_qs = compliance_qs.filter(
                     compliance_status__in=filters['compliance_status']
                 )
         
+        total = compliance_qs.count() if on_progress else 0
+        
         if format_type == 'csv':
             import csv
             
@@ -508,30 +405,21 @@ def export_compliance_data(
             writer = csv.writer(text_buffer)
             
             # Headers
-            writer.writerow([
-                'User ID', 'Full Name', 'Email', 'Council', 'User Level',
-                'Points Required', 'Points Earned', 'Hours Required', 'Hours Completed',
-                'Compliance Status', 'Progress Percentage', 'Last Activity Date'
-            ])
+            writer.writerow([header for header, _ in columns])
             
             # Data rows (use iterator for memory efficiency)
-            for compliance in compliance_qs.iterator(chunk_size=1000):
-                writer.writerow([
-                    compliance.user.id,
-                    compliance.user.get_full_name,
-                    compliance.user.email,
-                    compliance.requirement.get_council_display(),
-                    compliance.requirement.get_user_level_display(),
-                    compliance.requirement.total_points_required,
-                    compliance.total_points_earned,
-                    compliance.requirement.total_hours_required,
-                    compliance.total_hours_completed,
-                    compliance.get_compliance_status_display(),
-                    compliance.points_progress_percentage,
-                    compliance.last_activity_date.strftime('%Y-%m-%d') if compliance.last_activity_date else ''
-                ])
+            processed = 0
+            for processed, compliance in enumerate(compliance_qs.iterator(chunk_size=1000), 1):
+                if on_progress and processed % 1000 == 0:
+                    on_progress(processed, total)
+                writer.writerow([value(compliance) for _, value in columns])
+            
+            if on_progress:
+                on_progress(processed, total)
             
             text_buffer.flush()
+            # Detach so closing the wrapper does not close the returned buffer
+            text_buffer.detach()
             buffer.seek(0)
             
             logger.info(f"Exported compliance data to CSV for period {period.name}")
@@ -546,6 +434,41 @@ def export_compliance_data(
         return None
 
 
+def run_compliance_export_job(job):
+    """
+    ExportJob handler for ``cpd_compliance``.
+    
+    Job parameters: ``period_id`` plus optional ``council``, ``user_level``
+    and ``compliance_status`` filters ('ALL' means no filter).
+    """
+    from django.http import HttpResponse
+    
+    params = job.parameters
+    period = CPDPeriod.objects.get(pk=params['period_id'])
+    filters = {
+        'council': params.get('council') if params.get('council') != 'ALL' else None,
+        'user_level': params.get('user_level') if params.get('user_level') != 'ALL' else None,
+        'compliance_status': params.get('compliance_status'),
+    }
+    
+    def on_progress(processed, total):
+        job.set_progress(processed, total)
+        job.row_count = processed
+    
+    # Same columns as the CSV the report page used to build inline
+    buffer = export_compliance_data(
+        period, 'csv', filters,
+        on_progress=on_progress,
+        columns=COMPLIANCE_REPORT_COLUMNS
+    )
+    if buffer is None:
+        raise RuntimeError(f"Compliance export failed for period {period.name}")
+    
+    response = HttpResponse(buffer.getvalue(), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="cpd_compliance_{period.name}.csv"'
+    return response
+
+
 # ============================================================================
 # PERFORMANCE OPTIMIZATION UTILITIES
 # ============================================================================
@@ -22,6 +22,16 @@ from decimal import Decimal
 import json
 import csv
 from io import StringIO, BytesIO
+from urllib.parse import urlencode
+
+from app.export_jobs import enqueue_export
+from app.system_stats import get_system_stats
+
+from .analytics import get_activity_rollups, get_timeline
+from .approval_queue import (
+    count_queue, get_queue_counts, get_queue_page, next_in_queue, previous_in_queue
+)
+from .approvals import apply_bulk_decision, schedule_compliance_recalculation
 
 from .models import (
     CPDProvider, CPDCategory, CPDRequirement, CPDActivity, 
@@ -764,11 +774,11 @@ def approval_queue(request):
     priority_filter = request.GET.get('priority', 'all')
     category_filter = request.GET.get('category', 'all')
     
-    # Base queryset
+    # Base queryset (ordered by the queue's keyset pagination)
     approvals = CPDApproval.objects.select_related(
         'record__user', 'record__activity__provider', 
         'record__activity__category', 'reviewer'
-    ).order_by('priority', 'submitted_at')
+    )
     
     # Apply filters
     if status_filter != 'all':
@@ -789,38 +799,36 @@ def approval_queue(request):
         except (CPDCategory.DoesNotExist, ValueError):
             pass
     
-    # Pagination
-    paginator = Paginator(approvals, 20)
-    page_number = request.GET.get('page')
-    approvals_page = paginator.get_page(page_number)
+    # Keyset pagination in queue order
+    approvals_page = get_queue_page(
+        approvals,
+        cursor=request.GET.get('cursor'),
+        direction=request.GET.get('direction', 'next'),
+    )
     
-    # Summary statistics
-    stats = {
-        'pending_count': CPDApproval.objects.filter(
-            status__in=[CPDApproval.Status.PENDING, CPDApproval.Status.UNDER_REVIEW]
-        ).count(),
-        'urgent_count': CPDApproval.objects.filter(
-            status=CPDApproval.Status.PENDING,
-            priority=CPDApproval.Priority.URGENT
-        ).count(),
-        'overdue_count': CPDApproval.objects.filter(
-            status=CPDApproval.Status.PENDING,
-            submitted_at__lt=now() - timedelta(days=7)
-        ).count(),
-    }
+    # Summary statistics from the maintained counters
+    counters = get_system_stats()
+    stats = get_queue_counts(counters)
+    queue_total = None
+    if category_filter == 'all':
+        queue_total = count_queue(status_filter, priority_filter, counters)
     
     # Filter options
     categories = CPDCategory.objects.filter(is_active=True).order_by('name')
     
+    current_filters = {
+        'status': status_filter,
+        'priority': priority_filter,
+        'category': category_filter,
+    }
+    
     context = {
         'approvals': approvals_page,
+        'queue_total': queue_total,
         'stats': stats,
         'categories': categories,
-        'current_filters': {
-            'status': status_filter,
-            'priority': priority_filter,
-            'category': category_filter,
-        },
+        'current_filters': current_filters,
+        'filter_query': urlencode(current_filters),
         'bulk_form': BulkApprovalForm(),
     }
     
@@ -864,27 +872,19 @@ def approval_detail(request, pk):
                 notes=f"Approval decision: {approval.get_status_display()}"
             )
             
-            # Update user compliance if approved
+            # Update user compliance once the decision is committed
             if approval.status == CPDApproval.Status.APPROVED:
-                try:
-                    compliance = CPDCompliance.objects.get(
-                        user=approval.record.user,
-                        period=approval.record.period
-                    )
-                    compliance.recalculate_compliance()
-                except CPDCompliance.DoesNotExist:
-                    pass
+                schedule_compliance_recalculation(
+                    [(approval.record.period_id, approval.record.user_id)]
+                )
             
             messages.success(
                 request,
                 f"Approval decision recorded: {approval.get_status_display()}"
             )
             
-            # Redirect to next pending approval or back to queue
-            next_approval = CPDApproval.objects.filter(
-                status=CPDApproval.Status.PENDING,
-                pk__gt=approval.pk
-            ).first()
+            # Redirect to next pending approval in queue order or back to queue
+            next_approval = next_in_queue(approval)
             
             if next_approval:
                 return redirect('cpd:approval_detail', pk=next_approval.pk)
@@ -902,6 +902,8 @@ def approval_detail(request, pk):
         'form': form,
         'recommended_points': recommended_points,
         'evidence_files': approval.record.evidence_files.all(),
+        'previous_in_queue': previous_in_queue(approval),
+        'next_in_queue': next_in_queue(approval),
     }
     
     return render(request, 'cpd/approval_detail.html', context)
@@ -919,38 +921,10 @@ def bulk_approval(request):
         record_ids = form.cleaned_data['selected_records']
         bulk_comments = form.cleaned_data['bulk_comments']
         
-        # Get approvals to update
-        approvals = CPDApproval.objects.filter(id__in=record_ids)
-        
-        updated_count = 0
-        
-        for approval in approvals:
-            if action == 'approve':
-                approval.status = CPDApproval.Status.APPROVED
-                approval.reviewer = request.user
-                approval.reviewed_at = now()
-                if bulk_comments:
-                    approval.reviewer_comments = bulk_comments
-                
-            elif action == 'reject':
-                approval.status = CPDApproval.Status.REJECTED
-                approval.reviewer = request.user
-                approval.reviewed_at = now()
-                if bulk_comments:
-                    approval.rejection_reason = bulk_comments
-                
-            elif action == 'priority_high':
-                approval.priority = CPDApproval.Priority.HIGH
-                
-            elif action == 'priority_normal':
-                approval.priority = CPDApproval.Priority.NORMAL
-            
-            approval.save()
-            updated_count += 1
-            
-            # Send notifications for status changes
-            if action in ['approve', 'reject']:
-                send_approval_notification(approval)
+        # Apply the decision to the whole selection at once
+        updated_count = apply_bulk_decision(
+            record_ids, action, request.user, comments=bulk_comments
+        )
         
         messages.success(
             request,
@@ -995,51 +969,11 @@ def analytics_dashboard(request):
         avg_hours=Avg('total_hours_completed'),
     )
     
-    # Activity statistics
-    activity_stats = CPDActivity.objects.filter(
-        records__period=period
-    ).aggregate(
-        total_activities=Count('id', distinct=True),
-        avg_participants=Avg('records__count'),
-        avg_rating=Avg('average_rating'),
-    )
-    
-    # Category breakdown
-    category_stats = CPDCategory.objects.annotate(
-        total_records=Count('activities__records', filter=Q(activities__records__period=period)),
-        total_points=Sum('activities__records__points_awarded', 
-                        filter=Q(activities__records__period=period)),
-        avg_rating=Avg('activities__average_rating')
-    ).filter(total_records__gt=0).order_by('-total_records')
-    
-    # Provider performance
-    provider_stats = CPDProvider.objects.annotate(
-        total_activities=Count('activities', filter=Q(activities__records__period=period)),
-        total_participants=Count('activities__records', filter=Q(activities__records__period=period)),
-        avg_rating=Avg('activities__average_rating')
-    ).filter(total_activities__gt=0).order_by('-total_participants')[:10]
+    # Activity, category and provider statistics from one grouped query
+    activity_stats, category_stats, provider_stats = get_activity_rollups(period)
     
     # Timeline data for charts
-    timeline_data = []
-    start_date = period.start_date
-    current_date = start_date
-    
-    while current_date <= min(period.end_date, now().date()):
-        day_records = CPDRecord.objects.filter(
-            period=period,
-            completion_date=current_date
-        ).aggregate(
-            count=Count('id'),
-            points=Sum('points_awarded')
-        )
-        
-        timeline_data.append({
-            'date': current_date.strftime('%Y-%m-%d'),
-            'records': day_records['count'] or 0,
-            'points': float(day_records['points'] or 0),
-        })
-        
-        current_date += timedelta(days=1)
+    timeline_data = get_timeline(period)
     
     # Risk analysis - users falling behind
     at_risk_users = CPDCompliance.objects.filter(
@@ -1110,31 +1044,15 @@ def generate_report(request):
                 return render(request, 'cpd/reports/compliance_report.html', context)
             
             elif report_format == 'csv':
-                response = HttpResponse(content_type='text/csv')
-                response['Content-Disposition'] = f'attachment; filename="cpd_compliance_{period.name}.csv"'
-                
-                writer = csv.writer(response)
-                writer.writerow([
-                    'User', 'Email', 'Council', 'User Level', 'Points Required',
-                    'Points Earned', 'Hours Required', 'Hours Completed',
-                    'Compliance Status', 'Progress %'
-                ])
-                
-                for record in compliance_records:
-                    writer.writerow([
-                        record.user.get_full_name,
-                        record.user.email,
-                        record.requirement.get_council_display(),
-                        record.requirement.get_user_level_display(),
-                        record.requirement.total_points_required,
-                        record.total_points_earned,
-                        record.requirement.total_hours_required,
-                        record.total_hours_completed,
-                        record.get_compliance_status_display(),
-                        record.points_progress_percentage
-                    ])
-                
-                return response
+                # Large periods are exported by a background job
+                job = enqueue_export('cpd_compliance', request.user, {
+                    'period_id': period.pk,
+                    'council': council,
+                    'user_level': user_level,
+                    'compliance_status': list(compliance_status or []),
+                })
+                messages.info(request, "Your report is being generated. You can download it from this page when it is ready.")
+                return redirect(job.get_absolute_url())
             
             # Add PDF and Excel generation here
             else:
@@ -0,0 +1,288 @@
+"""
+Unified application index.
+
+Associated, Designated and Student applications live in three separate
+tables. The staff application list used to load all three into Python,
+merge, sort, count and paginate them in memory. This module builds a single
+SQL UNION over the three tables instead, so filtering, ordering, facet
+counts and keyset pagination all happen in the database and a page view
+only ever materialises one page of rows.
+
+Ordering is ``created_at DESC, type_rank DESC, id DESC``. ``type_rank`` is a
+constant per application model, which makes the sort key unique across the
+union and lets us use ``(created_at, type_rank, id)`` as a keyset cursor.
+"""
+import base64
+import binascii
+import json
+import logging
+from datetime import datetime
+
+from django.db.models import Case, CharField, Count, F, IntegerField, Q, Value, When
+from django.db.models.functions import Concat
+
+from .models import AssociatedApplication, DesignatedApplication, StudentApplication
+
+logger = logging.getLogger(__name__)
+
+
+# (app_type, model, display label, sort rank)
+APPLICATION_TYPES = (
+    ('associated', AssociatedApplication, 'Associated', 1),
+    ('designated', DesignatedApplication, 'Designated', 2),
+    ('student', StudentApplication, 'Learner', 3),
+)
+
+# Columns selected by every branch of the UNION, in the same order.
+INDEX_FIELDS = (
+    'id', 'application_number', 'status', 'email', 'created_at', 'submitted_at',
+)
+INDEX_ANNOTATIONS = (
+    'app_type', 'type', 'type_rank', 'council', 'council_name',
+    'affiliation_type', 'name', 'extra_info',
+)
+
+DEFAULT_PAGE_SIZE = 25
+
+
+# ============================================================================
+# QUERYSET CONSTRUCTION
+# ============================================================================
+
+def _extra_info_expression(app_type):
+    """Per-type secondary label shown in the list (institution / category)."""
+    if app_type == 'student':
+        return F('current_institution')
+    if app_type == 'designated':
+        return F('designation_category__name')
+    return Value(None, output_field=CharField())
+
+
+def filter_applications(qs, filters):
+    """
+    Apply the standard application list filters to a single model queryset.
+
+    Args:
+        qs: Queryset for one application model
+        filters: Dict with any of search_query, council, affiliation_type,
+            status, date_from, date_to
+
+    Returns:
+        Filtered queryset
+    """
+    if not filters:
+        return qs
+
+    if filters.get('council'):
+        qs = qs.filter(onboarding_session__selected_council=filters['council'])
+    if filters.get('affiliation_type'):
+        qs = qs.filter(onboarding_session__selected_affiliation_type=filters['affiliation_type'])
+    if filters.get('status'):
+        qs = qs.filter(status=filters['status'])
+    if filters.get('date_from'):
+        qs = qs.filter(created_at__date__gte=filters['date_from'])
+    if filters.get('date_to'):
+        qs = qs.filter(created_at__date__lte=filters['date_to'])
+    if filters.get('search_query'):
+        search_query = filters['search_query']
+        qs = qs.filter(
+            Q(full_names__icontains=search_query) |
+            Q(email__icontains=search_query) |
+            Q(application_number__icontains=search_query)
+        )
+    return qs
+
+
+def selected_application_types(filters):
+    """Return the APPLICATION_TYPES entries allowed by the app_type filter."""
+    app_type_filter = (filters or {}).get('app_type')
+    return [
+        entry for entry in APPLICATION_TYPES
+        if not app_type_filter or entry[0] == app_type_filter
+    ]
+
+
+def _index_branch(app_type, model, label, rank, filters):
+    """Build one ``.values()`` branch of the UNION for a single model."""
+    qs = filter_applications(model.objects.all(), filters)
+    return qs.annotate(
+        app_type=Value(app_type, output_field=CharField()),
+        type=Value(label, output_field=CharField()),
+        type_rank=Value(rank, output_field=IntegerField()),
+        council=F('onboarding_session__selected_council__code'),
+        council_name=F('onboarding_session__selected_council__name'),
+        affiliation_type=F('onboarding_session__selected_affiliation_type__name'),
+        name=Case(
+            When(~Q(preferred_name=''), then=F('preferred_name')),
+            default=Concat('full_names', Value(' '), 'surname'),
+            output_field=CharField(),
+        ),
+        extra_info=_extra_info_expression(app_type),
+    ).values(*INDEX_FIELDS, *INDEX_ANNOTATIONS).order_by()
+
+
+def build_application_index(filters=None, cursor=None, direction='next'):
+    """
+    Build the unified (UNION) queryset of all application types.
+
+    Args:
+        filters: Optional filter dict, see ``filter_applications``. An
+            ``app_type`` key restricts the union to a single model.
+        cursor: Optional decoded keyset cursor ``(created_at, rank, id)``.
+            Rows strictly after (``direction='next'``) or before
+            (``direction='previous'``) the cursor are returned.
+        direction: 'next' or 'previous'
+
+    Returns:
+        Ordered values queryset, or None if no application type matches.
+    """
+    branches = []
+    for app_type, model, label, rank in selected_application_types(filters):
+        branch = _index_branch(app_type, model, label, rank, filters)
+        if cursor is not None:
+            branch = branch.filter(_keyset_condition(cursor, rank, direction))
+        branches.append(branch)
+
+    if not branches:
+        return None
+
+    index = branches[0].union(*branches[1:], all=True) if len(branches) > 1 else branches[0]
+    if direction == 'previous':
+        return index.order_by('created_at', 'type_rank', 'id')
+    return index.order_by('-created_at', '-type_rank', '-id')
+
+
+def _keyset_condition(cursor, rank, direction):
+    """
+    Row predicate for one branch relative to a ``(created_at, rank, id)`` cursor.
+
+    ``type_rank`` is constant within a branch, so the three-column tuple
+    comparison reduces to a condition on ``created_at`` and ``id`` only.
+    """
+    created_at, cursor_rank, cursor_id = cursor
+    if direction == 'previous':
+        if rank > cursor_rank:
+            return Q(created_at__gte=created_at)
+        if rank < cursor_rank:
+            return Q(created_at__gt=created_at)
+        return Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=cursor_id)
+
+    if rank < cursor_rank:
+        return Q(created_at__lte=created_at)
+    if rank > cursor_rank:
+        return Q(created_at__lt=created_at)
+    return Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=cursor_id)
+
+
+# ============================================================================
+# CURSORS
+# ============================================================================
+
+def encode_cursor(row):
+    """Encode an index row's sort key as an opaque URL-safe cursor."""
+    payload = json.dumps([row['created_at'].isoformat(), row['type_rank'], row['id']])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(value):
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Returns:
+        ``(created_at, rank, id)`` tuple, or None if the cursor is malformed.
+    """
+    if not value:
+        return None
+    try:
+        padded = value + '=' * (-len(value) % 4)
+        created_at, rank, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(rank), int(pk)
+    except (ValueError, TypeError, binascii.Error):
+        logger.warning(f"Ignoring malformed application list cursor: {value!r}")
+        return None
+
+
+# ============================================================================
+# PAGES AND FACETS
+# ============================================================================
+
+def get_application_page(filters=None, after=None, before=None, offset=0,
+                         page_size=DEFAULT_PAGE_SIZE):
+    """
+    Fetch one page of the unified application index.
+
+    Keyset pagination is used whenever a cursor is supplied; ``offset`` is
+    only honoured for plain ``?page=N`` links without a cursor.
+
+    Args:
+        filters: Filter dict, see ``filter_applications``
+        after: Encoded cursor; return the page following it
+        before: Encoded cursor; return the page preceding it
+        offset: Row offset used when no cursor is given
+        page_size: Rows per page
+
+    Returns:
+        Dict with rows, has_next, has_previous, next_cursor and prev_cursor
+    """
+    before_cursor = decode_cursor(before)
+    after_cursor = None if before_cursor else decode_cursor(after)
+
+    if before_cursor:
+        index = build_application_index(filters, before_cursor, 'previous')
+        rows = list(index[:page_size + 1]) if index is not None else []
+        has_previous = len(rows) > page_size
+        rows = list(reversed(rows[:page_size]))
+        has_next = True
+    else:
+        index = build_application_index(filters, after_cursor, 'next')
+        start = 0 if after_cursor else max(offset, 0)
+        rows = list(index[start:start + page_size + 1]) if index is not None else []
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        has_previous = after_cursor is not None or start > 0
+
+    return {
+        'rows': rows,
+        'has_next': has_next and bool(rows),
+        'has_previous': has_previous and bool(rows),
+        'next_cursor': encode_cursor(rows[-1]) if rows else None,
+        'prev_cursor': encode_cursor(rows[0]) if rows else None,
+    }
+
+
+def get_application_facets(filters=None):
+    """
+    Count filtered applications by status, council and type in the database.
+
+    Runs one grouped aggregate per application model, so the cost depends on
+    the number of distinct (status, council) pairs rather than on the number
+    of applications.
+
+    Returns:
+        Dict with total, status_counts, council_counts and type_counts
+    """
+    status_counts = {}
+    council_counts = {}
+    type_counts = {}
+    total = 0
+
+    for app_type, model, label, rank in selected_application_types(filters):
+        groups = filter_applications(model.objects.all(), filters).values(
+            'status', 'onboarding_session__selected_council__code'
+        ).annotate(n=Count('id')).order_by()
+
+        for group in groups:
+            n = group['n']
+            status = group['status']
+            council = group['onboarding_session__selected_council__code']
+            status_counts[status] = status_counts.get(status, 0) + n
+            council_counts[council] = council_counts.get(council, 0) + n
+            type_counts[label] = type_counts.get(label, 0) + n
+            total += n
+
+    return {
+        'total': total,
+        'status_counts': status_counts,
+        'council_counts': council_counts,
+        'type_counts': type_counts,
+    }
@@ -0,0 +1,753 @@
+"""
+Streaming application export engine.
+
+Every export format reads applications through one generator,
+``iter_export_rows``, which pulls ``.values()`` rows from the database in
+chunks with ``.iterator(chunk_size=...)``. Rows go straight into an openpyxl
+write-only workbook, which is spooled to a temporary file, or into a
+``StreamingHttpResponse`` CSV writer. Statistics are accumulated in the same
+single pass by ``ExportStatistics``. Memory use therefore stays flat no
+matter how many applications match the filters.
+"""
+import csv
+import logging
+import tempfile
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Border, Font, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+from django.db.models import Max, Min
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+
+from .application_index import (
+    filter_applications,
+    get_application_facets,
+    selected_application_types,
+)
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CHUNK_SIZE = 2000
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Styles shared by all sheets
+TITLE_FONT = Font(name='Calibri', size=16, bold=True, color='366092')
+SHEET_TITLE_FONT = Font(name='Calibri', size=14, bold=True, color='366092')
+SUBHEADER_FONT = Font(name='Calibri', size=12, bold=True, color='366092')
+HEADER_FONT = Font(name='Calibri', size=11, bold=True, color='FFFFFF')
+SMALL_HEADER_FONT = Font(name='Calibri', size=10, bold=True, color='FFFFFF')
+HEADER_FILL = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
+NORMAL_FONT = Font(name='Calibri', size=11)
+BOLD_FONT = Font(name='Calibri', size=11, bold=True)
+DATA_FONT = Font(name='Calibri', size=10)
+SMALL_DATA_FONT = Font(name='Calibri', size=9)
+THIN_BORDER = Border(left=Side(style='thin'), right=Side(style='thin'),
+                     top=Side(style='thin'), bottom=Side(style='thin'))
+
+STATUS_ORDER = ['submitted', 'under_review', 'approved', 'rejected', 'pending', 'draft']
+
+
+# ============================================================================
+# ROW SOURCE
+# ============================================================================
+
+COMMON_VALUES = (
+    'id', 'application_number', 'full_names', 'surname', 'preferred_name', 'email',
+    'cell_phone', 'home_phone', 'work_phone', 'id_number', 'passport_number',
+    'date_of_birth', 'gender', 'race', 'nationality', 'home_language',
+    'physical_address_line1', 'physical_address_line2', 'physical_city',
+    'physical_province', 'physical_code', 'physical_country',
+    'postal_address_line1', 'postal_address_line2', 'postal_city',
+    'postal_province', 'postal_code', 'postal_country',
+    'onboarding_session__selected_council__code',
+    'onboarding_session__selected_council__name',
+    'onboarding_session__selected_affiliation_type__name',
+    'status', 'created_at', 'submitted_at', 'reviewed_at', 'approved_at',
+    'submitted_by__username', 'submitted_by__first_name', 'submitted_by__last_name',
+    'reviewed_by__username', 'reviewed_by__first_name', 'reviewed_by__last_name',
+    'approved_by__username', 'approved_by__first_name', 'approved_by__last_name',
+    'reviewer_notes',
+)
+
+TYPE_SPECIFIC_VALUES = {
+    'designated': (
+        'designation_category__name', 'designation_subcategory__name',
+        'qualification_institution', 'highest_qualification', 'years_in_ministry',
+        'current_occupation', 'religious_affiliation',
+    ),
+    'student': ('current_institution',),
+}
+
+
+def make_naive_datetime(dt):
+    """Convert an aware datetime to naive local time for Excel; '' for None."""
+    if not dt:
+        return ''
+    if isinstance(dt, str):
+        return dt
+    if timezone.is_aware(dt):
+        return timezone.make_naive(timezone.localtime(dt))
+    return dt
+
+
+def _staff_display(values, prefix):
+    """Format a related staff user from flattened ``.values()`` columns."""
+    username = values.get(f'{prefix}__username')
+    if not username:
+        return ''
+    full_name = f"{values.get(f'{prefix}__first_name') or ''} {values.get(f'{prefix}__last_name') or ''}".strip()
+    return f"{username} ({full_name})" if full_name else username
+
+
+def _build_export_row(values, app_type, label):
+    """Shape one ``.values()`` row into the flat dict consumed by the writers."""
+    row = {
+        'id': values['id'],
+        'application_number': values['application_number'],
+        'type': label,
+        'app_type': app_type,
+
+        # Personal Information
+        'full_names': values['full_names'] or '',
+        'first_name': '',
+        'surname': values['surname'] or '',
+        'preferred_name': values['preferred_name'] or '',
+        'email': values['email'],
+        'cell_phone': values['cell_phone'] or '',
+        'home_phone': values['home_phone'] or '',
+        'work_phone': values['work_phone'] or '',
+
+        # Identity Information
+        'id_number': values['id_number'] or '',
+        'passport_number': values['passport_number'] or '',
+        'date_of_birth': values['date_of_birth'] or '',
+        'gender': values['gender'] or '',
+        'race': values['race'] or '',
+        'nationality': values['nationality'] or '',
+        'home_language': values['home_language'] or '',
+
+        # Address Information
+        'physical_address': f"{values['physical_address_line1'] or ''} {values['physical_address_line2'] or ''}".strip(),
+        'physical_city': values['physical_city'] or '',
+        'physical_province': values['physical_province'] or '',
+        'physical_code': values['physical_code'] or '',
+        'physical_country': values['physical_country'] or '',
+        'postal_address': f"{values['postal_address_line1'] or ''} {values['postal_address_line2'] or ''}".strip(),
+        'postal_city': values['postal_city'] or '',
+        'postal_province': values['postal_province'] or '',
+        'postal_code': values['postal_code'] or '',
+        'postal_country': values['postal_country'] or '',
+
+        # Council and Affiliation
+        'council': values['onboarding_session__selected_council__code'],
+        'council_name': values['onboarding_session__selected_council__name'],
+        'affiliation_type': values['onboarding_session__selected_affiliation_type__name'] or '',
+
+        # Application Status and Dates
+        'status': values['status'],
+        'created_at': make_naive_datetime(values['created_at']),
+        'submitted_at': make_naive_datetime(values['submitted_at']),
+        'reviewed_at': make_naive_datetime(values['reviewed_at']),
+        'approved_at': make_naive_datetime(values['approved_at']),
+
+        # Staff Information
+        'submitted_by': _staff_display(values, 'submitted_by'),
+        'reviewed_by': _staff_display(values, 'reviewed_by'),
+        'approved_by': _staff_display(values, 'approved_by'),
+        'reviewer_notes': values['reviewer_notes'] or '',
+
+        # Type-specific information
+        'designation_category': '',
+        'designation_subcategory': '',
+        'current_institution': '',
+        'qualification_institution': '',
+        'highest_qualification': '',
+        'years_in_ministry': '',
+        'current_occupation': '',
+        'religious_affiliation': '',
+    }
+
+    if app_type == 'designated':
+        row.update({
+            'designation_category': values['designation_category__name'] or '',
+            'designation_subcategory': values['designation_subcategory__name'] or '',
+            'qualification_institution': values['qualification_institution'] or '',
+            'highest_qualification': values['highest_qualification'] or '',
+            'years_in_ministry': values['years_in_ministry'],
+            'current_occupation': values['current_occupation'] or '',
+            'religious_affiliation': values['religious_affiliation'] or '',
+        })
+    elif app_type == 'student':
+        row.update({
+            'current_institution': values['current_institution'] or '',
+            'qualification_institution': values['current_institution'] or '',
+        })
+
+    return row
+
+
+def iter_export_rows(filters=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Stream export rows for all matching applications.
+
+    Args:
+        filters: Filter dict, see ``application_index.filter_applications``
+        chunk_size: Rows fetched per database round trip
+
+    Yields:
+        Flat dicts with the export columns, one per application
+    """
+    for app_type, model, label, rank in selected_application_types(filters):
+        fields = COMMON_VALUES + TYPE_SPECIFIC_VALUES.get(app_type, ())
+        qs = filter_applications(model.objects.all(), filters).values(*fields).order_by('created_at', 'id')
+        for values in qs.iterator(chunk_size=chunk_size):
+            yield _build_export_row(values, app_type, label)
+
+
+def get_created_range(filters=None):
+    """Return the (earliest, latest) created_at across the filtered applications."""
+    earliest = latest = None
+    for app_type, model, label, rank in selected_application_types(filters):
+        bounds = filter_applications(model.objects.all(), filters).aggregate(
+            first=Min('created_at'), last=Max('created_at')
+        )
+        if bounds['first'] and (earliest is None or bounds['first'] < earliest):
+            earliest = bounds['first']
+        if bounds['last'] and (latest is None or bounds['last'] > latest):
+            latest = bounds['last']
+    return earliest, latest
+
+
+# ============================================================================
+# INCREMENTAL STATISTICS
+# ============================================================================
+
+class ExportStatistics:
+    """
+    Single-pass accumulator for the export summary statistics.
+
+    ``as_dict`` returns the same structure the summary and council sheets
+    have always consumed.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.status_counts = {}
+        self.council_stats = {}
+        self.type_counts = {}
+
+    def add(self, row):
+        self.total += 1
+
+        status = row['status']
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+        council = self.council_stats.setdefault(row['council'], {
+            'total': 0, 'approved': 0, 'pending': 0,
+            'under_review': 0, 'rejected': 0, 'approval_rate': 0,
+        })
+        council['total'] += 1
+        if status == 'approved':
+            council['approved'] += 1
+        elif status in ['pending', 'submitted']:
+            council['pending'] += 1
+        elif status == 'under_review':
+            council['under_review'] += 1
+        elif status == 'rejected':
+            council['rejected'] += 1
+
+        self.type_counts[row['type']] = self.type_counts.get(row['type'], 0) + 1
+
+    def as_dict(self):
+        for stats in self.council_stats.values():
+            processed = stats['approved'] + stats['rejected']
+            stats['approval_rate'] = (stats['approved'] / processed) * 100 if processed else 0
+
+        approved = self.status_counts.get('approved', 0)
+        rejected = self.status_counts.get('rejected', 0)
+        processed = approved + rejected
+
+        return {
+            'total_applications': self.total,
+            'approved_count': approved,
+            'pending_count': self.status_counts.get('pending', 0) + self.status_counts.get('submitted', 0),
+            'under_review_count': self.status_counts.get('under_review', 0),
+            'rejected_count': rejected,
+            'approval_rate': (approved / processed * 100) if processed else 0,
+            'by_council': self.council_stats,
+            'by_type': self.type_counts,
+            'by_status': self.status_counts,
+        }
+
+
+def calculate_export_statistics(applications_data):
+    """Calculate summary statistics for an iterable of export rows."""
+    stats = ExportStatistics()
+    for row in applications_data:
+        stats.add(row)
+    return stats.as_dict()
+
+
+# ============================================================================
+# COLUMN LAYOUTS
+# ============================================================================
+
+DETAILED_COLUMNS = [
+    ('Application ID', 'id'), ('Application Number', 'application_number'),
+    ('Type', 'type'), ('Status', 'status'), ('Full Names', 'full_names'),
+    ('Email', 'email'), ('Cell Phone', 'cell_phone'), ('Home Phone', 'home_phone'),
+    ('Work Phone', 'work_phone'), ('ID Number', 'id_number'),
+    ('Passport Number', 'passport_number'), ('Date of Birth', 'date_of_birth'),
+    ('Gender', 'gender'), ('Race', 'race'), ('Nationality', 'nationality'),
+    ('Home Language', 'home_language'), ('Physical Address', 'physical_address'),
+    ('Physical City', 'physical_city'), ('Physical Province', 'physical_province'),
+    ('Physical Code', 'physical_code'), ('Physical Country', 'physical_country'),
+    ('Postal Address', 'postal_address'), ('Postal City', 'postal_city'),
+    ('Postal Province', 'postal_province'), ('Postal Code', 'postal_code'),
+    ('Postal Country', 'postal_country'), ('Council', 'council'),
+    ('Council Name', 'council_name'), ('Affiliation Type', 'affiliation_type'),
+    ('Designation Category', 'designation_category'),
+    ('Designation Subcategory', 'designation_subcategory'),
+    ('Current Institution', 'current_institution'),
+    ('Qualification Institution', 'qualification_institution'),
+    ('Highest Qualification', 'highest_qualification'),
+    ('Years in Ministry', 'years_in_ministry'),
+    ('Current Occupation', 'current_occupation'),
+    ('Religious Affiliation', 'religious_affiliation'), ('Created Date', 'created_at'),
+    ('Submitted Date', 'submitted_at'), ('Reviewed Date', 'reviewed_at'),
+    ('Approved Date', 'approved_at'), ('Submitted By', 'submitted_by'),
+    ('Reviewed By', 'reviewed_by'), ('Approved By', 'approved_by'),
+    ('Reviewer Notes', 'reviewer_notes'),
+]
+
+RAW_DATA_COLUMNS = [
+    ('ID', 'id'), ('Application Number', 'application_number'), ('Type', 'type'),
+    ('Full Names', 'full_names'), ('Email', 'email'), ('Status', 'status'),
+    ('Council', 'council'), ('Created Date', 'created_at'),
+    ('Submitted Date', 'submitted_at'), ('Cell Phone', 'cell_phone'),
+    ('City', 'physical_city'), ('Province', 'physical_province'),
+    ('Designation Category', 'designation_category'),
+    ('Institution', 'current_institution'),
+]
+
+GROUP_DETAIL_COLUMNS = [
+    ('Application Number', 'application_number'), ('Full Names', 'full_names'),
+    ('Email', 'email'), ('Type', 'type'), ('Status', 'status'),
+    ('Cell Phone', 'cell_phone'), ('City', 'physical_city'),
+    ('Province', 'physical_province'), ('Created Date', 'created_at'),
+    ('Submitted Date', 'submitted_at'),
+    ('Designation Category', 'designation_category'),
+    ('Institution', 'current_institution'),
+]
+
+CONTACT_COLUMNS = [
+    ('Full Names', 'full_names'), ('Email', 'email'), ('Cell Phone', 'cell_phone'),
+    ('Home Phone', 'home_phone'), ('Work Phone', 'work_phone'),
+    ('Application Type', 'type'), ('Council', 'council'), ('Status', 'status'),
+    ('Physical Address', 'physical_address'), ('Physical City', 'physical_city'),
+    ('Physical Province', 'physical_province'), ('Postal Address', 'postal_address'),
+    ('Postal City', 'postal_city'), ('Postal Province', 'postal_province'),
+    ('Application Number', 'application_number'), ('Submitted Date', 'submitted_at'),
+]
+
+TIMELINE_HEADERS = [
+    'Application Number', 'Full Names', 'Type', 'Council', 'Status',
+    'Created Date', 'Submitted Date', 'Reviewed Date', 'Approved Date',
+    'Days to Submit', 'Days to Review', 'Days to Approve', 'Total Processing Days',
+]
+
+
+def _column_values(row, columns):
+    return [row[key] for header, key in columns]
+
+
+def _timeline_values(row):
+    """Timeline columns, including the derived processing durations."""
+    created_date = row['created_at']
+    submitted_date = row['submitted_at']
+    reviewed_date = row['reviewed_at']
+    approved_date = row['approved_at']
+
+    days_to_submit = days_to_review = days_to_approve = total_days = ''
+    if submitted_date and created_date:
+        days_to_submit = (submitted_date - created_date).days
+    if reviewed_date and submitted_date:
+        days_to_review = (reviewed_date - submitted_date).days
+    if approved_date and submitted_date:
+        days_to_approve = (approved_date - submitted_date).days
+        total_days = (approved_date - created_date).days
+
+    return [
+        row['application_number'], row['full_names'], row['type'],
+        row['council'], row['status'], created_date, submitted_date,
+        reviewed_date, approved_date, days_to_submit, days_to_review,
+        days_to_approve, total_days,
+    ]
+
+
+# ============================================================================
+# WRITE-ONLY WORKBOOK HELPERS
+# ============================================================================
+
+def _cells(sheet, values, font=None, fill=None, border=None):
+    """Wrap values in styled WriteOnlyCells for a write-only worksheet."""
+    cells = []
+    for value in values:
+        cell = WriteOnlyCell(sheet, value=value)
+        if font:
+            cell.font = font
+        if fill:
+            cell.fill = fill
+        if border:
+            cell.border = border
+        cells.append(cell)
+    return cells
+
+
+def _set_column_widths(sheet, headers, max_width, min_width=12):
+    """
+    Size columns from their headers.
+
+    Write-only sheets cannot be measured after the fact, so widths must be
+    set up front rather than auto-fitted to the data.
+    """
+    for col, header in enumerate(headers, 1):
+        width = min(max(len(str(header)) + 2, min_width), max_width)
+        sheet.column_dimensions[get_column_letter(col)].width = width
+
+
+def _header_row(sheet, headers, font=HEADER_FONT, border=THIN_BORDER):
+    sheet.append(_cells(sheet, headers, font=font, fill=HEADER_FILL, border=border))
+
+
+def _generated_lines(user):
+    return [
+        f'Generated on: {timezone.now().strftime("%Y-%m-%d %H:%M:%S")}',
+        f'Generated by: {user.username}',
+    ]
+
+
+def _workbook_response(workbook, filename):
+    """Spool a write-only workbook to a temporary file and stream it back."""
+    spool = tempfile.TemporaryFile()
+    workbook.save(spool)
+    spool.seek(0)
+    response = FileResponse(spool, content_type=XLSX_CONTENT_TYPE)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def _timestamped(prefix, extension='xlsx'):
+    return f'{prefix}_{timezone.now().strftime("%Y%m%d_%H%M%S")}.{extension}'
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for streaming csv."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_response(headers, rows, row_values, filename):
+    """Stream rows as CSV without buffering the whole export."""
+    writer = csv.writer(_Echo())
+
+    def generate():
+        yield writer.writerow(headers)
+        for row in rows:
+            yield writer.writerow(row_values(row))
+
+    response = StreamingHttpResponse(generate(), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+# ============================================================================
+# EXPORT FORMATS
+# ============================================================================
+
+class ApplicationExport:
+    """
+    One export run: the filtered row stream plus its running statistics.
+
+    ``rows()`` can only be consumed once; every row that passes through it is
+    counted into ``stats``. An optional ``on_progress(processed, total)``
+    callback is invoked once per chunk, which background export jobs use to
+    report progress.
+    """
+
+    def __init__(self, filters, user, chunk_size=EXPORT_CHUNK_SIZE, on_progress=None):
+        self.filters = filters
+        self.user = user
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress
+        self.stats = ExportStatistics()
+
+    def rows(self):
+        total = get_application_facets(self.filters)['total'] if self.on_progress else 0
+        for row in iter_export_rows(self.filters, self.chunk_size):
+            self.stats.add(row)
+            if self.on_progress and self.stats.total % self.chunk_size == 0:
+                self.on_progress(self.stats.total, total)
+            yield row
+
+    @property
+    def row_count(self):
+        return self.stats.total
+
+
+def export_summary_format(export):
+    """Executive summary statistics plus a raw data sheet."""
+    workbook = openpyxl.Workbook(write_only=True)
+    summary_sheet = workbook.create_sheet("Executive Summary")
+    _set_column_widths(summary_sheet, ['Application Type', 'Total', 'Approved',
+                                       'Pending', 'Rejected', 'Approval Rate'], 50, min_width=22)
+
+    data_sheet = workbook.create_sheet("Raw Data")
+    _set_column_widths(data_sheet, [h for h, k in RAW_DATA_COLUMNS], 30)
+    _header_row(data_sheet, [h for h, k in RAW_DATA_COLUMNS], font=SMALL_HEADER_FONT)
+    for row in export.rows():
+        data_sheet.append(_cells(data_sheet, _column_values(row, RAW_DATA_COLUMNS),
+                                 font=SMALL_DATA_FONT, border=THIN_BORDER))
+
+    # The summary sheet is filled after the single pass has produced the stats
+    stats = export.stats.as_dict()
+    summary_sheet.append(_cells(summary_sheet, ['ACRP AMS Application Export - Executive Summary'], font=TITLE_FONT))
+    for line in _generated_lines(export.user):
+        summary_sheet.append([line])
+    summary_sheet.append([f'Total Applications: {stats["total_applications"]}'])
+    summary_sheet.append([])
+    summary_sheet.append(_cells(summary_sheet, ['OVERALL STATISTICS'], font=SUBHEADER_FONT))
+    summary_sheet.append([])
+    for label, value in [
+        ['Total Applications', stats['total_applications']],
+        ['Approved Applications', stats['approved_count']],
+        ['Pending Applications', stats['pending_count']],
+        ['Under Review', stats['under_review_count']],
+        ['Rejected Applications', stats['rejected_count']],
+        ['Approval Rate', f"{stats['approval_rate']:.1f}%"],
+    ]:
+        summary_sheet.append(_cells(summary_sheet, [label], font=NORMAL_FONT)
+                             + _cells(summary_sheet, [value], font=BOLD_FONT))
+
+    summary_sheet.append([])
+    summary_sheet.append([])
+    summary_sheet.append(_cells(summary_sheet, ['BY COUNCIL'], font=SUBHEADER_FONT))
+    _header_row(summary_sheet, ['Council', 'Total', 'Approved', 'Pending', 'Rejected', 'Approval Rate'])
+    for council_code, council_stats in stats['by_council'].items():
+        summary_sheet.append(_cells(summary_sheet, [
+            council_code,
+            council_stats['total'],
+            council_stats['approved'],
+            council_stats['pending'],
+            council_stats['rejected'],
+            f"{council_stats['approval_rate']:.1f}%",
+        ], font=NORMAL_FONT, border=THIN_BORDER))
+
+    summary_sheet.append([])
+    summary_sheet.append([])
+    summary_sheet.append(_cells(summary_sheet, ['BY APPLICATION TYPE'], font=SUBHEADER_FONT))
+    _header_row(summary_sheet, ['Application Type', 'Count', 'Percentage'])
+    for app_type, count in stats['by_type'].items():
+        percentage = (count / stats['total_applications'] * 100) if stats['total_applications'] > 0 else 0
+        summary_sheet.append(_cells(summary_sheet, [app_type, count, f"{percentage:.1f}%"],
+                                    font=NORMAL_FONT, border=THIN_BORDER))
+
+    return _workbook_response(workbook, _timestamped('ACRP_Applications_Summary'))
+
+
+def export_detailed_format(export):
+    """Complete detail for every application on one sheet."""
+    headers = [h for h, k in DETAILED_COLUMNS]
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet("Detailed Applications")
+    _set_column_widths(sheet, headers, 40)
+    _header_row(sheet, headers)
+    for row in export.rows():
+        sheet.append(_cells(sheet, _column_values(row, DETAILED_COLUMNS), font=DATA_FONT, border=THIN_BORDER))
+    return _workbook_response(workbook, _timestamped('ACRP_Applications_Detailed'))
+
+
+def _export_grouped(export, group_key, group_order, summary_title, sheet_title, filename_prefix):
+    """
+    Shared writer for the council and status breakdowns.
+
+    Group sizes come from the grouped facet query up front, so every group
+    sheet can be created with its header before the row stream starts and
+    rows are routed to their sheet as they arrive.
+    """
+    facets = get_application_facets(export.filters)
+    group_counts = facets[f'{group_key}_counts']
+    groups = [g for g in group_order(group_counts) if group_counts.get(g)]
+
+    workbook = openpyxl.Workbook(write_only=True)
+    summary_sheet = workbook.create_sheet(summary_title)
+    _set_column_widths(summary_sheet, ['Total Applications', 'Approved', 'Pending',
+                                       'Under Review', 'Rejected', 'Approval Rate'], 25, min_width=16)
+
+    headers = [h for h, k in GROUP_DETAIL_COLUMNS]
+    group_sheets = {}
+    for group in groups:
+        sheet = workbook.create_sheet(f"{sheet_title(group)} Applications")
+        _set_column_widths(sheet, headers, 30)
+        sheet.append(_cells(sheet, [f'{sheet_title(group)} Applications'], font=SHEET_TITLE_FONT))
+        sheet.append([f'Total Applications: {group_counts[group]}'])
+        sheet.append([])
+        _header_row(sheet, headers, font=SMALL_HEADER_FONT)
+        group_sheets[group] = (sheet, ExportStatistics())
+
+    for row in export.rows():
+        entry = group_sheets.get(row[group_key])
+        if entry is None:
+            continue
+        sheet, group_stats = entry
+        group_stats.add(row)
+        sheet.append(_cells(sheet, _column_values(row, GROUP_DETAIL_COLUMNS),
+                            font=SMALL_DATA_FONT, border=THIN_BORDER))
+
+    summary_sheet.append(_cells(summary_sheet, [f'{summary_title}'], font=TITLE_FONT))
+    for line in _generated_lines(export.user):
+        summary_sheet.append([line])
+    summary_sheet.append([])
+    summary_sheet.append(_cells(summary_sheet, [f'{summary_title.upper()}'], font=SUBHEADER_FONT))
+    summary_sheet.append([])
+    _header_row(summary_sheet, [group_key.title(), 'Total Applications', 'Approved', 'Pending',
+                                'Under Review', 'Rejected', 'Approval Rate'])
+    for group in groups:
+        stats = group_sheets[group][1].as_dict()
+        summary_sheet.append(_cells(summary_sheet, [
+            group,
+            stats['total_applications'],
+            stats['approved_count'],
+            stats['pending_count'],
+            stats['under_review_count'],
+            stats['rejected_count'],
+            f"{stats['approval_rate']:.1f}%",
+        ], font=DATA_FONT, border=THIN_BORDER))
+
+    return _workbook_response(workbook, _timestamped(filename_prefix))
+
+
+def export_council_breakdown_format(export):
+    """Applications grouped by council, one sheet per council."""
+    return _export_grouped(
+        export,
+        group_key='council',
+        group_order=lambda counts: list(counts),
+        summary_title='Council Summary',
+        sheet_title=lambda council: council,
+        filename_prefix='ACRP_Applications_By_Council',
+    )
+
+
+def export_status_report_format(export):
+    """Applications grouped by status, one sheet per status."""
+    return _export_grouped(
+        export,
+        group_key='status',
+        group_order=lambda counts: STATUS_ORDER + [s for s in counts if s not in STATUS_ORDER],
+        summary_title='Status Summary',
+        sheet_title=lambda status: status.replace('_', ' ').title(),
+        filename_prefix='ACRP_Status_Report',
+    )
+
+
+def export_contact_list_format(export):
+    """Contact information only."""
+    headers = [h for h, k in CONTACT_COLUMNS]
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet("Contact List")
+    _set_column_widths(sheet, headers, 35)
+    _header_row(sheet, headers, border=None)
+    for row in export.rows():
+        sheet.append(_cells(sheet, _column_values(row, CONTACT_COLUMNS), font=DATA_FONT))
+    return _workbook_response(workbook, _timestamped('ACRP_Contact_List'))
+
+
+def export_timeline_format(export):
+    """Per-application processing timeline."""
+    earliest, latest = get_created_range(export.filters)
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet("Timeline Analysis")
+    _set_column_widths(sheet, TIMELINE_HEADERS, 25)
+
+    sheet.append(_cells(sheet, ['Applications Timeline Analysis'], font=TITLE_FONT))
+    sheet.append([_generated_lines(export.user)[0]])
+    sheet.append([
+        f'Period: {timezone.localtime(earliest).strftime("%Y-%m-%d") if earliest else "N/A"} '
+        f'to {timezone.localtime(latest).strftime("%Y-%m-%d") if latest else "N/A"}'
+    ])
+    sheet.append([])
+    _header_row(sheet, TIMELINE_HEADERS, font=SMALL_HEADER_FONT)
+    for row in export.rows():
+        sheet.append(_cells(sheet, _timeline_values(row), font=SMALL_DATA_FONT, border=THIN_BORDER))
+    return _workbook_response(workbook, _timestamped('ACRP_Timeline_Analysis'))
+
+
+EXCEL_EXPORTS = {
+    'summary': export_summary_format,
+    'detailed': export_detailed_format,
+    'council_breakdown': export_council_breakdown_format,
+    'status_report': export_status_report_format,
+    'timeline': export_timeline_format,
+    'contact_list': export_contact_list_format,
+}
+
+# Row-oriented formats that can also be streamed as CSV
+CSV_EXPORTS = {
+    'detailed': ([h for h, k in DETAILED_COLUMNS], lambda row: _column_values(row, DETAILED_COLUMNS),
+                 'ACRP_Applications_Detailed'),
+    'contact_list': ([h for h, k in CONTACT_COLUMNS], lambda row: _column_values(row, CONTACT_COLUMNS),
+                     'ACRP_Contact_List'),
+    'timeline': (TIMELINE_HEADERS, _timeline_values, 'ACRP_Timeline_Analysis'),
+}
+
+
+def build_export_response(export, export_format='summary', file_type='xlsx'):
+    """
+    Produce the HTTP response for an export run.
+
+    CSV output is streamed row by row for the row-oriented formats; every
+    other combination falls back to the write-only Excel writer.
+    """
+    if file_type == 'csv' and export_format in CSV_EXPORTS:
+        headers, row_values, prefix = CSV_EXPORTS[export_format]
+        return _csv_response(headers, export.rows(), row_values, _timestamped(prefix, 'csv'))
+
+    export_function = EXCEL_EXPORTS.get(export_format, export_summary_format)
+    return export_function(export)
+
+
+def run_application_export_job(job):
+    """
+    ExportJob handler for ``enrollment_applications``.
+
+    Job parameters: ``format``, ``file_type`` and ``filters`` as accepted by
+    ``export_applications``.
+    """
+    parameters = job.parameters
+    export = ApplicationExport(
+        parameters.get('filters') or {},
+        job.created_by,
+        on_progress=job.set_progress,
+    )
+    response = build_export_response(
+        export,
+        parameters.get('format', 'summary'),
+        parameters.get('file_type', 'xlsx'),
+    )
+    # CSV output is a lazy stream; wrap it so the row count is final once the
+    # runner has drained it
+    if not isinstance(response, FileResponse):
+        response.streaming_content = _counting_stream(response.streaming_content, export, job)
+    else:
+        job.row_count = export.row_count
+    return response
+
+
+def _counting_stream(chunks, export, job):
+    yield from chunks
+    job.row_count = export.row_count
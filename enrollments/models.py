@@ -10,6 +10,9 @@ from django.utils.translation import gettext_lazy as _
 import os
 import uuid
 
+from app.sequences import last_issued_suffix, next_number
+from app.tiered_cache import get_cached, invalidate_cached
+
 User = get_user_model()
 
 
@@ -83,6 +86,22 @@ class Council(models.Model):
     
     def __str__(self):
         return f"{self.code} - {self.name}"
+    
+    ACTIVE_CACHE_KEY = 'enrollments:active_councils'
+    
+    @classmethod
+    def get_active(cls):
+        """Active councils ordered by code, from the two-tier reference cache."""
+        return get_cached(cls.ACTIVE_CACHE_KEY, lambda: list(cls.objects.filter(is_active=True).order_by('code')))
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_cached(self.ACTIVE_CACHE_KEY)
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_cached(self.ACTIVE_CACHE_KEY)
+        return result
 
 
 class AffiliationType(models.Model):
@@ -117,6 +136,22 @@ class AffiliationType(models.Model):
     
     def __str__(self):
         return self.name
+    
+    ACTIVE_CACHE_KEY = 'enrollments:active_affiliation_types'
+    
+    @classmethod
+    def get_active(cls):
+        """Active affiliation types ordered by code, from the two-tier reference cache."""
+        return get_cached(cls.ACTIVE_CACHE_KEY, lambda: list(cls.objects.filter(is_active=True).order_by('code')))
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_cached(self.ACTIVE_CACHE_KEY)
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_cached(self.ACTIVE_CACHE_KEY)
+        return result
 
 
 class DesignationCategory(models.Model):
@@ -770,15 +805,15 @@ class BaseApplication(models.Model):
         council_code = self.get_council().code
         affiliation_code = self.get_affiliation_type()[:2].upper()
         year = timezone.now().year % 100  # Last 2 digits of year
+        prefix = f"{council_code}{affiliation_code}{year:02d}"
         
-        # Get next sequence number
-        sequence = self.__class__.objects.filter(
-            onboarding_session__selected_council=self.get_council(),
-            onboarding_session__selected_affiliation_type__code=self.get_affiliation_type(),
-            created_at__year=timezone.now().year
-        ).count() + 1
+        # Next sequence number from the race-free per-prefix allocator
+        sequence = next_number(
+            f"application:{prefix}",
+            seed=lambda: last_issued_suffix(self.__class__.objects.all(), 'application_number', prefix),
+        )
         
-        return f"{council_code}{affiliation_code}{year:02d}{sequence:04d}"
+        return f"{prefix}{sequence:04d}"
     
     def get_council(self):
         """Get the council from onboarding session"""
@@ -853,6 +888,10 @@ class AssociatedApplication(BaseApplication):
     class Meta:
         verbose_name = "Associated Affiliation Application"
         verbose_name_plural = "Associated Affiliation Applications"
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['status']),
+        ]
     
     def __str__(self):
         return f"Associated: {self.get_display_name()} ({self.get_council().code})"
@@ -904,6 +943,10 @@ class StudentApplication(BaseApplication):
     class Meta:
         verbose_name = "Student Affiliation Application"
         verbose_name_plural = "Student Affiliation Applications"
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['status']),
+        ]
     
     def clean(self):
         """Student-specific validation"""
@@ -1004,6 +1047,10 @@ class DesignatedApplication(BaseApplication):
     class Meta:
         verbose_name = "Designated Affiliation Application"
         verbose_name_plural = "Designated Affiliation Applications"
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['status']),
+        ]
     
     def clean(self):
         """Updated validation - categories are optional during application"""